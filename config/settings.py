@@ -19,6 +19,85 @@ KIS_PAPER_APP_KEY = os.getenv('KIS_PAPER_APP_KEY')
 KIS_PAPER_APP_SECRET = os.getenv('KIS_PAPER_APP_SECRET')
 KIS_PAPER_ACCOUNT_NO = os.getenv('KIS_PAPER_ACCOUNT_NO')
 
+# 추가 앱키 (KisClientPool에서 호출 한도를 나눠 쓸 때 사용)
+# KIS_APP_KEY_2, KIS_APP_SECRET_2, KIS_ACCOUNT_NO_2, KIS_APP_KEY_3 ... 순서대로 (모의투자는 KIS_PAPER_APP_KEY_2 ...)
+def _extra_credentials(prefix):
+    credentials = []
+    index = 2
+    while os.getenv(f'{prefix}APP_KEY_{index}'):
+        credentials.append((
+            os.getenv(f'{prefix}APP_KEY_{index}'),
+            os.getenv(f'{prefix}APP_SECRET_{index}'),
+            os.getenv(f'{prefix}ACCOUNT_NO_{index}'),
+        ))
+        index += 1
+    return credentials
+
+
+KIS_EXTRA_CREDENTIALS = _extra_credentials('KIS_')
+KIS_PAPER_EXTRA_CREDENTIALS = _extra_credentials('KIS_PAPER_')
+KIS_POOL_STRATEGY = os.getenv('KIS_POOL_STRATEGY', 'least_loaded')  # 시세 조회 분배 방식 (least_loaded, round_robin)
+
+# API 통신 설정
+KIS_HTTP_POOL_SIZE = int(os.getenv('KIS_HTTP_POOL_SIZE', '10'))  # 호스트당 유지할 커넥션 수
+KIS_HTTP_CONNECT_TIMEOUT = float(os.getenv('KIS_HTTP_CONNECT_TIMEOUT', '3.05'))  # 연결 타임아웃 (초)
+KIS_HTTP_READ_TIMEOUT = float(os.getenv('KIS_HTTP_READ_TIMEOUT', '10'))  # 응답 대기 타임아웃 (초)
+
+# API 호출 제한 (공식 한도: 실전투자 초당 20건, 모의투자 초당 2건)
+# 초당 허용 호출 수 + 순간 허용 호출 수가 공식 한도를 넘지 않도록 설정
+KIS_REAL_RATE_LIMIT = float(os.getenv('KIS_REAL_RATE_LIMIT', '16'))  # 실전투자 초당 허용 호출 수
+KIS_REAL_RATE_BURST = float(os.getenv('KIS_REAL_RATE_BURST', '4'))  # 실전투자 순간 허용 호출 수
+KIS_PAPER_RATE_LIMIT = float(os.getenv('KIS_PAPER_RATE_LIMIT', '1'))  # 모의투자 초당 허용 호출 수
+KIS_PAPER_RATE_BURST = float(os.getenv('KIS_PAPER_RATE_BURST', '1'))  # 모의투자 순간 허용 호출 수
+# 현금 주문은 tr_id별로 위 한도와 함께 아래 한도도 적용 (주문이 폭주해도 조회 몫을 남김, 모의투자는 위 한도가 더 낮음)
+KIS_ORDER_RATE_LIMIT = float(os.getenv('KIS_ORDER_RATE_LIMIT', '8'))  # 현금 주문 초당 허용 호출 수 (0이면 위 한도만 적용)
+KIS_ORDER_RATE_BURST = float(os.getenv('KIS_ORDER_RATE_BURST', '2'))  # 현금 주문 순간 허용 호출 수
+
+# API 재시도 설정 (호출 한도 초과, 토큰 만료, 일시적 네트워크/서버 오류)
+KIS_RETRY_MAX_ATTEMPTS = int(os.getenv('KIS_RETRY_MAX_ATTEMPTS', '3'))  # 최초 요청 포함 최대 시도 횟수
+KIS_RETRY_BASE_DELAY = float(os.getenv('KIS_RETRY_BASE_DELAY', '0.25'))  # 첫 재시도 대기 시간 (초)
+KIS_RETRY_MAX_DELAY = float(os.getenv('KIS_RETRY_MAX_DELAY', '4.0'))  # 재시도 대기 시간 상한 (초)
+
+# API 서버 주소 (비워두면 모드별 공식 주소 사용, 로컬 스텁 서버로 테스트할 때 설정)
+KIS_BASE_URL = os.getenv('KIS_BASE_URL', '')  # 예: http://127.0.0.1:18080
+
+# 실시간 시세(WebSocket) 설정
+KIS_WS_URL = os.getenv('KIS_WS_URL', '')  # 비워두면 모드별 공식 주소 (KIS_BASE_URL이 있으면 같은 서버)
+KIS_WS_RING_SIZE = int(os.getenv('KIS_WS_RING_SIZE', '4096'))  # 종목별로 보관할 최근 체결 수
+KIS_WS_MAX_SUBSCRIPTIONS = int(os.getenv('KIS_WS_MAX_SUBSCRIPTIONS', '41'))  # 세션당 최대 실시간 등록 수 (공식 한도 41건)
+KIS_WS_RECONNECT_MAX_DELAY = float(os.getenv('KIS_WS_RECONNECT_MAX_DELAY', '30'))  # 재접속 대기 시간 상한 (초)
+
+# API 응답 녹화/재생 설정 (백테스트/회귀 테스트를 네트워크 없이 다시 실행할 때 사용)
+KIS_CASSETTE_MODE = os.getenv('KIS_CASSETTE_MODE', '')  # record, replay (비워두면 사용 안 함)
+KIS_CASSETTE_PATH = os.getenv('KIS_CASSETTE_PATH', 'data/cassettes/kis.json.gz')  # 녹화 파일 경로
+
+# 서킷 브레이커 설정 (게이트웨이 장애 시 요청을 바로 실패시킴)
+KIS_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('KIS_CIRCUIT_FAILURE_THRESHOLD', '5'))  # 회로를 여는 연속 실패 횟수
+KIS_CIRCUIT_RESET_TIMEOUT = float(os.getenv('KIS_CIRCUIT_RESET_TIMEOUT', '30'))  # 시험 요청까지 대기 시간 (초)
+KIS_CIRCUIT_LATENCY_SLO = float(os.getenv('KIS_CIRCUIT_LATENCY_SLO', '3.0'))  # 실패로 간주할 응답 시간 (초, 0이면 사용 안 함)
+
+# API 호출 계측 설정
+KIS_METRICS_DUMP_PATH = os.getenv('KIS_METRICS_DUMP_PATH', '')  # 종료 시 계측 결과를 저장할 JSON 경로 (비워두면 저장 안 함)
+
+# 체결 확인 설정 (주문 후 일별 주문 체결 조회를 점점 길어지는 간격으로 반복)
+KIS_FILL_POLL_MIN_INTERVAL = float(os.getenv('KIS_FILL_POLL_MIN_INTERVAL', '0.5'))  # 조회 간격 최소값 (초, 새 체결/주문이 있으면 이 값으로 돌아감)
+KIS_FILL_POLL_MAX_INTERVAL = float(os.getenv('KIS_FILL_POLL_MAX_INTERVAL', '5.0'))  # 조회 간격 상한 (초)
+KIS_FILL_POLL_BACKOFF = float(os.getenv('KIS_FILL_POLL_BACKOFF', '1.5'))  # 새 체결이 없을 때 간격을 늘리는 배수
+KIS_FILL_TIMEOUT = float(os.getenv('KIS_FILL_TIMEOUT', '60'))  # 자동 주문 후 체결을 기다리는 최대 시간 (초)
+
+# 토큰 사전 갱신 설정
+KIS_TOKEN_REFRESH_MARGIN = float(os.getenv('KIS_TOKEN_REFRESH_MARGIN', '600'))  # 만료 몇 초 전에 백그라운드에서 갱신할지
+
+# 현재가 캐시 설정
+KIS_QUOTE_CACHE_TTL = float(os.getenv('KIS_QUOTE_CACHE_TTL', '1.0'))  # 현재가 캐시 유효시간 (초, 0이면 사용 안 함, 주문 수량 계산은 항상 새로 조회)
+KIS_QUOTE_CACHE_SIZE = int(os.getenv('KIS_QUOTE_CACHE_SIZE', '1024'))  # 캐시에 보관할 최대 종목 수
+
+# API 요청 로그 설정 (DEBUG 레벨, 민감 정보는 항상 가려서 기록)
+KIS_REQUEST_LOG_LEVEL = os.getenv('KIS_REQUEST_LOG_LEVEL', 'summary')  # off, summary, headers, full
+KIS_REQUEST_LOG_ENDPOINTS = os.getenv('KIS_REQUEST_LOG_ENDPOINTS', '')  # 엔드포인트/tr_id별 수준 (예: inquire-price=off,order-cash=full)
+KIS_REQUEST_LOG_MAX_BODY = int(os.getenv('KIS_REQUEST_LOG_MAX_BODY', '2000'))  # 응답 본문 최대 기록 길이
+KIS_REQUEST_LOG_SAMPLE_RATE = float(os.getenv('KIS_REQUEST_LOG_SAMPLE_RATE', '1.0'))  # full 수준 응답 본문 기록 비율
+
 # 데이터베이스 설정
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./trading.db')
 
@@ -0,0 +1,756 @@
+"""
+한국투자증권 API 비동기(asyncio) 클라이언트 모듈
+"""
+import asyncio
+import time
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import aiohttp
+from loguru import logger
+
+from config.settings import KIS_HTTP_POOL_SIZE, KIS_HTTP_CONNECT_TIMEOUT, KIS_HTTP_READ_TIMEOUT
+from src.api.deadline import STAGE_HTTP, STAGE_RATE_LIMIT, STAGE_RETRY_WAIT, STAGE_TOKEN, Deadline, DeadlineLike
+from src.api.cassette import Cassette
+from src.api.kis_api import KisAPIBase, KisAPIError
+from src.api.metrics import STAGE_NETWORK, STAGE_PARSE, STAGE_QUEUE_WAIT, STAGE_TOTAL
+from src.api.models import Balance, DailyBar, Holding, MinuteBars, OrderAck, OrderResult, OrderSpec, OrderStatus, Quote, StockPrices, loads
+from src.api.quote_cache import QuoteCache
+from src.api.rate_limiter import RateLimiter
+from src.api.retry import RENEW_TOKEN, RetryPolicy
+from src.api.token_store import Token, TokenStore
+
+
+class AsyncKisAPI(KisAPIBase):
+    """한국투자증권 API 비동기 클라이언트
+
+    KisAPI와 같은 메서드와 토큰/오류 처리 방식을 제공하며,
+    호출 제한이 허용하는 한 여러 요청을 동시에 보낼 수 있습니다.
+
+    사용 예:
+        async with AsyncKisAPI(mode=AsyncKisAPI.MODE_PAPER) as api:
+            prices = await asyncio.gather(*(api.get_stock_price(code) for code in codes))
+    """
+
+    def __init__(
+        self,
+        mode: str = KisAPIBase.MODE_REAL,
+        max_in_flight: int = KIS_HTTP_POOL_SIZE,
+        timeout: Tuple[float, float] = (KIS_HTTP_CONNECT_TIMEOUT, KIS_HTTP_READ_TIMEOUT),
+        rate_limiter: Optional[RateLimiter] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        base_url: Optional[str] = None,
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        account_no: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        token_store: Optional[TokenStore] = None,
+    ):
+        """
+        API 클라이언트 초기화 (네트워크 요청은 첫 호출 시점에 시작)
+
+        Args:
+            mode: 거래 모드 (real: 실전투자, paper: 모의투자)
+            max_in_flight: 동시에 진행할 수 있는 최대 요청 수 (커넥션 수)
+            timeout: (연결 타임아웃, 응답 대기 타임아웃) 초 단위
+            rate_limiter: 호출 제한기 (생략 시 같은 모드/앱키의 클라이언트끼리 공유)
+            quote_cache: 현재가 캐시 (생략 시 설정값으로 생성)
+            base_url: API 서버 주소 (로컬 스텁 서버 등, 생략 시 공식 주소)
+            app_key: 앱키 (생략 시 .env 설정값)
+            app_secret: 앱시크릿 (생략 시 .env 설정값)
+            account_no: 계좌번호 10자리 (생략 시 .env 설정값)
+            cassette: 응답 녹화/재생 파일 (재생 모드면 네트워크 요청 없이 녹화된 응답만 사용)
+            retry_policy: 재시도 정책 (생략 시 KIS_RETRY_* 설정값으로 생성)
+            token_store: 토큰 저장소 (생략 시 기본 토큰 파일, 다른 경로나 격리된 저장소를 쓸 때 지정)
+        """
+        super().__init__(
+            mode=mode,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            quote_cache=quote_cache,
+            base_url=base_url,
+            app_key=app_key,
+            app_secret=app_secret,
+            account_no=account_no,
+            cassette=cassette,
+            retry_policy=retry_policy,
+            token_store=token_store,
+        )
+        self.max_in_flight = max_in_flight
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Python 3.10부터 asyncio 동기화 객체는 처음 사용할 때 이벤트 루프에 묶이므로 미리 만들어 둠
+        # (세션을 다시 만들 때 다른 루프일 수 있으므로 _ensure_session에서 새로 생성)
+        self._token_lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+        # 저장된 토큰이 있으면 불러오기 (없으면 첫 요청 때 발급, 녹화 재생 시에는 필요 없음)
+        if not self.replaying:
+            self._load_token()
+
+    async def __aenter__(self) -> "AsyncKisAPI":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """이벤트 루프 안에서 세션과 동기화 객체 생성"""
+        if self._session is None or self._session.closed:
+            connect_timeout, read_timeout = self.timeout
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout),
+            )
+            self._token_lock = asyncio.Lock()
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            logger.info(f"비동기 API 클라이언트가 초기화되었습니다. (모드: {self._mode_name})")
+        return self._session
+
+    async def close(self) -> None:
+        """녹화 내용 저장 및 커넥션 풀 정리"""
+        if self.cassette is not None:
+            self.cassette.save()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _issue_token(self) -> Token:
+        """인증 토큰 발급"""
+        session = await self._ensure_session()
+        try:
+            auth_url, data = self._token_request()
+            async with session.post(auth_url, json=data) as response:
+                response.raise_for_status()
+                return self._set_token(await response.json(content_type=None))
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"토큰 발급 중 오류 발생: {str(e)}")
+            raise KisAPIError(f"토큰 발급 실패: {str(e)}")
+
+    async def _refresh_token(self, stale_token: Optional[str]) -> None:
+        """
+        토큰 갱신 (동시에 여러 요청이 만료를 감지해도 한 번만 발급,
+        다른 프로세스가 방금 저장한 토큰이 있으면 재사용)
+
+        Args:
+            stale_token: 만료를 감지한 시점의 토큰
+        """
+        async with self._token_lock:
+            # 기다리는 동안 다른 요청이 이미 갱신했다면 그대로 사용
+            if self._access_token != stale_token and not self._token_expired():
+                return
+            try:
+                self._access_token, self._token_expired_at = await self._token_store.get_or_issue_async(
+                    self._token_key, self._issue_token, stale_token=stale_token
+                )
+            except OSError as e:
+                # 토큰 파일을 쓸 수 없어도 발급은 진행
+                logger.warning(f"토큰 저장 실패: {str(e)}")
+                await self._issue_token()
+
+    async def _get_headers(self, tr_id: str = "", tr_cont: str = "") -> Dict[str, str]:
+        """API 요청에 필요한 헤더 생성"""
+        # 토큰이 만료되었거나 없는 경우 갱신
+        if self._token_expired():
+            await self._refresh_token(self._access_token)
+
+        return self._build_headers(tr_id, tr_cont)
+
+    @staticmethod
+    def _is_connect_error(e: BaseException) -> bool:
+        """서버에 요청이 전달되기 전에 실패한 오류인지 확인 (연결 실패/연결 타임아웃)"""
+        connect_errors: Tuple[Type[Exception], ...] = (aiohttp.ClientConnectorError,)
+        if hasattr(aiohttp, "ConnectionTimeoutError"):
+            connect_errors += (aiohttp.ConnectionTimeoutError,)
+        return isinstance(e, connect_errors)
+
+    def _client_timeout(self, deadline: Optional[Deadline], method: str) -> Optional[aiohttp.ClientTimeout]:
+        """마감 시각이 있으면 요청 전체 타임아웃을 남은 시간으로 제한 (없으면 세션 기본값 사용)"""
+        if deadline is None:
+            return None
+        connect_timeout, read_timeout = self._http_timeout(deadline, method)
+        return aiohttp.ClientTimeout(total=deadline.remaining(), connect=connect_timeout, sock_read=read_timeout)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        tr_id: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        deadline: Optional[Deadline] = None,
+        tr_cont: str = "",
+    ) -> Dict:
+        """
+        API 요청 실행 (재시도/마감 시각 규칙은 KisAPI._request와 동일)
+
+        Args:
+            method: HTTP 메서드 (GET, POST 등)
+            endpoint: API 엔드포인트
+            tr_id: 거래 ID
+            params: URL 파라미터
+            data: 요청 본문 데이터
+            deadline: 마감 시각 (단계별 소요 시간이 기록됨)
+            tr_cont: 연속조회 요청 헤더 (다음 페이지 요청 시 N)
+
+        Returns:
+            Dict: API 응답 데이터 (응답 헤더에 tr_cont 값이 있으면 result["tr_cont"]에 포함)
+
+        Raises:
+            KisDeadlineExceeded: 마감 시각을 넘긴 경우
+            KisAPIError: API 요청 실패 시
+        """
+        started_at = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await self._request_once(method, endpoint, tr_id, params, data, deadline, tr_cont)
+                break
+            except KisAPIError as e:
+                self.metrics.count_error(tr_id, self._error_code(e))
+                if not self.retry_policy.can_retry(e.retry_category, method, attempt):
+                    logger.error(str(e))
+                    raise
+                self.metrics.count_retry(tr_id, e.msg_cd or e.retry_category or "unknown")
+                delay = self._retry_delay(e, attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    error = self._deadline_error(deadline, STAGE_RETRY_WAIT, method)
+                    logger.error(str(error))
+                    raise error from e
+                await asyncio.sleep(delay)
+                if deadline is not None:
+                    deadline.record(STAGE_RETRY_WAIT, delay)
+
+        self.metrics.observe(tr_id, STAGE_TOTAL, time.perf_counter() - started_at)
+        if deadline is not None:
+            logger.debug(f"{method} {endpoint} 단계별 소요 시간: {deadline.summary()}")
+        return result
+
+    async def _request_once(
+        self,
+        method: str,
+        endpoint: str,
+        tr_id: str,
+        params: Optional[Dict],
+        data: Optional[Dict],
+        deadline: Optional[Deadline] = None,
+        tr_cont: str = "",
+    ) -> Dict:
+        """
+        API 요청 1회 실행
+
+        Raises:
+            KisCircuitOpenError: 서킷 브레이커가 열려 있는 경우
+            KisDeadlineExceeded: 마감 시각을 넘긴 경우
+            KisAPIError: API 요청 실패 시 (retry_category에 재시도 분류 포함)
+        """
+        if self.replaying:
+            return self._replay(method, endpoint, tr_id, params, data)
+
+        session = await self._ensure_session()
+
+        # 게이트웨이 장애 중이면 호출 한도나 타임아웃을 기다리지 않고 바로 실패
+        url, breaker = self._route(endpoint)
+        self._check_circuit(breaker, endpoint)
+
+        # API 호출 제한 준수 (동기 클라이언트와 같은 버킷과 대기열 공유)
+        try:
+            sleep_time = await self._scheduler.acquire_async(tr_id, timeout=deadline.remaining() if deadline else None)
+        except TimeoutError:
+            if deadline is None:  # 마감 시각이 없으면 대기 시간 제한도 없으므로 발생하지 않음
+                raise
+            raise self._deadline_error(deadline, STAGE_RATE_LIMIT, method)
+        self.metrics.observe(tr_id, STAGE_QUEUE_WAIT, sleep_time)
+        if deadline is not None:
+            deadline.record(STAGE_RATE_LIMIT, sleep_time)
+
+        started_at = time.perf_counter()
+        headers = await self._get_headers(tr_id, tr_cont)
+        token_elapsed = time.perf_counter() - started_at
+        self.metrics.observe(tr_id, STAGE_TOKEN, token_elapsed)
+        if deadline is not None:
+            deadline.record(STAGE_TOKEN, token_elapsed)
+        timeout = self._client_timeout(deadline, method)
+
+        try:
+            started_at = time.perf_counter()
+            async with self._in_flight:
+                async with session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    json=data,
+                    timeout=timeout,
+                ) as response:
+                    status_code = response.status
+                    response_headers = response.headers
+                    content = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.request_log.log_failure(method, endpoint, tr_id, e)
+            self.metrics.count_request(tr_id, "transport")
+            if deadline is not None:
+                deadline.record(STAGE_HTTP, time.perf_counter() - started_at)
+                if deadline.expired():
+                    # 마감 시각에 맞춰 줄인 타임아웃 때문에 실패한 것이므로 서버 장애로 세지 않음
+                    raise self._deadline_error(deadline, STAGE_HTTP, method)
+            error = KisAPIError(
+                f"API 요청 실패: {str(e) or type(e).__name__}",
+                retry_category=self.retry_policy.classify_transport_error(connected=not self._is_connect_error(e)),
+            )
+            self._record_circuit(breaker, error)
+            raise error
+        elapsed = time.perf_counter() - started_at
+        self.metrics.count_request(tr_id, str(status_code))
+        self.metrics.observe(tr_id, STAGE_NETWORK, elapsed)
+        if deadline is not None:
+            deadline.record(STAGE_HTTP, elapsed)
+
+        # 상세 로그는 파일에만 기록 (민감 정보 제외, 필요할 때만 문자열 생성)
+        self.request_log.log_exchange(
+            method, endpoint, tr_id, status_code, elapsed,
+            headers=headers, params=params, data=data,
+            response_headers=response_headers, body=lambda: content.decode("utf-8", "replace"),
+        )
+
+        started_at = time.perf_counter()
+        try:
+            result = loads(content)
+        except ValueError:
+            error = self._json_error(status_code, content.decode("utf-8", "replace"))
+            self._record_circuit(breaker, error, elapsed)
+            raise error
+        self.metrics.observe(tr_id, STAGE_PARSE, time.perf_counter() - started_at)
+
+        # API 에러 체크 (토큰 만료면 갱신해 두고 재시도는 호출자가 판단)
+        error = self._result_error(status_code, result)
+        self._record_circuit(breaker, error, elapsed)
+        if error is not None:
+            if error.retry_category == RENEW_TOKEN:
+                logger.warning("토큰이 만료되었습니다. 토큰을 갱신합니다.")
+                await self._refresh_token(self._token_of(headers))
+            raise error
+
+        # 연속조회 여부는 응답 헤더로만 오므로 녹화/재생되도록 응답 데이터에 옮겨 둠
+        if response_headers.get("tr_cont"):
+            result["tr_cont"] = response_headers["tr_cont"]
+
+        self._record(method, endpoint, tr_id, params, data, result)
+        return result
+
+    async def _iter_pages(
+        self,
+        build_request: Callable[[str, str], Tuple[str, str, Dict]],
+        deadline: Optional[Deadline],
+    ) -> AsyncIterator[Dict]:
+        """연속조회키를 따라 페이지 단위로 GET 조회 (KisAPI._iter_pages 참고)"""
+        context: Optional[Tuple[str, str]] = ("", "")
+        page = 0
+        while context is not None:
+            page += 1
+            endpoint, tr_id, params = build_request(*context)
+            tr_cont = self.TR_CONT_NEXT if page > 1 else ""
+            result = await self._request("GET", endpoint, tr_id, params=params, deadline=deadline, tr_cont=tr_cont)
+            yield result
+            context = self._next_page_context(result, context, page)
+        if page > 1:
+            logger.debug(f"연속조회 완료: {endpoint} {page}페이지")
+
+    async def get_account_balance(self, deadline: DeadlineLike = None) -> Dict:
+        """
+        계좌 잔고 조회
+
+        Args:
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            Dict: 계좌 잔고 정보
+        """
+        endpoint, tr_id, params = self._account_balance_request()
+        return await self._request("GET", endpoint, tr_id, params=params, deadline=Deadline.coerce(deadline))
+
+    async def iter_balance_pages(self, deadline: DeadlineLike = None) -> AsyncIterator[Dict]:
+        """
+        계좌 잔고를 연속조회키를 따라 페이지 단위로 조회 (KisAPI.iter_balance_pages 참고)
+
+        Args:
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Yields:
+            Dict: 페이지별 잔고 응답 (output1: 보유 종목, output2: 계좌 합계)
+        """
+        async for result in self._iter_pages(self._account_balance_request, Deadline.coerce(deadline)):
+            yield result
+
+    async def iter_holdings(self, deadline: DeadlineLike = None) -> AsyncIterator[Holding]:
+        """보유 종목을 페이지 단위로 조회하며 하나씩 반환 (수량이 0인 종목 제외)"""
+        async for result in self.iter_balance_pages(deadline=deadline):
+            for holding in Holding.from_page(result):
+                yield holding
+
+    async def get_balance(self, deadline: DeadlineLike = None) -> Balance:
+        """
+        계좌 잔고 조회 (타입이 정해진 모델로 반환, 연속조회한 모든 페이지를 합침)
+
+        Args:
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            Balance: 계좌 잔고
+        """
+        summary: Dict = {}
+        holdings: List[Holding] = []
+        async for result in self.iter_balance_pages(deadline=deadline):
+            summary = Balance.page_summary(result) or summary
+            holdings.extend(Holding.from_page(result))
+        return Balance.from_summary(summary, holdings)
+
+    async def iter_order_statuses(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> AsyncIterator[OrderStatus]:
+        """
+        기간 내 모든 주문의 체결 현황 조회 (KisAPI.iter_order_statuses 참고)
+
+        Args:
+            start_date: 조회시작일자 (YYYYMMDD, 생략 시 한국 시간 기준 오늘)
+            end_date: 조회종료일자 (YYYYMMDD, 생략 시 start_date)
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Yields:
+            OrderStatus: 주문별 체결 현황 (최근 주문부터)
+        """
+        start_date = start_date or self._kst_today()
+        build_request = partial(self._daily_executions_request, start_date, end_date or start_date)
+        async for result in self._iter_pages(build_request, Deadline.coerce(deadline)):
+            for status in OrderStatus.from_page(result):
+                yield status
+
+    async def iter_minute_bars(
+        self,
+        code: str,
+        end_time: Optional[str] = None,
+        start_time: str = KisAPIBase.SESSION_OPEN,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> AsyncIterator[MinuteBars]:
+        """
+        당일 분봉을 페이지 단위로 거슬러 올라가며 조회 (KisAPI.iter_minute_bars 참고)
+
+        Args:
+            code: 종목코드
+            end_time: 가장 최근 봉의 시각 (HHMMSS, 생략 시 장 마감 시각, 장중이면 현재까지)
+            start_time: 가장 이른 봉의 시각 (HHMMSS, 생략 시 장 시작 시각)
+            market: 시장구분 (J: 주식, ETF, ETN)
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Yields:
+            MinuteBars: 페이지별 분봉 (최근 시각순, 최대 MINUTE_PAGE_SIZE건)
+        """
+        deadline = Deadline.coerce(deadline)
+        first_time = int(start_time)
+        hour: Optional[str] = end_time or self.SESSION_CLOSE
+        page = 0
+        while hour is not None:
+            page += 1
+            endpoint, tr_id, params = self._minute_bars_request(code, hour, market)
+            result = await self._request("GET", endpoint, tr_id, params=params, deadline=deadline)
+            bars = MinuteBars.from_page(code, result, first_time)
+            if bars:
+                yield bars
+            hour = self._next_minute_hour(result, bars, hour, first_time, page)
+
+    async def get_stock_price(
+        self,
+        code: str,
+        market: str = "1",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> dict:
+        """
+        국내주식 현재가(시세) 조회
+
+        Args:
+            code: 종목코드 (6자리 문자열)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            dict: 시세 정보 (캐시된 값은 여러 호출자가 공유하므로 수정하지 말 것)
+        """
+        deadline = Deadline.coerce(deadline)
+        endpoint, tr_id, params = self._stock_price_request(code, market)
+        if not use_cache or self.quote_cache is None:
+            return await self._request("GET", endpoint, tr_id, params=params, deadline=deadline)
+        return await self.quote_cache.get_or_fetch_async(
+            (code, market),
+            lambda: self._request("GET", endpoint, tr_id, params=params, deadline=deadline),
+        )
+
+    async def get_quote(
+        self,
+        code: str,
+        market: str = "J",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> Quote:
+        """
+        국내주식 현재가 조회 (타입이 정해진 모델로 반환)
+
+        Args:
+            code: 종목코드 (6자리 문자열)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            Quote: 현재가
+        """
+        result = await self.get_stock_price(code, market, use_cache=use_cache, deadline=deadline)
+        return Quote.from_output(code, result.get("output", {}))
+
+    async def get_stock_prices(
+        self,
+        codes: Iterable[str],
+        market: str = "J",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> StockPrices:
+        """
+        여러 종목 현재가 동시 조회 (KisAPI.get_stock_prices와 동일한 결과 형식)
+
+        Args:
+            codes: 종목코드 목록
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부 (주문 수량 계산에는 False)
+            deadline: 전체 조회의 마감 시각 (마감 전에 받지 못한 종목은 errors에 기록)
+
+        Returns:
+            StockPrices: 종목별 현재가, 거래량, 전일 대비 (요청 순서 유지)
+        """
+        deadline = Deadline.coerce(deadline)
+        unique_codes = list(dict.fromkeys(codes))
+        responses = await asyncio.gather(
+            *(self.get_stock_price(code, market, use_cache=use_cache, deadline=deadline) for code in unique_codes),
+            return_exceptions=True,
+        )
+
+        prices = StockPrices()
+        for code, response in zip(unique_codes, responses):
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                prices.add(code, response.get("output", {}))
+            except (KisAPIError, ValueError) as e:
+                prices.add_error(code, str(e))
+
+        logger.info(f"현재가 일괄 조회 완료: {len(prices)}종목 성공, {len(prices.errors)}종목 실패")
+        return prices
+
+    async def place_order(
+        self,
+        code: str,
+        quantity: int,
+        order_type: str = "00",  # 00: 지정가, 01: 시장가
+        side: str = "BUY",  # BUY: 매수, SELL: 매도
+        price: Optional[int] = None,  # 지정가 주문시 필요
+        market: str = "J",  # KRX
+        deadline: DeadlineLike = None,
+    ) -> Dict:
+        """
+        주식 주문 실행
+
+        Args:
+            code: 종목코드 (6자리 문자열)
+            quantity: 주문 수량
+            order_type: 주문 유형 (00: 지정가, 01: 시장가)
+            side: 매매 구분 (BUY: 매수, SELL: 매도)
+            price: 주문 가격 (지정가 주문시 필수)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 접수 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            Dict: 주문 결과
+
+        Raises:
+            KisDeadlineExceeded: 마감 시각까지 접수되지 않은 경우
+            KisAPIError: 주문 실패시
+        """
+        endpoint, tr_id, data = self._order_request(code, quantity, order_type, side, price)
+
+        try:
+            result = await self._request("POST", endpoint, tr_id, data=data, deadline=Deadline.coerce(deadline))
+            logger.info(f"주문 실행 완료: {self._mode_name} {side} {code} {quantity}주")
+            return result
+
+        except KisAPIError as e:
+            logger.error(f"주문 실행 실패: {str(e)}")
+            raise
+
+    async def place_orders(self, specs: Iterable[OrderSpec], deadline: DeadlineLike = None) -> List[OrderResult]:
+        """
+        여러 주문 일괄 실행 (KisAPI.place_orders와 동일한 순서와 결과 형식)
+
+        Args:
+            specs: 주문 목록
+            deadline: 시세 조회와 모든 주문 접수의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            List[OrderResult]: 주문별 결과 (요청 순서 유지)
+        """
+        deadline = Deadline.coerce(deadline)
+        specs = list(specs)
+        if not specs:
+            return []
+
+        started_at = time.perf_counter()
+        quotes = {
+            market: await self.get_stock_prices(codes, market, use_cache=False, deadline=deadline)
+            for market, codes in self._order_quote_codes(specs).items()
+        }
+        quote_elapsed = time.perf_counter() - started_at
+
+        async def submit(spec: OrderSpec) -> OrderResult:
+            try:
+                quantity, expected_amount = self._size_order(spec, quotes)
+            except KisAPIError as e:
+                return OrderResult(spec, 0, 0, None, 0.0, str(e))
+
+            order_started_at = time.perf_counter()
+            try:
+                result = await self.place_order(
+                    spec.code, quantity, spec.order_type, spec.side, spec.price, spec.market, deadline=deadline
+                )
+            except KisAPIError as e:
+                return OrderResult(spec, quantity, expected_amount, None, time.perf_counter() - order_started_at, str(e))
+            return OrderResult(
+                spec, quantity, expected_amount, OrderAck.from_result(result), time.perf_counter() - order_started_at, ""
+            )
+
+        started_at = time.perf_counter()
+        results = list(await asyncio.gather(*(submit(spec) for spec in specs)))
+
+        succeeded = sum(1 for result in results if result.ok)
+        logger.info(
+            f"일괄 주문 완료: {succeeded}건 성공, {len(results) - succeeded}건 실패 "
+            f"(시세 조회 {quote_elapsed:.2f}초, 주문 전송 {time.perf_counter() - started_at:.2f}초)"
+        )
+        return results
+
+    async def calculate_order_quantity(
+        self,
+        code: str,
+        budget: int,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Tuple[int, int]:
+        """
+        주어진 예산 내에서 주문 가능한 최대 수량 계산
+
+        Args:
+            code: 종목코드
+            budget: 주문 예산 (원)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            Tuple[int, int]: (주문 수량, 예상 주문 금액)
+
+        Raises:
+            KisAPIError: 시세 조회 실패시
+        """
+        quote = await self.get_quote(code, market=market, use_cache=False, deadline=deadline)
+        return self._order_quantity(code, budget, quote)
+
+    async def _fetch_price_window(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str,
+        deadline: Optional[Deadline] = None,
+    ) -> List[DailyBar]:
+        """한 구간의 과거 시세 조회 (응답이 잘리면 남은 기간을 이어서 조회)"""
+        endpoint, tr_id, params = self._historical_prices_request(code, start_date, end_date, market)
+        result = await self._request("GET", endpoint, tr_id, params=params, deadline=deadline)
+        price_data = self._parse_historical_prices(result)
+
+        next_end = self._next_window_end(start_date, price_data)
+        if next_end:
+            price_data += await self._fetch_price_window(code, start_date, next_end, market, deadline)
+        return price_data
+
+    async def get_daily_bars(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> List[DailyBar]:
+        """
+        일별 시세 조회 (구간별로 동시에 조회한 뒤 기준일자로 중복 제거)
+
+        Args:
+            code: 종목코드
+            start_date: 시작일자 (YYYYMMDD)
+            end_date: 종료일자 (YYYYMMDD)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 전체 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            List[DailyBar]: 최근 일자순 일별 시세
+
+        Raises:
+            KisAPIError: API 요청 실패시
+        """
+        deadline = Deadline.coerce(deadline)
+        windows = self._split_date_range(start_date, end_date)
+        pages = await asyncio.gather(
+            *(self._fetch_price_window(code, start, end, market, deadline) for start, end in windows)
+        )
+        return self._merge_price_pages(pages)
+
+    async def get_historical_prices(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Dict:
+        """
+        과거 시세 데이터 조회 (일별 시세를 딕셔너리로 반환, DailyBar 목록은 get_daily_bars 사용)
+
+        Args:
+            code: 종목코드
+            start_date: 시작일자 (YYYYMMDD)
+            end_date: 종료일자 (YYYYMMDD)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 전체 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+
+        Returns:
+            Dict: 조회 조건과 일별 시세 (prices: 최근 일자순 일별 시세 딕셔너리 목록)
+
+        Raises:
+            KisAPIError: API 요청 실패시
+        """
+        try:
+            bars = await self.get_daily_bars(code, start_date, end_date, market, deadline=deadline)
+
+            logger.info(f"과거 시세 데이터 조회 완료: {code} ({start_date} ~ {end_date})")
+            return {
+                "code": code,
+                "start_date": start_date,
+                "end_date": end_date,
+                "prices": [bar.to_dict() for bar in bars]
+            }
+
+        except KisAPIError as e:
+            logger.error(f"과거 시세 데이터 조회 실패: {str(e)}")
+            raise
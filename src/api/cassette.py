@@ -0,0 +1,152 @@
+"""
+API 응답 녹화/재생 모듈
+
+실제 서버(또는 모의투자 서버)에 보낸 요청과 응답을 파일에 녹화해 두었다가
+네트워크 없이 그대로 재생합니다. 재생 시에는 토큰 발급과 호출 제한 대기도 하지 않으므로
+과거 시세를 반복해서 읽는 백테스트나 회귀 테스트를 빠르게 다시 돌릴 수 있습니다.
+
+사용 예:
+    api = KisAPI(mode=KisAPI.MODE_PAPER, cassette=Cassette("data/kis.json.gz", Cassette.MODE_RECORD))
+    api.get_historical_prices("005930", "20200101", "20231231")
+    api.close()  # 녹화 내용 저장
+
+    api = KisAPI(cassette=Cassette("data/kis.json.gz"))  # 재생 (API 키 불필요)
+
+현금 주문(order-cash)은 기본적으로 녹화하지도 재생하지도 않습니다. (재생 시 주문 요청은 오류)
+KIS_CASSETTE_MODE 환경 변수가 남아 있는 실거래 프로세스가 녹화된 주문 접수 응답을 받고
+실제로는 보내지 않은 주문을 체결된 것으로 기록하는 일을 막기 위해서입니다.
+주문까지 녹화/재생해야 하는 회귀 테스트는 Cassette(..., allow_orders=True)를 직접 넘기세요.
+
+녹화 파일은 gzip으로 압축한 JSON이며, 요청 키별로 응답 목록을 저장합니다.
+같은 요청을 여러 번 녹화했다면 녹화된 순서대로 재생하고, 목록이 끝나면 마지막 응답을 반복합니다.
+"""
+import atexit
+import gzip
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+# 녹화 파일 형식 버전
+CASSETTE_VERSION = 1
+
+# 요청 키에서 제외하는 파라미터 (계좌가 달라도 같은 녹화를 쓰고, 계좌번호를 파일에 남기지 않음)
+IGNORED_PARAMS = frozenset({"CANO", "ACNT_PRDT_CD"})
+
+
+class CassetteMiss(LookupError):
+    """재생할 녹화 응답이 없는 경우"""
+
+
+def request_key(method: str, endpoint: str, tr_id: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> str:
+    """
+    녹화 키 생성 (파라미터 순서와 값의 자료형은 무시)
+
+    Args:
+        method: HTTP 메서드
+        endpoint: API 엔드포인트
+        tr_id: 거래 ID
+        params: URL 파라미터
+        data: 요청 본문 데이터
+
+    Returns:
+        str: 녹화 키 (예: GET /uapi/.../inquire-price FHKST01010100 FID_COND_MRKT_DIV_CODE=J&FID_INPUT_ISCD=005930)
+    """
+    fields = dict(params or {})
+    fields.update(data or {})
+    query = "&".join(
+        f"{name}={fields[name]}" for name in sorted(fields) if name not in IGNORED_PARAMS
+    )
+    return f"{method.upper()} {endpoint} {tr_id} {query}"
+
+
+class Cassette:
+    """API 응답 녹화/재생 파일 (스레드 안전)"""
+
+    MODE_RECORD = "record"  # 실제 요청을 보내고 응답을 녹화
+    MODE_REPLAY = "replay"  # 네트워크 없이 녹화된 응답만 사용
+
+    def __init__(self, path: str, mode: str = MODE_REPLAY, allow_orders: bool = False):
+        """
+        Args:
+            path: 녹화 파일 경로 (.json.gz)
+            mode: record 또는 replay
+            allow_orders: 현금 주문도 녹화/재생할지 여부 (테스트용, 환경 변수로 만든 녹화 파일은 항상 False)
+
+        Raises:
+            ValueError: mode가 올바르지 않은 경우
+            FileNotFoundError: 재생할 녹화 파일이 없는 경우
+        """
+        if mode not in (self.MODE_RECORD, self.MODE_REPLAY):
+            raise ValueError(f"지원하지 않는 녹화 모드입니다: {mode}")
+        self.path = path
+        self.mode = mode
+        self.allow_orders = allow_orders
+        self._entries: Dict[str, List[Dict]] = {}
+        self._positions: Dict[str, int] = {}  # 재생 중인 응답 위치
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.replaying or os.path.exists(path):
+            self._entries = self._read(path)
+        if not self.replaying:
+            # close()를 부르지 않고 끝나도 녹화 내용이 남도록
+            atexit.register(self.save)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == self.MODE_REPLAY
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, List[Dict]]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            archive = json.load(f)
+        if archive.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"지원하지 않는 녹화 파일 버전입니다: {archive.get('version')}")
+        return archive["entries"]
+
+    def record(self, method: str, endpoint: str, tr_id: str, params: Optional[Dict], data: Optional[Dict], result: Dict) -> None:
+        """정상 응답 녹화 (재생 모드에서는 무시)"""
+        if self.replaying:
+            return
+        key = request_key(method, endpoint, tr_id, params, data)
+        with self._lock:
+            self._entries.setdefault(key, []).append(result)
+            self._dirty = True
+
+    def play(self, method: str, endpoint: str, tr_id: str, params: Optional[Dict], data: Optional[Dict]) -> Dict:
+        """
+        녹화된 응답 반환
+
+        Returns:
+            Dict: 녹화된 응답 데이터
+
+        Raises:
+            CassetteMiss: 녹화되지 않은 요청인 경우
+        """
+        key = request_key(method, endpoint, tr_id, params, data)
+        with self._lock:
+            responses = self._entries.get(key)
+            if not responses:
+                raise CassetteMiss(f"녹화된 응답이 없습니다: {key}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return responses[min(position, len(responses) - 1)]
+
+    def save(self) -> None:
+        """녹화 내용을 파일에 저장 (바뀐 내용이 없으면 건너뜀, 임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            archive = {"version": CASSETTE_VERSION, "entries": self._entries}
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(archive, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(responses) for responses in self._entries.values())
@@ -0,0 +1,149 @@
+"""
+API 서킷 브레이커 모듈
+
+KIS 게이트웨이가 장애/지연 상태일 때 모든 호출자가 타임아웃까지 기다리고
+재시도까지 겹치면 스레드가 묶이고 장애 서버에 요청이 더 몰립니다.
+연속 실패(또는 응답 지연)가 기준을 넘으면 회로를 열어 요청을 바로 실패시키고,
+일정 시간이 지나면 요청 하나만 보내(half-open) 회복 여부를 확인합니다.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config.settings import (
+    KIS_CIRCUIT_FAILURE_THRESHOLD,
+    KIS_CIRCUIT_RESET_TIMEOUT,
+    KIS_CIRCUIT_LATENCY_SLO,
+)
+
+# 회로 상태
+CLOSED = "closed"  # 정상: 모든 요청 허용
+OPEN = "open"  # 차단: 요청을 보내지 않고 바로 실패
+HALF_OPEN = "half_open"  # 확인 중: 시험 요청 하나만 허용
+
+# 엔드포인트 분류 (장애 범위가 서로 다르므로 따로 차단)
+ENDPOINT_ORDER = "order"  # 주문 (/trading/order-*)
+ENDPOINT_ACCOUNT = "account"  # 잔고/체결 조회 (/trading/inquire-*)
+ENDPOINT_QUOTE = "quote"  # 시세 조회 (/quotations/*)
+
+
+def endpoint_class(endpoint: str) -> str:
+    """
+    API 엔드포인트 분류
+
+    Args:
+        endpoint: API 엔드포인트 (예: /uapi/domestic-stock/v1/trading/order-cash)
+
+    Returns:
+        str: 엔드포인트 분류 (order, account, quote)
+    """
+    if "/trading/order" in endpoint:
+        return ENDPOINT_ORDER
+    if "/trading/" in endpoint:
+        return ENDPOINT_ACCOUNT
+    return ENDPOINT_QUOTE
+
+
+class CircuitBreaker:
+    """연속 실패/지연 기준 서킷 브레이커 (스레드 안전)"""
+
+    def __init__(
+        self,
+        failure_threshold: int = KIS_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = KIS_CIRCUIT_RESET_TIMEOUT,
+        latency_slo: float = KIS_CIRCUIT_LATENCY_SLO,
+    ):
+        """
+        Args:
+            failure_threshold: 회로를 여는 연속 실패 횟수
+            reset_timeout: 회로를 연 뒤 시험 요청을 보내기까지 기다리는 시간 (초)
+            latency_slo: 이 시간(초)보다 오래 걸린 응답은 실패로 셈 (0이면 지연은 보지 않음)
+        """
+        if failure_threshold < 1 or reset_timeout <= 0:
+            raise ValueError("failure_threshold는 1 이상, reset_timeout은 0보다 커야 합니다.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_slo = latency_slo
+        self.state = CLOSED
+        self.failures = 0  # 연속 실패 횟수
+        self.rejected = 0  # 회로가 열려 바로 실패시킨 요청 수
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[float]:
+        """
+        요청 허용 여부 확인
+
+        Returns:
+            Optional[float]: 허용하면 None, 차단하면 다음 시험 요청까지 남은 시간 (초)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return None
+            now = time.monotonic()
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - now
+                if remaining > 0:
+                    self.rejected += 1
+                    return remaining
+                self.state = HALF_OPEN
+                self._probe_started_at = None
+            # 시험 요청은 하나만 보냄 (결과를 기록하지 못한 시험 요청은 reset_timeout 뒤에 다시 시도)
+            if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+                self.rejected += 1
+                return self._probe_started_at + self.reset_timeout - now
+            self._probe_started_at = now
+            return None
+
+    def record_success(self, elapsed: float = 0.0) -> None:
+        """
+        응답 성공 기록 (latency_slo를 넘긴 응답은 실패로 기록)
+
+        Args:
+            elapsed: 응답 소요 시간 (초)
+        """
+        if self.latency_slo > 0 and elapsed > self.latency_slo:
+            self.record_failure()
+            return
+        with self._lock:
+            self.failures = 0
+            self.state = CLOSED
+            self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """게이트웨이 실패 기록 (시험 요청이 실패하면 바로 다시 엶)"""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
+
+    def stats(self) -> Dict[str, object]:
+        """회로 상태 통계"""
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+# (base_url, 엔드포인트 분류)별 공유 인스턴스 (같은 서버를 쓰는 모든 클라이언트가 상태를 공유)
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(base_url: str, endpoint: str) -> CircuitBreaker:
+    """
+    서버/엔드포인트 분류에 해당하는 공유 서킷 브레이커 반환
+
+    Args:
+        base_url: API 서버 주소
+        endpoint: API 엔드포인트
+
+    Returns:
+        CircuitBreaker: 공유 서킷 브레이커
+    """
+    key = (base_url, endpoint_class(endpoint))
+    with _breakers_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker()
+        return _breakers[key]
@@ -0,0 +1,319 @@
+"""
+여러 앱키 API 클라이언트 풀 모듈
+
+KIS 호출 한도는 앱키 단위로 적용되므로, 앱키를 여러 개 등록하면 그만큼 시세를 더 많이 조회할 수 있습니다.
+KisClientPool은 앱키마다 토큰과 호출 제한기를 따로 가진 KisAPI를 두고,
+시세/과거 시세 같은 조회 요청은 덜 바쁜 클라이언트(또는 순서대로)에 나눠 보내며,
+주문과 잔고 조회는 해당 계좌의 클라이언트로만 보냅니다.
+
+사용 예:
+    with KisClientPool.from_settings(mode=KisAPI.MODE_REAL) as pool:  # KIS_APP_KEY, KIS_APP_KEY_2 ...
+        prices = pool.get_stock_prices(all_codes)
+        pool.place_order("005930", 1, "01", account_no="1234567801")
+"""
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from config.settings import (
+    KIS_APP_KEY,
+    KIS_APP_SECRET,
+    KIS_ACCOUNT_NO,
+    KIS_PAPER_APP_KEY,
+    KIS_PAPER_APP_SECRET,
+    KIS_PAPER_ACCOUNT_NO,
+    KIS_EXTRA_CREDENTIALS,
+    KIS_PAPER_EXTRA_CREDENTIALS,
+    KIS_POOL_STRATEGY,
+    KIS_QUOTE_CACHE_TTL,
+    KIS_QUOTE_CACHE_SIZE,
+)
+from src.api.deadline import Deadline, DeadlineLike
+from src.api.kis_api import KisAPI, KisAPIError
+from src.api.models import Balance, DailyBar, Holding, MinuteBars, OrderResult, OrderSpec, Quote, StockPrices
+from src.api.quote_cache import QuoteCache
+
+# 조회 요청 분배 방식
+LEAST_LOADED = "least_loaded"  # 호출 제한 대기 시간이 가장 짧은 클라이언트 (같으면 진행 중 요청이 적은 쪽)
+ROUND_ROBIN = "round_robin"  # 순서대로
+
+Credentials = Tuple[str, str, str]  # (앱키, 앱시크릿, 계좌번호)
+
+
+class KisClientPool:
+    """앱키별 KisAPI 묶음 (스레드 안전)"""
+
+    def __init__(self, clients: Sequence[KisAPI], strategy: str = KIS_POOL_STRATEGY):
+        """
+        Args:
+            clients: 앱키가 서로 다른 API 클라이언트 (첫 번째가 계좌를 지정하지 않은 주문의 기본 계좌)
+            strategy: 조회 요청 분배 방식 (least_loaded, round_robin)
+
+        Raises:
+            ValueError: 클라이언트가 없거나 분배 방식이 올바르지 않은 경우
+        """
+        if not clients:
+            raise ValueError("클라이언트가 하나 이상 필요합니다.")
+        if strategy not in (LEAST_LOADED, ROUND_ROBIN):
+            raise ValueError(f"지원하지 않는 분배 방식입니다: {strategy}")
+        self.clients: List[KisAPI] = list(clients)
+        self.strategy = strategy
+        self._accounts: Dict[str, KisAPI] = {}
+        for client in self.clients:
+            self._accounts.setdefault(client.account_no, client)
+        self._in_flight = [0] * len(self.clients)
+        self.routed = [0] * len(self.clients)  # 클라이언트별 분배된 조회 요청 수
+        self._round_robin = itertools.cycle(range(len(self.clients)))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_credentials(
+        cls,
+        credentials: Iterable[Credentials],
+        mode: str = KisAPI.MODE_REAL,
+        strategy: str = KIS_POOL_STRATEGY,
+        **client_kwargs,
+    ) -> "KisClientPool":
+        """
+        앱키 목록으로 풀 생성 (현재가 캐시는 모든 클라이언트가 공유)
+
+        Args:
+            credentials: (앱키, 앱시크릿, 계좌번호) 목록
+            mode: 거래 모드 (real: 실전투자, paper: 모의투자)
+            strategy: 조회 요청 분배 방식
+            **client_kwargs: KisAPI에 넘길 추가 인자 (base_url, pool_size 등)
+
+        Returns:
+            KisClientPool: 생성된 풀
+        """
+        if "quote_cache" not in client_kwargs and KIS_QUOTE_CACHE_TTL > 0:
+            # 어느 앱키로 조회했든 같은 종목 시세는 한 번만 조회
+            client_kwargs["quote_cache"] = QuoteCache(ttl=KIS_QUOTE_CACHE_TTL, maxsize=KIS_QUOTE_CACHE_SIZE)
+        clients = []
+        seen = set()
+        for app_key, app_secret, account_no in credentials:
+            if app_key in seen:
+                # 같은 앱키는 호출 한도를 공유하므로 늘려도 처리량이 늘지 않음
+                logger.warning("중복된 앱키는 한 번만 사용합니다.")
+                continue
+            seen.add(app_key)
+            clients.append(KisAPI(
+                mode=mode, app_key=app_key, app_secret=app_secret, account_no=account_no, **client_kwargs
+            ))
+        logger.info(f"API 클라이언트 풀이 초기화되었습니다. (앱키 {len(clients)}개, 분배 방식: {strategy})")
+        return cls(clients, strategy=strategy)
+
+    @classmethod
+    def from_settings(cls, mode: str = KisAPI.MODE_REAL, strategy: str = KIS_POOL_STRATEGY, **client_kwargs) -> "KisClientPool":
+        """기본 앱키와 번호를 붙인 추가 앱키(KIS_APP_KEY_2 ...)로 풀 생성"""
+        if mode == KisAPI.MODE_PAPER:
+            credentials = [(KIS_PAPER_APP_KEY, KIS_PAPER_APP_SECRET, KIS_PAPER_ACCOUNT_NO)] + KIS_PAPER_EXTRA_CREDENTIALS
+        else:
+            credentials = [(KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT_NO)] + KIS_EXTRA_CREDENTIALS
+        return cls.from_credentials(credentials, mode=mode, strategy=strategy, **client_kwargs)
+
+    def close(self) -> None:
+        for client in self.clients:
+            client.close()
+
+    def __enter__(self) -> "KisClientPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    # 분배
+
+    def _pick(self) -> int:
+        if self.strategy == ROUND_ROBIN:
+            return next(self._round_robin)
+        return min(
+            range(len(self.clients)),
+            key=lambda i: (self.clients[i].estimated_wait(), self._in_flight[i]),
+        )
+
+    @contextmanager
+    def _lease(self) -> Iterator[KisAPI]:
+        """조회 요청을 보낼 클라이언트 선택 (요청이 끝날 때까지 진행 중으로 셈)"""
+        with self._lock:
+            index = self._pick()
+            self._in_flight[index] += 1
+            self.routed[index] += 1
+        try:
+            yield self.clients[index]
+        finally:
+            with self._lock:
+                self._in_flight[index] -= 1
+
+    def client(self, account_no: Optional[str] = None) -> KisAPI:
+        """
+        계좌의 클라이언트 (주문/잔고 조회용)
+
+        Args:
+            account_no: 계좌번호 10자리 (생략 시 첫 번째 클라이언트의 계좌)
+
+        Raises:
+            KisAPIError: 풀에 없는 계좌인 경우
+        """
+        if account_no is None:
+            return self.clients[0]
+        client = self._accounts.get(account_no)
+        if client is None:
+            raise KisAPIError(f"풀에 등록되지 않은 계좌입니다: {account_no[:4]}****")
+        return client
+
+    # 조회 (앱키에 나눠 보냄)
+
+    def get_stock_price(self, code: str, market: str = "J", use_cache: bool = True, deadline: DeadlineLike = None) -> dict:
+        """국내주식 현재가(시세) 조회 (KisAPI.get_stock_price 참고)"""
+        with self._lease() as client:
+            return client.get_stock_price(code, market, use_cache=use_cache, deadline=deadline)
+
+    def get_quote(self, code: str, market: str = "J", use_cache: bool = True, deadline: DeadlineLike = None) -> Quote:
+        """국내주식 현재가 조회 (KisAPI.get_quote 참고)"""
+        result = self.get_stock_price(code, market, use_cache=use_cache, deadline=deadline)
+        return Quote.from_output(code, result.get("output", {}))
+
+    def get_stock_prices(
+        self,
+        codes: Iterable[str],
+        market: str = "J",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> StockPrices:
+        """
+        여러 종목 현재가 동시 조회 (종목마다 덜 바쁜 앱키로 보내므로 앱키 수만큼 빨라짐)
+
+        Args:
+            codes: 종목코드 목록
+            market: 시장 분류 코드 (FID_COND_MRKT_DIV_CODE, J: KRX 주식/ETF/ETN)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부 (주문 수량 계산에는 False)
+            deadline: 전체 조회의 마감 시각 (마감 전에 받지 못한 종목은 errors에 기록)
+
+        Returns:
+            StockPrices: 종목별 현재가, 거래량, 전일 대비 (요청 순서 유지)
+        """
+        deadline = Deadline.coerce(deadline)
+        unique_codes = list(dict.fromkeys(codes))
+        prices = StockPrices()
+        if not unique_codes:
+            return prices
+
+        workers = min(len(unique_codes), sum(client.pool_size for client in self.clients))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-pool-quote") as executor:
+            futures = {
+                code: executor.submit(self.get_stock_price, code, market, use_cache=use_cache, deadline=deadline)
+                for code in unique_codes
+            }
+
+        for code, future in futures.items():
+            try:
+                prices.add(code, future.result().get("output", {}))
+            except (KisAPIError, ValueError) as e:
+                prices.add_error(code, str(e))
+
+        logger.info(f"현재가 일괄 조회 완료: {len(prices)}종목 성공, {len(prices.errors)}종목 실패 (앱키 {len(self.clients)}개)")
+        return prices
+
+    def get_daily_bars(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> List[DailyBar]:
+        """일별 시세 조회 (KisAPI.get_daily_bars 참고, 한 종목은 한 앱키로 조회)"""
+        with self._lease() as client:
+            return client.get_daily_bars(code, start_date, end_date, market, deadline=deadline)
+
+    def get_historical_prices(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Dict:
+        """과거 시세 데이터 조회 (KisAPI.get_historical_prices 참고, 한 종목은 한 앱키로 조회)"""
+        with self._lease() as client:
+            return client.get_historical_prices(code, start_date, end_date, market, deadline=deadline)
+
+    def iter_minute_bars(
+        self,
+        code: str,
+        end_time: Optional[str] = None,
+        start_time: str = KisAPI.SESSION_OPEN,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Iterator[MinuteBars]:
+        """당일 분봉 페이지 단위 조회 (KisAPI.iter_minute_bars 참고, 반복이 끝날 때까지 한 앱키로 조회)"""
+        with self._lease() as client:
+            yield from client.iter_minute_bars(code, end_time, start_time, market, deadline=deadline)
+
+    # 주문/잔고 (계좌 클라이언트로만 보냄)
+
+    def get_account_balance(self, account_no: Optional[str] = None, deadline: DeadlineLike = None) -> Dict:
+        return self.client(account_no).get_account_balance(deadline=deadline)
+
+    def get_balance(self, account_no: Optional[str] = None, deadline: DeadlineLike = None) -> Balance:
+        return self.client(account_no).get_balance(deadline=deadline)
+
+    def iter_holdings(self, account_no: Optional[str] = None, deadline: DeadlineLike = None) -> Iterator[Holding]:
+        return self.client(account_no).iter_holdings(deadline=deadline)
+
+    def place_order(
+        self,
+        code: str,
+        quantity: int,
+        order_type: str = "00",
+        side: str = "BUY",
+        price: Optional[int] = None,
+        market: str = "J",
+        account_no: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> Dict:
+        """주식 주문 실행 (KisAPI.place_order 참고, account_no 계좌의 앱키로만 전송)"""
+        return self.client(account_no).place_order(
+            code, quantity, order_type, side, price, market, deadline=deadline
+        )
+
+    def place_orders(
+        self,
+        specs: Iterable[OrderSpec],
+        account_no: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> List[OrderResult]:
+        """여러 주문 일괄 실행 (KisAPI.place_orders 참고, account_no 계좌의 앱키로만 전송)"""
+        return self.client(account_no).place_orders(specs, deadline=deadline)
+
+    def place_regular_order(
+        self,
+        code: str,
+        budget: int,
+        market: str = "J",
+        account_no: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> Dict:
+        """정기 주문 실행 (KisAPI.place_regular_order 참고, account_no 계좌의 앱키로만 전송)"""
+        return self.client(account_no).place_regular_order(code, budget, market, deadline=deadline)
+
+    def stats(self) -> List[Dict[str, object]]:
+        """클라이언트별 분배 통계 (계좌번호는 앞 4자리만)"""
+        with self._lock:
+            return [
+                {
+                    "account": f"{client.account_no[:4]}****",
+                    "routed": self.routed[i],
+                    "in_flight": self._in_flight[i],
+                    "estimated_wait": round(client.estimated_wait(), 3),
+                }
+                for i, client in enumerate(self.clients)
+            ]
@@ -0,0 +1,95 @@
+"""
+요청 마감 시각(deadline) 관리 모듈
+
+하나의 API 호출은 호출 제한 대기, 토큰 갱신, HTTP 요청, 재시도 대기를 거치므로
+단계마다 타임아웃을 따로 주면 전체 소요 시간을 보장할 수 없습니다.
+Deadline은 호출 전체에 남은 시간을 각 단계에 나눠 주고, 단계별 소요 시간을 기록합니다.
+
+사용 예:
+    api.place_order(code, 1, "01", deadline=datetime(2024, 1, 2, 10, 0, 5))  # 10:00:05까지 접수 안 되면 포기
+    api.get_stock_price(code, deadline=2.0)  # 2초 안에 응답이 없으면 포기
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+# 단계 이름
+STAGE_RATE_LIMIT = "rate_limit"  # 호출 제한 대기
+STAGE_TOKEN = "token"  # 토큰 발급/갱신
+STAGE_HTTP = "http"  # HTTP 요청/응답
+STAGE_RETRY_WAIT = "retry_wait"  # 재시도 전 대기
+
+
+class Deadline:
+    """호출 전체의 마감 시각과 단계별 소요 시간 (여러 스레드가 같은 Deadline을 공유할 수 있음)"""
+
+    def __init__(self, expires_at: float):
+        """
+        Args:
+            expires_at: 마감 시각 (time.monotonic() 기준)
+        """
+        self.expires_at = expires_at
+        self.started_at = time.monotonic()
+        self.timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """지금부터 seconds초 뒤에 마감"""
+        return cls(time.monotonic() + seconds)
+
+    @classmethod
+    def at(cls, when: datetime) -> "Deadline":
+        """
+        지정한 시각에 마감 (시간대가 없는 datetime은 로컬 시각으로 해석)
+
+        시스템 시계가 바뀌어도 영향을 받지 않도록 생성 시점에 monotonic 기준으로 변환합니다.
+        """
+        return cls(time.monotonic() + (when.timestamp() - time.time()))
+
+    @classmethod
+    def coerce(cls, value: "DeadlineLike") -> Optional["Deadline"]:
+        """
+        공개 메서드의 deadline 인자를 Deadline으로 변환
+
+        Args:
+            value: Deadline, 마감 시각(datetime), 남은 시간(초) 또는 None
+
+        Returns:
+            Optional[Deadline]: 마감이 없으면 None
+        """
+        if value is None or isinstance(value, Deadline):
+            return value
+        if isinstance(value, datetime):
+            return cls.at(value)
+        return cls.after(float(value))
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 마감이 지났으면 0)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def clamp(self, timeout: float) -> float:
+        """단계 타임아웃을 남은 시간 이하로 제한"""
+        return min(timeout, self.remaining())
+
+    def record(self, stage: str, elapsed: float) -> None:
+        """단계 소요 시간 누적 (재시도로 같은 단계를 여러 번 거치면 합산)"""
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+    def elapsed(self) -> float:
+        """생성 후 경과 시간 (초)"""
+        return time.monotonic() - self.started_at
+
+    def summary(self) -> str:
+        """단계별 소요 시간 요약 (예: rate_limit=0.120s http=0.340s)"""
+        with self._lock:
+            timings = dict(self.timings)
+        return " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timings.items())
+
+
+DeadlineLike = Union[Deadline, datetime, float, None]
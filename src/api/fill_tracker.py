@@ -0,0 +1,237 @@
+"""
+주문 체결 확인 모듈
+
+주문 접수 응답(order-cash)에는 체결 여부가 없으므로, FillTracker가 일별 주문 체결 조회
+(inquire-daily-ccld)를 반복해 추적 중인 주문의 새 체결을 FillEvent로 알려 줍니다.
+주문 수와 관계없이 조회 한 번(연속조회 페이지 포함)으로 모든 주문을 확인하고,
+새 체결이 없으면 조회 간격을 점점 늘려 호출 한도를 아낍니다.
+
+사용 예:
+    tracker = FillTracker(api, on_fill=lambda event: logger.info(event))
+    tracker.track_results(api.place_orders(specs))
+    events = tracker.wait(timeout=30)  # 모든 주문이 끝나거나 30초가 지나면 반환
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from config.settings import KIS_FILL_POLL_MIN_INTERVAL, KIS_FILL_POLL_MAX_INTERVAL, KIS_FILL_POLL_BACKOFF
+from src.api.deadline import DeadlineLike
+from src.api.kis_api import KisAPI, KisAPIError
+from src.api.models import FillEvent, OrderResult, OrderStatus
+
+
+class FillTracker:
+    """주문 체결 추적기 (스레드 안전)"""
+
+    def __init__(
+        self,
+        api: KisAPI,
+        on_fill: Optional[Callable[[FillEvent], None]] = None,
+        min_interval: float = KIS_FILL_POLL_MIN_INTERVAL,
+        max_interval: float = KIS_FILL_POLL_MAX_INTERVAL,
+        backoff: float = KIS_FILL_POLL_BACKOFF,
+    ):
+        """
+        Args:
+            api: 주문한 계좌의 API 클라이언트
+            on_fill: 새 체결을 확인할 때마다 호출할 함수 (조회하는 스레드에서 호출됨)
+            min_interval: 조회 간격 최소값 (초, 새 체결이나 새 주문이 있으면 이 값으로 돌아감)
+            max_interval: 조회 간격 상한 (초)
+            backoff: 새 체결이 없을 때 조회 간격에 곱할 배수
+
+        Raises:
+            ValueError: 조회 간격 설정이 올바르지 않은 경우
+        """
+        if min_interval <= 0 or max_interval < min_interval or backoff < 1:
+            raise ValueError("조회 간격은 0 < min_interval <= max_interval, backoff >= 1 이어야 합니다.")
+        self.api = api
+        self.on_fill = on_fill
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval  # 다음 조회까지 기다릴 시간
+        self.polls = 0  # 체결 조회 횟수
+        self.events = 0  # 알린 체결 이벤트 수
+        self._open: Dict[str, int] = {}  # 추적 중인 주문번호 -> 지금까지 확인한 체결 수량
+        self._lock = threading.Lock()
+        self._wake = threading.Event()  # 새 주문 추적 시 대기 중인 조회를 깨움
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # 추적 대상
+
+    def track(self, order_no: str) -> None:
+        """주문 추적 시작 (이미 추적 중이면 무시)"""
+        with self._lock:
+            self._open.setdefault(order_no, 0)
+            self.interval = self.min_interval
+        self._wake.set()
+
+    def track_results(self, results: Iterable[OrderResult]) -> int:
+        """
+        일괄 주문 결과 중 접수된 주문 추적 시작
+
+        Returns:
+            int: 추적을 시작한 주문 수
+        """
+        count = 0
+        for result in results:
+            if result.ok and result.ack is not None and result.ack.order_no:
+                self.track(result.ack.order_no)
+                count += 1
+        return count
+
+    def untrack(self, order_no: str) -> None:
+        """주문 추적 중지 (추적 중이 아니면 무시)"""
+        with self._lock:
+            self._open.pop(order_no, None)
+
+    @property
+    def open_orders(self) -> List[str]:
+        """아직 끝나지 않은 주문번호"""
+        with self._lock:
+            return list(self._open)
+
+    # 조회
+
+    def poll(self, deadline: DeadlineLike = None) -> List[FillEvent]:
+        """
+        체결 조회 1회 (추적 중인 모든 주문을 한 번의 조회로 확인)
+
+        새 체결이 있으면 조회 간격을 최소값으로 되돌리고, 없으면 backoff배 늘립니다.
+        조회 결과에 아직 나타나지 않은 주문은 계속 추적합니다.
+
+        Args:
+            deadline: 조회 마감 시각
+
+        Returns:
+            List[FillEvent]: 이번 조회에서 확인한 새 체결
+
+        Raises:
+            KisAPIError: 조회 실패시
+        """
+        with self._lock:
+            if not self._open:
+                return []
+        statuses: Dict[str, OrderStatus] = {
+            status.order_no: status for status in self.api.iter_order_statuses(deadline=deadline)
+        }
+
+        events: List[FillEvent] = []
+        with self._lock:
+            self.polls += 1
+            for order_no, seen in list(self._open.items()):
+                status: Optional[OrderStatus] = statuses.get(order_no)
+                if status is None:
+                    continue
+                if status.filled_quantity > seen:
+                    events.append(FillEvent(
+                        order_no=order_no,
+                        code=status.code,
+                        side=status.side,
+                        quantity=status.filled_quantity - seen,
+                        filled_quantity=status.filled_quantity,
+                        order_quantity=status.quantity,
+                        avg_price=status.avg_fill_price,
+                        done=status.done,
+                    ))
+                    self._open[order_no] = status.filled_quantity
+                if status.done:
+                    del self._open[order_no]
+                    if status.filled_quantity < status.quantity:
+                        logger.warning(
+                            f"주문 {order_no} 종료: {status.code} {status.filled_quantity}/{status.quantity}주 체결"
+                            f"{' (취소)' if status.cancelled else ''}"
+                        )
+            if events:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+            self.events += len(events)
+
+        for event in events:
+            if self.on_fill is not None:
+                try:
+                    self.on_fill(event)
+                except Exception as e:
+                    logger.error(f"체결 이벤트 처리 중 오류 발생: {str(e)}")
+        return events
+
+    def _poll_safely(self) -> List[FillEvent]:
+        """조회 실패 시 예외 대신 경고를 남기고 간격을 늘림 (다음 주기에 다시 조회)"""
+        try:
+            return self.poll()
+        except KisAPIError as e:
+            with self._lock:
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+            logger.warning(f"체결 조회 실패, {self.interval:.1f}초 후 재시도: {str(e)}")
+            return []
+
+    def wait(self, timeout: Optional[float] = None) -> List[FillEvent]:
+        """
+        추적 중인 주문이 모두 끝나거나 timeout이 지날 때까지 체결 조회 반복
+
+        Args:
+            timeout: 최대 대기 시간 (초, 생략 시 모든 주문이 끝날 때까지)
+
+        Returns:
+            List[FillEvent]: 대기하는 동안 확인한 체결 (남은 주문은 open_orders로 확인)
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        events: List[FillEvent] = []
+        while self.open_orders and not self._stop.is_set():
+            events += self._poll_safely()
+            if not self.open_orders:
+                break
+            wait = self.interval
+            if expires_at is not None:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = min(wait, remaining)
+            self._stop.wait(wait)
+        return events
+
+    # 백그라운드 실행
+
+    @property
+    def running(self) -> bool:
+        """백그라운드 체결 조회 중인지 여부"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 체결 조회 시작 (추적 중인 주문이 없으면 새 주문을 기다림)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kis-fill-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """백그라운드 체결 조회 중지"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            if self.open_orders:
+                self._poll_safely()
+                if self.open_orders:
+                    self._wake.wait(self.interval)
+                    continue
+            self._wake.wait()  # 새 주문을 추적할 때까지 조회하지 않음
+
+    def __enter__(self) -> "FillTracker":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
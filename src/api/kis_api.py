@@ -1,56 +1,95 @@
 """
 한국투자증권 API 연동 모듈
+
+import만으로는 로거 설정이나 디렉토리 생성 같은 부수 효과가 없습니다.
+실행 스크립트에서 src.utils.log_setup.setup_logging()으로 로그 출력을 설정하세요.
+requests는 import 비용이 커서 동기 클라이언트(KisAPI)를 처음 만들 때 불러옵니다.
 """
-from datetime import datetime, timedelta
-import json
-import os
-from typing import Dict, Optional, Tuple
-import requests
+from datetime import datetime, timedelta, timezone
+from functools import partial
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 from loguru import logger
-import sys
 import time
 
 from config.settings import KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT_NO, KIS_PAPER_APP_KEY, KIS_PAPER_APP_SECRET, KIS_PAPER_ACCOUNT_NO
+from config.settings import KIS_HTTP_POOL_SIZE, KIS_HTTP_CONNECT_TIMEOUT, KIS_HTTP_READ_TIMEOUT
+from config.settings import KIS_QUOTE_CACHE_TTL, KIS_QUOTE_CACHE_SIZE, KIS_TOKEN_REFRESH_MARGIN, KIS_BASE_URL
+from config.settings import KIS_CASSETTE_MODE, KIS_CASSETTE_PATH
+from src.api.cassette import Cassette, CassetteMiss
+from src.api.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from src.api.deadline import STAGE_HTTP, STAGE_RATE_LIMIT, STAGE_RETRY_WAIT, STAGE_TOKEN, Deadline, DeadlineLike
+from src.api.metrics import STAGE_NETWORK, STAGE_PARSE, STAGE_QUEUE_WAIT, STAGE_TOTAL, get_metrics
+from src.api.models import Balance, DailyBar, Holding, MinuteBars, OrderAck, OrderResult, OrderSpec, OrderStatus, Quote, StockPrices, loads
+from src.api.quote_cache import QuoteCache
+from src.api.rate_limiter import ALL_ORDER_TR_IDS, ORDER_TR_IDS, RateLimiter, get_rate_limiter
+from src.api.request_context import PreparedRequest, RequestContext
+from src.api.request_log import RequestLogger, truncate
+from src.api.scheduler import get_scheduler
+from src.api.retry import MSG_RATE_LIMITED, RENEW_TOKEN, TRANSIENT, RetryPolicy
+from src.api.token_store import Token, TokenStore, token_key
 
-# 로그 디렉토리 설정
-LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
-
-# 로그 파일 경로 설정 (날짜별)
-LOG_FILE = os.path.join(LOG_DIR, f"kis_api_{datetime.now().strftime('%Y%m%d')}.log")
+if TYPE_CHECKING:
+    import requests
 
-# 기존 로거 제거
-logger.remove()
-
-# 터미널 출력 설정 (간단한 포맷)
-logger.add(
-    sys.stderr,
-    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
-    level="INFO",
-    colorize=True
-)
+class KisAPIError(Exception):
+    """한국투자증권 API 관련 예외"""
+    
+    def __init__(
+        self,
+        message: str = "",
+        status_code: Optional[int] = None,
+        msg_cd: Optional[str] = None,
+        retry_category: Optional[str] = None,
+    ):
+        """
+        Args:
+            message: 오류 메시지
+            status_code: HTTP 상태 코드 (응답을 받은 경우)
+            msg_cd: KIS 응답 코드 (예: EGW00201)
+            retry_category: 재시도 분류 (src.api.retry 참고, 재시도 대상이 아니면 None)
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.msg_cd = msg_cd
+        self.retry_category = retry_category
 
-# 파일 출력 설정 (상세 포맷)
-logger.add(
-    LOG_FILE,
-    format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} | {message}",
-    level="DEBUG",
-    rotation="00:00",  # 매일 자정에 새 파일 생성
-    retention="30 days",  # 30일간 보관
-    encoding="utf-8"
-)
 
-# 토큰 저장 파일 경로
-TOKEN_FILE = os.path.join(os.path.dirname(__file__), ".token_cache.json")
+class KisCircuitOpenError(KisAPIError):
+    """서킷 브레이커가 열려 요청을 보내지 않고 실패한 경우 (재시도하지 않음)"""
+    
+    def __init__(self, message: str, retry_after: float):
+        """
+        Args:
+            message: 오류 메시지
+            retry_after: 다음 시험 요청까지 남은 시간 (초)
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
-class KisAPIError(Exception):
-    """한국투자증권 API 관련 예외"""
-    pass
+class KisDeadlineExceeded(KisAPIError):
+    """호출에 지정한 마감 시각(deadline)을 넘긴 경우 (재시도하지 않음)"""
+    
+    def __init__(self, message: str, stage: str, timings: Dict[str, float]):
+        """
+        Args:
+            message: 오류 메시지
+            stage: 마감 시각을 넘긴 단계 (rate_limit, token, http, retry_wait)
+            timings: 단계별 소요 시간 (초)
+        """
+        super().__init__(message)
+        self.stage = stage
+        self.timings = timings
 
 
-class KisAPI:
-    """한국투자증권 API 클라이언트"""
+class KisAPIBase:
+    """한국투자증권 API 클라이언트 공통 기능
+    
+    토큰 관리, 요청 파라미터 구성, 응답 검증처럼 전송 방식과 무관한 부분을 담당하며
+    동기 클라이언트(KisAPI)와 비동기 클라이언트(AsyncKisAPI)가 함께 사용합니다.
+    """
     
     # API 엔드포인트
     BASE_URL = "https://openapi.koreainvestment.com:9443" 
@@ -62,136 +101,923 @@ class KisAPI:
     MODE_REAL = "real"  # 실전투자
     MODE_PAPER = "paper"  # 모의투자
     
-    def __init__(self, mode: str = MODE_REAL):
+    # 과거 시세 조회 1회당 최대 응답 건수와 구간 분할 단위 (100거래일은 약 145일)
+    HISTORY_PAGE_SIZE = 100
+    HISTORY_WINDOW_DAYS = 140
+    
+    # 분봉 조회: 1회당 입력 시각 이전 최대 30건 (당일만), 정규장 시간 (HHMMSS)
+    MINUTE_PAGE_SIZE = 30
+    SESSION_OPEN = "090000"
+    SESSION_CLOSE = "153000"
+    
+    # 연속조회: 응답 헤더 tr_cont가 F(첫 페이지)/M(중간 페이지)이면 다음 페이지가 있고,
+    # 다음 페이지는 요청 헤더 tr_cont=N과 응답의 연속조회키(CTX_AREA_FK100/NK100)로 요청
+    TR_CONT_MORE = ("F", "M")
+    TR_CONT_NEXT = "N"
+    CONTINUATION_MAX_PAGES = 100  # 연속조회 최대 페이지 수 (서버가 같은 키를 반복해도 끝나도록)
+    
+    def __init__(
+        self,
+        mode: str = MODE_REAL,
+        timeout: Tuple[float, float] = (KIS_HTTP_CONNECT_TIMEOUT, KIS_HTTP_READ_TIMEOUT),
+        rate_limiter: Optional[RateLimiter] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        token_store: Optional[TokenStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        base_url: Optional[str] = None,
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        account_no: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
+    ):
         """
-        API 클라이언트 초기화
+        공통 상태 초기화
         
         Args:
             mode: 거래 모드 (real: 실전투자, paper: 모의투자)
+            timeout: (연결 타임아웃, 응답 대기 타임아웃) 초 단위
+            rate_limiter: 호출 제한기 (생략 시 같은 모드/앱키의 클라이언트끼리 공유)
+            quote_cache: 현재가 캐시 (생략 시 설정값으로 생성, KIS_QUOTE_CACHE_TTL이 0이면 사용 안 함)
+            token_store: 토큰 저장소 (생략 시 기본 토큰 파일 사용)
+            retry_policy: 재시도 정책 (생략 시 설정값 사용)
+            base_url: API 서버 주소 (생략 시 KIS_BASE_URL, 그것도 없으면 모드별 공식 주소)
+            app_key: 앱키 (생략 시 모드별 설정값)
+            app_secret: 앱시크릿 (생략 시 모드별 설정값)
+            account_no: 계좌번호 10자리 (생략 시 모드별 설정값)
+            cassette: 응답 녹화/재생 파일 (생략 시 KIS_CASSETTE_MODE 설정을 따름)
         """
         self._access_token: Optional[str] = None
         self._token_expired_at: Optional[datetime] = None
         self.mode = mode
-        self._last_request_time = 0  # 마지막 요청 시간
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.base_url = (base_url or KIS_BASE_URL).rstrip("/")  # 비어 있으면 모드별 공식 주소
         
-        # API 키 검증
+        if cassette is None and KIS_CASSETTE_MODE:
+            cassette = Cassette(KIS_CASSETTE_PATH, KIS_CASSETTE_MODE)
+            logger.warning(
+                f"KIS_CASSETTE_MODE={KIS_CASSETTE_MODE} 설정으로 응답 녹화 파일을 사용합니다. ({KIS_CASSETTE_PATH}) "
+                "주문은 녹화/재생하지 않으며 재생 모드에서 주문하면 오류가 발생합니다."
+            )
+        self.cassette = cassette
+        
+        # API 키 검증 (직접 넘긴 값이 설정값보다 우선)
         if self.mode == self.MODE_PAPER:
-            if not all([KIS_PAPER_APP_KEY, KIS_PAPER_APP_SECRET, KIS_PAPER_ACCOUNT_NO]):
-                raise KisAPIError("모의투자 API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+            defaults = (KIS_PAPER_APP_KEY, KIS_PAPER_APP_SECRET, KIS_PAPER_ACCOUNT_NO)
+        else:
+            defaults = (KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT_NO)
+        self._credentials: Tuple[str, str, str] = (
+            app_key or defaults[0] or "",
+            app_secret or defaults[1] or "",
+            account_no or defaults[2] or "",
+        )
+        # 녹화 재생은 서버에 접속하지 않으므로 API 키가 없어도 됨
+        if not all(self._credentials) and not self.replaying:
+            raise KisAPIError(f"{self._mode_name} API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        
+        app_key = self._credentials[0]
+        
+        # 서버 주소/헤더/계좌번호와 요청별 고정 파라미터는 클라이언트 생성 시 한 번만 계산
+        if self.base_url:
+            resolved_url, auth_url = self.base_url, f"{self.base_url}/oauth2/tokenP"
+        elif self.mode == self.MODE_PAPER:
+            resolved_url, auth_url = self.PAPER_BASE_URL, self.PAPER_AUTH_URL
         else:
-            if not all([KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT_NO]):
-                raise KisAPIError("실전투자 API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+            resolved_url, auth_url = self.BASE_URL, self.AUTH_URL
+        self._context = RequestContext.create(self.mode, resolved_url, auth_url, *self._credentials)
+        self._prepared = self._prepare_requests()
+        self._routes: Dict[str, Tuple[str, CircuitBreaker]] = {}  # endpoint -> (URL, 서킷 브레이커)
         
-        # 저장된 토큰이 있으면 불러오기, 없으면 새로 발급
-        if not self._load_token():
-            self._issue_token()
-            self._save_token()
-            
-        logger.info(f"API 클라이언트가 초기화되었습니다. (모드: {'모의투자' if mode == self.MODE_PAPER else '실전투자'})")
+        self._rate_limiter = rate_limiter or get_rate_limiter(self.mode, app_key)
+        self._scheduler = get_scheduler(self._rate_limiter)  # 주문 우선 대기열 (같은 호출 제한기를 쓰는 클라이언트끼리 공유)
+        
+        # 토큰은 (모드, 앱키, 서버)별로 프로세스 간에 공유 (스텁 서버 토큰이 실제 토큰을 덮어쓰지 않도록)
+        self._token_store = token_store or TokenStore()
+        self._token_key = token_key(self.mode, app_key, self.base_url)
+        
+        if quote_cache is None and KIS_QUOTE_CACHE_TTL > 0:
+            quote_cache = QuoteCache(ttl=KIS_QUOTE_CACHE_TTL, maxsize=KIS_QUOTE_CACHE_SIZE)
+        self.quote_cache = quote_cache
+        
+        # 요청/응답 로그 (엔드포인트별 상세 수준은 request_log.endpoint_levels로 조정)
+        self.request_log = RequestLogger()
+        
+        # tr_id별 단계 소요 시간/오류 계측 (프로세스 공유, 테스트 시 ApiMetrics()로 교체 가능)
+        self.metrics = get_metrics()
     
-    def _save_token(self) -> None:
-        """토큰 정보를 파일에 저장"""
-        if not self._access_token or not self._token_expired_at:
-            return
-            
-        token_data = {
-            "access_token": self._access_token,
-            "expired_at": self._token_expired_at.isoformat()
-        }
+    @property
+    def replaying(self) -> bool:
+        """녹화된 응답만 사용하는지 여부 (토큰 발급, 호출 제한 대기, 네트워크 요청 없음)"""
+        return self.cassette is not None and self.cassette.replaying
+    
+    def _replay(self, method: str, endpoint: str, tr_id: str, params: Optional[Dict], data: Optional[Dict]) -> Dict:
+        """
+        녹화된 응답 반환
         
+        Raises:
+            KisAPIError: 녹화되지 않은 요청이거나 주문을 허용하지 않는 녹화 파일로 주문하는 경우 (재시도하지 않음)
+        """
+        cassette = self.cassette
+        if cassette is None:
+            raise KisAPIError("녹화 파일 없이 녹화된 응답을 재생할 수 없습니다.")
+        if tr_id in ALL_ORDER_TR_IDS and not cassette.allow_orders:
+            raise KisAPIError(
+                f"녹화 재생 중에는 주문을 보내지 않습니다. (tr_id: {tr_id}, 녹화 파일: {cassette.path}) "
+                "실거래라면 KIS_CASSETTE_MODE 설정을 지우세요."
+            )
         try:
-            with open(TOKEN_FILE, "w") as f:
-                json.dump(token_data, f)
-            logger.debug("토큰이 파일에 저장되었습니다.")
-        except Exception as e:
-            logger.warning(f"토큰 저장 실패: {str(e)}")
-
+            result = cassette.play(method, endpoint, tr_id, params, data)
+        except CassetteMiss as e:
+            raise KisAPIError(str(e))
+        if method.upper() == "POST":
+            logger.warning(
+                f"[녹화 재생] {method} {endpoint} (tr_id: {tr_id}) 요청을 서버에 보내지 않고 녹화된 응답을 반환했습니다. "
+                f"(녹화 파일: {cassette.path})"
+            )
+        return result
+    
+    def _record(self, method: str, endpoint: str, tr_id: str, params: Optional[Dict], data: Optional[Dict], result: Dict) -> None:
+        """녹화 중이면 정상 응답 저장 (주문은 녹화 파일이 허용한 경우에만)"""
+        cassette = self.cassette
+        if cassette is not None and (cassette.allow_orders or tr_id not in ALL_ORDER_TR_IDS):
+            cassette.record(method, endpoint, tr_id, params, data, result)
+    
+    @property
+    def account_no(self) -> str:
+        """계좌번호 10자리"""
+        return self._context.account_no
+    
+    def estimated_wait(self, tr_id: str = "") -> float:
+        """지금 요청하면 호출 제한과 앞선 대기 요청 때문에 기다려야 하는 시간 (초, KisClientPool의 분배 기준)"""
+        return self._scheduler.wait_time(tr_id)
+    
+    def _prepare_requests(self) -> Mapping[str, PreparedRequest]:
+        """모드별 tr_id와 매번 같은 파라미터를 미리 채운 요청 (요청 이름 -> PreparedRequest, 읽기 전용)"""
+        real = self.mode == self.MODE_REAL
+        context = self._context
+        account = {
+            "CANO": context.cano,  # 계좌번호 앞 8자리
+            "ACNT_PRDT_CD": context.account_product_code,  # 계좌번호 뒤 2자리
+        }
+        buy_tr_id, sell_tr_id = ORDER_TR_IDS[self.mode]
+        order = {
+            **account,
+            "EXCG_ID_DVSN_CD": "KRX",  # 거래소코드
+        }
+        return MappingProxyType({
+            "balance": PreparedRequest.create(
+                "/uapi/domestic-stock/v1/trading/inquire-balance",
+                "TTTC8434R" if real else "VTTC8434R",  # 계좌 잔고 조회
+                {
+                    **account,
+                    "AFHR_FLPR_YN": "N",  # 시간외 여부
+                    "OFL_YN": "",  # 오프라인 여부
+                    "INQR_DVSN": "02",  # 조회구분
+                    "UNPR_DVSN": "01",  # 단가구분
+                    "FUND_STTL_ICLD_YN": "N",  # 펀드결제분 포함여부
+                    "FNCG_AMT_AUTO_RDPT_YN": "N",  # 융자금액 자동상환여부
+                    "PRCS_DVSN": "01",  # 처리구분
+                    "CTX_AREA_FK100": "",  # 연속조회검색조건
+                    "CTX_AREA_NK100": "",  # 연속조회키
+                },
+            ),
+            "daily_ccld": PreparedRequest.create(
+                "/uapi/domestic-stock/v1/trading/inquire-daily-ccld",
+                "TTTC8001R" if real else "VTTC8001R",  # 3개월 이내 주문 체결 조회
+                {
+                    **account,
+                    "INQR_STRT_DT": "",  # 조회시작일자 (YYYYMMDD)
+                    "INQR_END_DT": "",  # 조회종료일자 (YYYYMMDD)
+                    "SLL_BUY_DVSN_CD": "00",  # 매도매수구분 (00: 전체)
+                    "INQR_DVSN": "00",  # 조회구분 (00: 역순)
+                    "PDNO": "",  # 종목번호 (공란: 전체)
+                    "CCLD_DVSN": "00",  # 체결구분 (00: 전체)
+                    "ORD_GNO_BRNO": "",  # 주문채번지점번호
+                    "ODNO": "",  # 주문번호 (공란: 전체)
+                    "INQR_DVSN_3": "00",  # 조회구분3 (00: 전체)
+                    "INQR_DVSN_1": "",  # 조회구분1
+                    "CTX_AREA_FK100": "",  # 연속조회검색조건
+                    "CTX_AREA_NK100": "",  # 연속조회키
+                },
+            ),
+            "price": PreparedRequest.create(
+                "/uapi/domestic-stock/v1/quotations/inquire-price",
+                "FHKST01010100",  # 시세 조회는 동일한 tr_id 사용
+                {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": ""},
+            ),
+            "history": PreparedRequest.create(
+                "/uapi/domestic-stock/v1/quotations/inquire-daily-price",
+                "FHKST03010100",  # 일별 시세 조회
+                {
+                    "FID_COND_MRKT_DIV_CODE": "J",
+                    "FID_INPUT_ISCD": "",
+                    "FID_INPUT_DATE_1": "",
+                    "FID_INPUT_DATE_2": "",
+                    "FID_PERIOD_DIV_CODE": "D",  # 일별
+                    "FID_ORG_ADJ_PRC": "1",  # 수정주가
+                },
+            ),
+            "minute": PreparedRequest.create(
+                "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice",
+                "FHKST03010200",  # 주식 당일 분봉 조회
+                {
+                    "FID_ETC_CLS_CODE": "",  # 기타 구분 코드
+                    "FID_COND_MRKT_DIV_CODE": "J",
+                    "FID_INPUT_ISCD": "",
+                    "FID_INPUT_HOUR_1": "",  # 조회 기준 시각 (HHMMSS, 이 시각 이전 30건)
+                    "FID_PW_DATA_INCU_YN": "N",  # 과거 데이터 포함 여부
+                },
+            ),
+            # 실전투자/모의투자 tr_id 설정 (VTTC: 모의투자, TTTC: 실전투자)
+            "BUY": PreparedRequest.create("/uapi/domestic-stock/v1/trading/order-cash", buy_tr_id, order),
+            "SELL": PreparedRequest.create(
+                "/uapi/domestic-stock/v1/trading/order-cash",
+                sell_tr_id,
+                {**order, "SLL_TYPE": "01"},  # 매도시 주문구분코드 변경
+            ),
+        })
+    
+    def _route(self, endpoint: str) -> Tuple[str, CircuitBreaker]:
+        """엔드포인트의 (URL, 서킷 브레이커) (처음 요청할 때 한 번만 계산, 브레이커는 같은 서버/엔드포인트 분류의 클라이언트끼리 공유)"""
+        route = self._routes.get(endpoint)
+        if route is None:
+            route = (self._context.url(endpoint), get_circuit_breaker(self._context.base_url, endpoint))
+            self._routes[endpoint] = route
+        return route
+    
+    @property
+    def _mode_name(self) -> str:
+        return '모의투자' if self.mode == self.MODE_PAPER else '실전투자'
+    
     def _load_token(self) -> bool:
-        """파일에서 토큰 정보 불러오기
+        """저장소에서 토큰 정보 불러오기
         
         Returns:
-            bool: 토큰 로드 성공 여부
+            bool: 유효한 토큰 로드 성공 여부
         """
-        if not os.path.exists(TOKEN_FILE):
-            return False
-            
         try:
-            with open(TOKEN_FILE, "r") as f:
-                token_data = json.load(f)
-                
-            self._access_token = token_data["access_token"]
-            self._token_expired_at = datetime.fromisoformat(token_data["expired_at"])
-            
-            # 토큰이 만료되었는지 확인
-            if datetime.now() >= self._token_expired_at:
-                logger.info("저장된 토큰이 만료되었습니다.")
-                return False
-                
-            logger.debug("저장된 토큰을 불러왔습니다.")
-            return True
-            
-        except Exception as e:
+            cached = self._token_store.load(self._token_key)
+        except OSError as e:
             logger.warning(f"토큰 로드 실패: {str(e)}")
             return False
+        
+        if cached is None:
+            return False
+        
+        self._access_token, self._token_expired_at = cached
+        logger.debug("저장된 토큰을 불러왔습니다.")
+        return True
     
-    def _issue_token(self) -> None:
-        """인증 토큰 발급"""
-        try:
-            # 모의투자/실전투자 API 키 선택
-            if self.mode == self.MODE_PAPER:
-                app_key = KIS_PAPER_APP_KEY
-                app_secret = KIS_PAPER_APP_SECRET
-            else:
-                app_key = KIS_APP_KEY
-                app_secret = KIS_APP_SECRET
-
-            data = {
-                "grant_type": "client_credentials",
-                "appkey": app_key,
-                "appsecret": app_secret
-            }
+    def _token_expired(self) -> bool:
+        """토큰이 없거나 만료되었는지 확인"""
+        return not self._access_token or (
+            self._token_expired_at is not None and datetime.now() >= self._token_expired_at
+        )
+    
+    def _token_request(self) -> Tuple[str, Dict[str, str]]:
+        """토큰 발급 요청 (URL, 본문) 생성"""
+        context = self._context
+        data = {
+            "grant_type": "client_credentials",
+            "appkey": context.app_key,
+            "appsecret": context.app_secret
+        }
+        return context.auth_url, data
+    
+    def _approval_request(self) -> Tuple[str, Dict[str, str]]:
+        """실시간(WebSocket) 접속키 발급 요청 (URL, 본문) 생성"""
+        context = self._context
+        data = {
+            "grant_type": "client_credentials",
+            "appkey": context.app_key,
+            "secretkey": context.app_secret
+        }
+        return context.url("/oauth2/Approval"), data
+    
+    def _set_token(self, token_data: Dict) -> Token:
+        """
+        발급 응답으로 토큰 정보 갱신
+        
+        Raises:
+            KisAPIError: 발급 응답에 토큰이 없는 경우
+        """
+        access_token = token_data.get("access_token")
+        if not access_token:
+            reason = token_data.get("error_description") or token_data.get("msg1") or "응답에 access_token 없음"
+            raise KisAPIError(f"토큰 발급 실패: {reason}")
+        
+        # 토큰 만료 시간 설정 (실제 만료 시간보다 1분 일찍 갱신)
+        expires_in = token_data.get("expires_in", 86400)  # 기본값 24시간
+        expired_at = datetime.now() + timedelta(seconds=expires_in - 60)
+        self._access_token, self._token_expired_at = access_token, expired_at
+        
+        logger.info("인증 토큰이 발급되었습니다.")
+        return access_token, expired_at
+    
+    @staticmethod
+    def _token_of(headers: Dict[str, str]) -> str:
+        """요청 헤더에 사용된 토큰"""
+        return headers["authorization"][len("Bearer "):]
+    
+    def _build_headers(self, tr_id: str, tr_cont: str = "") -> Dict[str, str]:
+        """현재 토큰으로 API 요청 헤더 생성 (tr_cont는 연속조회 요청에만 추가)"""
+        token = self._access_token
+        if token is None:  # 토큰 갱신(_get_headers) 뒤에 호출하므로 발생하지 않음
+            raise KisAPIError("인증 토큰이 발급되지 않았습니다.")
+        return self._context.headers(token, tr_id, tr_cont)
+    
+    def _result_error(self, status_code: int, result: Dict) -> Optional[KisAPIError]:
+        """
+        API 응답 오류 검사
+        
+        Returns:
+            Optional[KisAPIError]: 오류 응답이면 재시도 분류가 담긴 예외, 정상이면 None
+        """
+        if status_code != 200 or ("rt_cd" in result and result["rt_cd"] != "0"):
+            error_msg = f"API 오류 발생 (Status: {status_code})"
+            if "rt_cd" in result:
+                error_msg += f"\nrt_cd: {result.get('rt_cd')}"
+                error_msg += f"\nmsg_cd: {result.get('msg_cd')}"
+                error_msg += f"\nmsg1: {result.get('msg1')}"
+            return KisAPIError(
+                error_msg,
+                status_code=status_code,
+                msg_cd=result.get("msg_cd"),
+                retry_category=self.retry_policy.classify_response(status_code, result),
+            )
+        return None
+    
+    def _json_error(self, status_code: int, text: str) -> KisAPIError:
+        """JSON이 아닌 응답에 대한 예외 (게이트웨이 오류 페이지 등 5xx는 일시적 오류로 분류)"""
+        return KisAPIError(
+            f"응답을 JSON으로 파싱할 수 없습니다: {truncate(text)}",
+            status_code=status_code,
+            retry_category=TRANSIENT if status_code in self.retry_policy.retryable_status_codes else None,
+        )
+    
+    def _retry_delay(self, error: KisAPIError, attempt: int) -> float:
+        """
+        재시도 전 대기 시간 계산 (호출 한도 초과면 공유 버킷도 함께 비움)
+        
+        Args:
+            error: 실패한 요청의 예외
+            attempt: 지금까지 실패한 시도 횟수
             
-            auth_url = self.PAPER_AUTH_URL if self.mode == self.MODE_PAPER else self.AUTH_URL
-            response = requests.post(auth_url, json=data)
-            response.raise_for_status()
+        Returns:
+            float: 대기 시간 (초)
+        """
+        delay = self.retry_policy.delay(attempt)
+        if error.msg_cd == MSG_RATE_LIMITED:
+            # 같은 앱키를 쓰는 다른 호출자도 함께 쉬어야 연속 거절을 피할 수 있음
+            self._rate_limiter.pause(delay)
+        logger.warning(
+            f"API 요청 실패, {delay:.2f}초 후 재시도합니다. "
+            f"({attempt}/{self.retry_policy.max_attempts - 1}, status: {error.status_code}, msg_cd: {error.msg_cd})"
+        )
+        return delay
+    
+    @staticmethod
+    def _error_code(error: KisAPIError) -> str:
+        """계측용 오류 코드 (msg_cd, http_<상태 코드>, transport, deadline, circuit_open)"""
+        if isinstance(error, KisCircuitOpenError):
+            return "circuit_open"
+        if isinstance(error, KisDeadlineExceeded):
+            return "deadline"
+        if error.msg_cd:
+            return error.msg_cd
+        return f"http_{error.status_code}" if error.status_code else "transport"
+    
+    @staticmethod
+    def _deadline_error(deadline: Deadline, stage: str, method: str = "GET") -> KisDeadlineExceeded:
+        """마감 시각 초과 예외 생성 (HTTP 단계의 POST는 서버가 처리했을 수 있음을 알림)"""
+        message = f"요청 마감 시각을 넘겼습니다. (단계: {stage}, 경과: {deadline.elapsed():.2f}초, {deadline.summary()})"
+        if stage == STAGE_HTTP and method.upper() == "POST":
+            message += " 서버가 요청을 처리했을 수 있으니 주문 내역을 확인하세요."
+        return KisDeadlineExceeded(message, stage=stage, timings=dict(deadline.timings))
+    
+    def _http_timeout(self, deadline: Optional[Deadline], method: str = "GET") -> Tuple[float, float]:
+        """
+        HTTP (연결, 응답 대기) 타임아웃을 남은 시간 이하로 제한
+        
+        Raises:
+            KisDeadlineExceeded: 남은 시간이 없는 경우
+        """
+        if deadline is None:
+            return self.timeout
+        if deadline.expired():
+            raise self._deadline_error(deadline, STAGE_HTTP, method)
+        connect_timeout, read_timeout = self.timeout
+        return deadline.clamp(connect_timeout), deadline.clamp(read_timeout)
+    
+    @staticmethod
+    def _check_circuit(breaker: CircuitBreaker, endpoint: str) -> None:
+        """
+        회로가 열려 있으면 요청을 보내지 않고 바로 실패
+        
+        Raises:
+            KisCircuitOpenError: 회로가 열려 있는 경우
+        """
+        retry_after = breaker.allow()
+        if retry_after is not None:
+            raise KisCircuitOpenError(
+                f"API 서버 장애로 요청을 차단했습니다. {retry_after:.1f}초 후 다시 시도합니다. ({endpoint})",
+                retry_after=retry_after,
+            )
+    
+    @staticmethod
+    def _record_circuit(breaker: CircuitBreaker, error: Optional[KisAPIError], elapsed: float = 0.0) -> None:
+        """
+        요청 결과를 서킷 브레이커에 기록
+        
+        연결 실패, 5xx 같은 게이트웨이 장애만 실패로 셉니다.
+        잔고 부족 같은 업무 오류, 호출 한도 초과, 토큰 만료는 서버가 정상 응답한 것으로 봅니다.
+        """
+        gateway_failure = error is not None and (
+            error.retry_category == TRANSIENT
+            or (error.status_code is None and error.retry_category is not None)
+        )
+        if gateway_failure:
+            breaker.record_failure()
+        else:
+            breaker.record_success(elapsed)
+    
+    def _account_balance_request(self, ctx_area_fk100: str = "", ctx_area_nk100: str = "") -> Tuple[str, str, Dict]:
+        """계좌 잔고 조회 요청 (endpoint, tr_id, params) 생성 (연속조회키가 있으면 다음 페이지 요청)"""
+        prepared = self._prepared["balance"]
+        params = prepared.with_params(CTX_AREA_FK100=ctx_area_fk100, CTX_AREA_NK100=ctx_area_nk100)
+        return prepared.endpoint, prepared.tr_id, params
+    
+    @staticmethod
+    def _kst_today() -> str:
+        """한국 시간 기준 오늘 (YYYYMMDD, 서버가 UTC로 동작해도 거래일과 맞도록)"""
+        return datetime.now(timezone(timedelta(hours=9))).strftime("%Y%m%d")
+    
+    def _daily_executions_request(
+        self,
+        start_date: str,
+        end_date: str,
+        ctx_area_fk100: str = "",
+        ctx_area_nk100: str = "",
+    ) -> Tuple[str, str, Dict]:
+        """주식 일별 주문 체결 조회 요청 (endpoint, tr_id, params) 생성 (모든 종목/주문, 연속조회키가 있으면 다음 페이지)"""
+        prepared = self._prepared["daily_ccld"]
+        params = prepared.with_params(
+            INQR_STRT_DT=start_date,
+            INQR_END_DT=end_date,
+            CTX_AREA_FK100=ctx_area_fk100,
+            CTX_AREA_NK100=ctx_area_nk100,
+        )
+        return prepared.endpoint, prepared.tr_id, params
+    
+    def _next_page_context(
+        self,
+        result: Dict,
+        context: Tuple[str, str],
+        page: int,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        연속조회 응답 다음 페이지의 연속조회키
+        
+        Args:
+            result: 방금 받은 응답 (tr_cont는 _request가 응답 헤더에서 옮겨 둠)
+            context: 방금 받은 페이지를 요청할 때 보낸 (CTX_AREA_FK100, CTX_AREA_NK100)
+            page: 방금 받은 페이지 번호 (1부터)
             
-            token_data = response.json()
-            self._access_token = token_data["access_token"]
+        Returns:
+            Optional[Tuple[str, str]]: 다음 페이지의 (CTX_AREA_FK100, CTX_AREA_NK100) (마지막 페이지면 None)
+        """
+        if result.get("tr_cont") not in self.TR_CONT_MORE:
+            return None
+        next_context = (result.get("ctx_area_fk100") or "", result.get("ctx_area_nk100") or "")
+        if not next_context[1].strip():
+            logger.warning("응답에 다음 페이지가 있다고 되어 있지만 연속조회키가 없어 조회를 마칩니다.")
+            return None
+        if next_context == context:
+            logger.warning("응답의 연속조회키가 이전 페이지와 같아 조회를 마칩니다.")
+            return None
+        if page >= self.CONTINUATION_MAX_PAGES:
+            logger.warning(f"연속조회가 최대 페이지 수({self.CONTINUATION_MAX_PAGES})에 도달해 조회를 마칩니다.")
+            return None
+        return next_context
+    
+    def _stock_price_request(self, code: str, market: str) -> Tuple[str, str, Dict]:
+        """현재가 조회 요청 (endpoint, tr_id, params) 생성"""
+        prepared = self._prepared["price"]
+        return prepared.endpoint, prepared.tr_id, prepared.with_params(FID_COND_MRKT_DIV_CODE=market, FID_INPUT_ISCD=code)
+    
+    def _order_request(
+        self,
+        code: str,
+        quantity: int,
+        order_type: str,
+        side: str,
+        price: Optional[int],
+    ) -> Tuple[str, str, Dict]:
+        """
+        주문 요청 (endpoint, tr_id, data) 생성
+        
+        Raises:
+            KisAPIError: 주문 파라미터가 잘못된 경우
+        """
+        # 주문 파라미터 검증
+        if order_type == "00" and price is None:
+            raise KisAPIError("지정가 주문시 가격을 입력해주세요.")
+        
+        # 매수/매도별 tr_id와 계좌번호, 매도 주문구분은 미리 채워 둠
+        prepared = self._prepared["SELL" if side == "SELL" else "BUY"]
+        data = prepared.with_params(
+            PDNO=code,  # 종목코드
+            ORD_DVSN=order_type,  # 주문구분
+            ORD_QTY=str(quantity),  # 주문수량
+            ORD_UNPR=str(price) if order_type == "00" else "0",  # 지정가 주문시 가격 시장가 주문시 0 입력
+        )
+        return prepared.endpoint, prepared.tr_id, data
+    
+    @staticmethod
+    def _order_quantity(code: str, budget: int, quote: Quote) -> Tuple[int, int]:
+        """
+        시세 정보로 예산 내 주문 수량 계산
+        
+        Raises:
+            KisAPIError: 현재가를 알 수 없거나 1주도 살 수 없는 경우
+        """
+        current_price = quote.price
+        
+        if current_price == 0:
+            raise KisAPIError(f"종목 {code}의 현재가를 조회할 수 없습니다.")
+        
+        # 주문 가능 수량 계산 (예산을 현재가로 나눈 몫)
+        quantity = budget // current_price
+        
+        if quantity == 0:
+            raise KisAPIError(f"예산 {budget:,}원으로는 1주도 매수할 수 없습니다. (현재가: {current_price:,}원)")
+        
+        # 예상 주문 금액 계산
+        expected_amount = quantity * current_price
+        
+        logger.info(f"종목 {code} 주문 수량 계산: {quantity}주 (현재가: {current_price:,}원, 예상금액: {expected_amount:,}원)")
+        
+        return quantity, expected_amount
+    
+    @staticmethod
+    def _order_quote_codes(specs: Iterable[OrderSpec]) -> Dict[str, List[str]]:
+        """
+        일괄 주문에서 현재가가 필요한 종목 (시장구분별)
+        
+        예산으로 수량을 정하는 주문과, 가격을 지정하지 않아 예상 금액을 현재가로 계산하는 주문(시장가 등)이
+        모두 같은 시세 스냅샷을 쓰도록 한 번에 조회합니다.
+        """
+        codes: Dict[str, List[str]] = {}
+        for spec in specs:
+            if spec.quantity is None or not (spec.order_type == "00" and spec.price):
+                codes.setdefault(spec.market, []).append(spec.code)
+        return codes
+    
+    def _size_order(self, spec: OrderSpec, quotes: Dict[str, StockPrices]) -> Tuple[int, int]:
+        """
+        일괄 주문 1건의 (주문 수량, 예상 주문 금액) 계산
+        
+        Args:
+            spec: 주문
+            quotes: 시장구분별 미리 조회한 현재가
+        
+        Raises:
+            KisAPIError: 현재가를 조회하지 못했거나 예산으로 1주도 살 수 없는 경우
+        """
+        prices = quotes.get(spec.market) or StockPrices()
+        if spec.quantity is not None:
+            price = spec.price if spec.order_type == "00" and spec.price else prices.price(spec.code) or 0
+            if not price:
+                # 수량이 정해진 주문은 현재가 조회에 실패해도 그대로 접수 (예상 금액만 알 수 없음)
+                reason = prices.errors.get(spec.code, "조회 결과 없음")
+                logger.warning(f"종목 {spec.code}의 현재가를 조회할 수 없어 예상 주문 금액을 0으로 기록합니다. ({reason})")
+            return spec.quantity, spec.quantity * price
+        
+        budget = spec.budget
+        if budget is None:  # OrderSpec이 수량과 예산 중 하나만 받도록 검증하므로 발생하지 않음
+            raise KisAPIError(f"종목 {spec.code}의 주문 수량과 예산이 모두 없습니다.")
+        quote = prices.quote(spec.code)
+        if quote is None:
+            reason = prices.errors.get(spec.code, "조회 결과 없음")
+            raise KisAPIError(f"종목 {spec.code}의 현재가를 조회할 수 없습니다. ({reason})")
+        return self._order_quantity(spec.code, budget, quote)
+    
+    def _historical_prices_request(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str,
+    ) -> Tuple[str, str, Dict]:
+        """과거 시세 조회 요청 (endpoint, tr_id, params) 생성"""
+        prepared = self._prepared["history"]
+        params = prepared.with_params(
+            FID_COND_MRKT_DIV_CODE=market,
+            FID_INPUT_ISCD=code,
+            FID_INPUT_DATE_1=start_date,
+            FID_INPUT_DATE_2=end_date,
+        )
+        return prepared.endpoint, prepared.tr_id, params
+    
+    @classmethod
+    def _split_date_range(cls, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """
+        조회 기간을 한 번에 조회 가능한 구간들로 분할
+        
+        Args:
+            start_date: 시작일자 (YYYYMMDD)
+            end_date: 종료일자 (YYYYMMDD)
             
-            # 토큰 만료 시간 설정 (실제 만료 시간보다 1분 일찍 갱신)
-            expires_in = token_data.get("expires_in", 86400)  # 기본값 24시간
-            self._token_expired_at = datetime.now() + timedelta(seconds=expires_in - 60)
+        Returns:
+            List[Tuple[str, str]]: (구간 시작일자, 구간 종료일자) 목록
+        """
+        start = datetime.strptime(start_date, "%Y%m%d")
+        end = datetime.strptime(end_date, "%Y%m%d")
+        windows = []
+        while start <= end:
+            window_end = min(start + timedelta(days=cls.HISTORY_WINDOW_DAYS - 1), end)
+            windows.append((start.strftime("%Y%m%d"), window_end.strftime("%Y%m%d")))
+            start = window_end + timedelta(days=1)
+        return windows
+    
+    @classmethod
+    def _next_window_end(cls, start_date: str, price_data: List[DailyBar]) -> Optional[str]:
+        """
+        응답이 최대 건수로 잘린 경우 남은 구간의 종료일자 계산
+        
+        응답은 최근 일자부터 내려오므로, 잘렸다면 가장 오래된 일자 전날까지 다시 조회해야 합니다.
+        
+        Returns:
+            Optional[str]: 남은 구간의 종료일자 (더 조회할 필요가 없으면 None)
+        """
+        if len(price_data) < cls.HISTORY_PAGE_SIZE:
+            return None
+        oldest = min(bar.date for bar in price_data)
+        if oldest <= start_date:
+            return None
+        return (datetime.strptime(oldest, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+    
+    @staticmethod
+    def _merge_price_pages(pages: Iterable[List[DailyBar]]) -> List[DailyBar]:
+        """구간별 시세를 기준일자로 중복 제거 후 최근 일자순으로 병합"""
+        merged: Dict[str, DailyBar] = {}
+        for page in pages:
+            for bar in page:
+                merged[bar.date] = bar
+        return [merged[date] for date in sorted(merged, reverse=True)]
+    
+    def _minute_bars_request(self, code: str, hour: str, market: str) -> Tuple[str, str, Dict]:
+        """당일 분봉 조회 요청 (endpoint, tr_id, params) 생성 (hour 시각 이전 최대 MINUTE_PAGE_SIZE건)"""
+        prepared = self._prepared["minute"]
+        params = prepared.with_params(FID_COND_MRKT_DIV_CODE=market, FID_INPUT_ISCD=code, FID_INPUT_HOUR_1=hour)
+        return prepared.endpoint, prepared.tr_id, params
+    
+    def _next_minute_hour(self, result: Dict, bars: MinuteBars, hour: str, start_time: int, page: int) -> Optional[str]:
+        """
+        분봉 다음(더 이전) 페이지의 조회 기준 시각
+        
+        응답은 기준 시각부터 거슬러 올라가므로, 가장 이른 봉의 1분 전을 다음 기준 시각으로 씁니다.
+        
+        Args:
+            result: 방금 받은 응답
+            bars: 방금 받은 페이지를 start_time 이후만 남겨 변환한 분봉
+            hour: 방금 받은 페이지의 조회 기준 시각 (HHMMSS)
+            start_time: 조회 시작 시각 (HHMMSS 정수)
+            page: 방금 받은 페이지 번호 (1부터)
             
-            logger.info("인증 토큰이 발급되었습니다.")
+        Returns:
+            Optional[str]: 다음 페이지의 기준 시각 (HHMMSS, 더 조회할 필요가 없으면 None)
+        """
+        if len(result.get("output2") or []) < self.MINUTE_PAGE_SIZE or not bars:
+            return None  # 장 시작까지 내려왔거나 start_time 이전 봉만 남음
+        oldest = bars.times[-1]
+        if oldest <= start_time:
+            return None
+        next_hour = (datetime.strptime(f"{oldest:06d}", "%H%M%S") - timedelta(minutes=1)).strftime("%H%M%S")
+        if next_hour >= hour:
+            logger.warning("분봉 응답이 기준 시각 이전으로 내려가지 않아 조회를 마칩니다.")
+            return None
+        if page >= self.CONTINUATION_MAX_PAGES:
+            logger.warning(f"분봉 조회가 최대 페이지 수({self.CONTINUATION_MAX_PAGES})에 도달해 조회를 마칩니다.")
+            return None
+        return next_hour
+    
+    @staticmethod
+    def _parse_historical_prices(result: Dict) -> List[DailyBar]:
+        """과거 시세 응답을 일별 시세 목록으로 변환 (데이터가 없는 구간은 빈 항목이 내려오므로 제외)"""
+        return [
+            DailyBar.from_output(item)
+            for item in result.get("output2", [])
+            if item.get("stck_bsop_date")
+        ]
+
+
+class KisAPI(KisAPIBase):
+    """한국투자증권 API 클라이언트"""
+    
+    def __init__(
+        self,
+        mode: str = KisAPIBase.MODE_REAL,
+        pool_size: int = KIS_HTTP_POOL_SIZE,
+        timeout: Tuple[float, float] = (KIS_HTTP_CONNECT_TIMEOUT, KIS_HTTP_READ_TIMEOUT),
+        rate_limiter: Optional[RateLimiter] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        base_url: Optional[str] = None,
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        account_no: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        token_store: Optional[TokenStore] = None,
+    ):
+        """
+        API 클라이언트 초기화
+        
+        Args:
+            mode: 거래 모드 (real: 실전투자, paper: 모의투자)
+            pool_size: 호스트당 유지할 keep-alive 커넥션 수
+            timeout: (연결 타임아웃, 응답 대기 타임아웃) 초 단위
+            rate_limiter: 호출 제한기 (생략 시 같은 모드/앱키의 클라이언트끼리 공유)
+            quote_cache: 현재가 캐시 (생략 시 설정값으로 생성)
+            base_url: API 서버 주소 (로컬 스텁 서버 등, 생략 시 공식 주소)
+            app_key: 앱키 (생략 시 .env 설정값)
+            app_secret: 앱시크릿 (생략 시 .env 설정값)
+            account_no: 계좌번호 10자리 (생략 시 .env 설정값)
+            cassette: 응답 녹화/재생 파일 (재생 모드면 네트워크 요청 없이 녹화된 응답만 사용)
+            retry_policy: 재시도 정책 (생략 시 KIS_RETRY_* 설정값으로 생성)
+            token_store: 토큰 저장소 (생략 시 기본 토큰 파일, 다른 경로나 격리된 저장소를 쓸 때 지정)
+        """
+        super().__init__(
+            mode=mode,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            quote_cache=quote_cache,
+            base_url=base_url,
+            app_key=app_key,
+            app_secret=app_secret,
+            account_no=account_no,
+            cassette=cassette,
+            retry_policy=retry_policy,
+            token_store=token_store,
+        )
+        self.pool_size = pool_size
+        self._token_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
+        
+        # 모든 요청이 공유하는 커넥션 풀 (TCP/TLS 핸드셰이크 재사용)
+        self._session = self._create_session(pool_size)
+        
+        # 저장된 토큰이 있으면 불러오기, 없으면 새로 발급 (녹화 재생 시에는 토큰이 필요 없음)
+        if not self.replaying and not self._load_token():
+            self._renew_token(self._access_token)
+            
+        replay_note = ", 녹화 재생" if self.replaying else ""
+        logger.info(f"API 클라이언트가 초기화되었습니다. (모드: {self._mode_name}{replay_note})")
+    
+    @staticmethod
+    def _create_session(pool_size: int) -> "requests.Session":
+        """keep-alive 커넥션 풀을 사용하는 HTTP 세션 생성
+        
+        Args:
+            pool_size: 호스트당 유지할 커넥션 수
+            
+        Returns:
+            requests.Session: 설정된 세션
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        # 재시도는 _request에서 직접 처리하므로 어댑터 재시도는 사용하지 않음
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+    
+    def close(self) -> None:
+        """백그라운드 토큰 갱신 중지, 녹화 내용 저장 및 커넥션 풀 정리"""
+        self.stop_token_refresher()
+        if self.cassette is not None:
+            self.cassette.save()
+        self._session.close()
+    
+    def __enter__(self) -> "KisAPI":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def _issue_token(self) -> Token:
+        """인증 토큰 발급"""
+        import requests
+        
+        try:
+            auth_url, data = self._token_request()
+            response = self._session.post(auth_url, json=data, timeout=self.timeout)
+            response.raise_for_status()
+            return self._set_token(response.json())
             
         except requests.exceptions.RequestException as e:
             logger.error(f"토큰 발급 중 오류 발생: {str(e)}")
             raise KisAPIError(f"토큰 발급 실패: {str(e)}")
     
-    def _get_headers(self) -> Dict[str, str]:
+    def _renew_token(self, stale_token: Optional[str]) -> None:
+        """
+        토큰 갱신
+        
+        여러 스레드가 동시에 만료를 감지해도 한 번만 발급하며,
+        다른 프로세스가 방금 발급해 저장한 토큰이 있으면 그 토큰을 재사용합니다.
+        
+        Args:
+            stale_token: 만료를 감지한 시점의 토큰
+        """
+        with self._token_lock:
+            # 기다리는 동안 다른 스레드가 이미 갱신했다면 그대로 사용
+            if self._access_token != stale_token and not self._token_expired():
+                return
+            try:
+                self._access_token, self._token_expired_at = self._token_store.get_or_issue(
+                    self._token_key, self._issue_token, stale_token=stale_token
+                )
+            except OSError as e:
+                # 토큰 파일을 쓸 수 없어도 발급은 진행
+                logger.warning(f"토큰 저장 실패: {str(e)}")
+                self._issue_token()
+    
+    def start_token_refresher(self, margin: float = KIS_TOKEN_REFRESH_MARGIN) -> None:
+        """
+        백그라운드 토큰 사전 갱신 시작
+        
+        만료 margin초 전에 별도 스레드에서 새 토큰을 받아 교체하므로,
+        장시간 실행되는 프로세스의 주문 요청이 토큰 발급을 기다리지 않습니다.
+        
+        Args:
+            margin: 만료 몇 초 전에 갱신할지
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(margin,), name="kis-token-refresher", daemon=True
+        )
+        self._refresher.start()
+        logger.info(f"토큰 사전 갱신을 시작합니다. (만료 {margin:.0f}초 전 갱신)")
+    
+    def stop_token_refresher(self) -> None:
+        """백그라운드 토큰 사전 갱신 중지"""
+        if self._refresher is None:
+            return
+        self._refresher_stop.set()
+        self._refresher.join(timeout=5)
+        self._refresher = None
+    
+    def _refresh_loop(self, margin: float) -> None:
+        """만료 시각 - margin까지 기다렸다가 토큰을 갱신하는 루프"""
+        # 토큰 발급 API는 분당 1회 제한이 있으므로 갱신 간격은 최소 1분
+        min_interval = 60.0
+        retry_interval = 30.0
+        
+        while not self._refresher_stop.is_set():
+            expired_at = self._token_expired_at
+            if expired_at is None:
+                wait = 0.0
+            else:
+                wait = (expired_at - datetime.now()).total_seconds() - margin
+            if wait > 0 and self._refresher_stop.wait(wait):
+                break
+            
+            try:
+                self._renew_token(self._access_token)
+                logger.info(f"토큰을 미리 갱신했습니다. (만료: {self._token_expired_at:%Y-%m-%d %H:%M:%S})")
+                interval = min_interval
+            except KisAPIError as e:
+                # 갱신에 실패해도 요청 시점의 갱신(_get_headers)이 남아 있으므로 잠시 후 다시 시도
+                logger.warning(f"토큰 사전 갱신 실패, {retry_interval:.0f}초 후 재시도: {str(e)}")
+                interval = retry_interval
+            if self._refresher_stop.wait(interval):
+                break
+    
+    def _get_headers(self, tr_id: str = "", tr_cont: str = "") -> Dict[str, str]:
         """API 요청에 필요한 헤더 생성"""
         # 토큰이 만료되었거나 없는 경우 갱신
-        if not self._access_token or (
-            self._token_expired_at and datetime.now() >= self._token_expired_at
-        ):
-            self._issue_token()
-            self._save_token()
+        if self._token_expired():
+            self._renew_token(self._access_token)
         
-        # 모의투자/실전투자 API 키 선택
-        if self.mode == self.MODE_PAPER:
-            app_key = KIS_PAPER_APP_KEY
-            app_secret = KIS_PAPER_APP_SECRET
-        else:
-            app_key = KIS_APP_KEY
-            app_secret = KIS_APP_SECRET
-        
-        return {
-            "Content-Type": "application/json",
-            "authorization": f"Bearer {self._access_token}",
-            "appKey": app_key,
-            "appSecret": app_secret,
-            "tr_id": "",  # 각 API 호출 시 tr_id 설정 필요
-        }
+        return self._build_headers(tr_id, tr_cont)
+    
+    @staticmethod
+    def _is_connect_error(e: "requests.exceptions.RequestException") -> bool:
+        """서버에 요청이 전달되기 전에 실패한 오류인지 확인 (연결 실패/연결 타임아웃)"""
+        import requests
+        from urllib3.exceptions import NewConnectionError
+        
+        if isinstance(e, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(e, requests.exceptions.ConnectionError) and e.args:
+            return isinstance(getattr(e.args[0], "reason", None), NewConnectionError)
+        return False
     
     def _request(
         self,
@@ -200,153 +1026,410 @@ class KisAPI:
         tr_id: str,
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
-        retry_count: int = 0
+        deadline: Optional[Deadline] = None,
+        tr_cont: str = "",
     ) -> Dict:
         """
         API 요청 실행
         
+        호출 한도 초과, 토큰 만료, 일시적 네트워크/서버 오류는 retry_policy에 따라 재시도합니다.
+        서버가 처리했을 수 있는 POST(주문) 요청은 다시 보내지 않습니다.
+        deadline이 있으면 호출 제한 대기, HTTP 타임아웃, 재시도 대기가 모두 남은 시간 안에서 진행됩니다.
+        
         Args:
             method: HTTP 메서드 (GET, POST 등)
             endpoint: API 엔드포인트
             tr_id: 거래 ID
             params: URL 파라미터
             data: 요청 본문 데이터
-            retry_count: 재시도 횟수 (토큰 만료 시 재시도용)
+            deadline: 마감 시각 (단계별 소요 시간이 기록됨)
+            tr_cont: 연속조회 요청 헤더 (다음 페이지 요청 시 N)
             
         Returns:
-            Dict: API 응답 데이터
+            Dict: API 응답 데이터 (응답 헤더에 tr_cont 값이 있으면 result["tr_cont"]에 포함)
             
         Raises:
+            KisDeadlineExceeded: 마감 시각을 넘긴 경우
             KisAPIError: API 요청 실패 시
         """
-        # API 호출 제한 준수
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
+        started_at = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = self._request_once(method, endpoint, tr_id, params, data, deadline, tr_cont)
+                break
+            except KisAPIError as e:
+                self.metrics.count_error(tr_id, self._error_code(e))
+                if not self.retry_policy.can_retry(e.retry_category, method, attempt):
+                    logger.error(str(e))
+                    raise
+                self.metrics.count_retry(tr_id, e.msg_cd or e.retry_category or "unknown")
+                delay = self._retry_delay(e, attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    # 기다려도 마감 전에 재시도할 수 없으면 바로 포기
+                    error = self._deadline_error(deadline, STAGE_RETRY_WAIT, method)
+                    logger.error(str(error))
+                    raise error from e
+                time.sleep(delay)
+                if deadline is not None:
+                    deadline.record(STAGE_RETRY_WAIT, delay)
+        
+        self.metrics.observe(tr_id, STAGE_TOTAL, time.perf_counter() - started_at)
+        if deadline is not None:
+            logger.debug(f"{method} {endpoint} 단계별 소요 시간: {deadline.summary()}")
+        return result
+    
+    def _request_once(
+        self,
+        method: str,
+        endpoint: str,
+        tr_id: str,
+        params: Optional[Dict],
+        data: Optional[Dict],
+        deadline: Optional[Deadline] = None,
+        tr_cont: str = "",
+    ) -> Dict:
+        """
+        API 요청 1회 실행
+        
+        Raises:
+            KisCircuitOpenError: 서킷 브레이커가 열려 있는 경우
+            KisDeadlineExceeded: 마감 시각을 넘긴 경우
+            KisAPIError: API 요청 실패 시 (retry_category에 재시도 분류 포함)
+        """
+        if self.replaying:
+            return self._replay(method, endpoint, tr_id, params, data)
+        
+        import requests  # 세션 생성 시 이미 불러왔으므로 비용 없음
         
-        # 모의투자: 초당 1회, 실전투자: 초당 5회
-        min_interval = 1.0 if self.mode == self.MODE_PAPER else 0.2
+        # 게이트웨이 장애 중이면 호출 한도나 타임아웃을 기다리지 않고 바로 실패
+        url, breaker = self._route(endpoint)
+        self._check_circuit(breaker, endpoint)
         
-        if time_since_last_request < min_interval:
-            sleep_time = min_interval - time_since_last_request
-            logger.debug(f"API 호출 제한 준수를 위해 {sleep_time:.2f}초 대기")
-            time.sleep(sleep_time)
+        # API 호출 제한 준수 (모드/tr_id별 토큰 버킷, 스레드 간 공유, 주문이 다른 요청보다 먼저 나감)
+        try:
+            sleep_time = self._scheduler.acquire(tr_id, timeout=deadline.remaining() if deadline else None)
+        except TimeoutError:
+            if deadline is None:  # 마감 시각이 없으면 대기 시간 제한도 없으므로 발생하지 않음
+                raise
+            raise self._deadline_error(deadline, STAGE_RATE_LIMIT, method)
+        self.metrics.observe(tr_id, STAGE_QUEUE_WAIT, sleep_time)
+        if deadline is not None:
+            deadline.record(STAGE_RATE_LIMIT, sleep_time)
         
-        # 모드에 따라 적절한 BASE_URL 선택
-        base_url = self.PAPER_BASE_URL if self.mode == self.MODE_PAPER else self.BASE_URL
-        url = f"{base_url}{endpoint}"
-        headers = self._get_headers()
-        headers["tr_id"] = tr_id
+        started_at = time.perf_counter()
+        headers = self._get_headers(tr_id, tr_cont)
+        token_elapsed = time.perf_counter() - started_at
+        self.metrics.observe(tr_id, STAGE_TOKEN, token_elapsed)
+        if deadline is not None:
+            deadline.record(STAGE_TOKEN, token_elapsed)
+        timeout = self._http_timeout(deadline, method)
         
         try:
-            # 요청 URL과 파라미터를 함께 로깅
-            if params:
-                query_string = "&".join(f"{k}={v}" for k, v in params.items())
-                full_url = f"{url}?{query_string}"
-                logger.debug(f"Request URL with params: {full_url}")
-            else:
-                logger.debug(f"Request URL: {url}")
-            
-            self._last_request_time = time.time()  # 요청 시간 기록
-            response = requests.request(
+            started_at = time.perf_counter()
+            response = self._session.request(
                 method=method,
                 url=url,
                 headers=headers,
                 params=params,
-                json=data
+                json=data,
+                timeout=timeout
             )
-            
-            # 상세 로그는 파일에만 기록
-            logger.debug(f"Request Method: {method}")
-            logger.debug(f"Request Headers: {headers}")
-            if params:
-                logger.debug(f"Request Params: {params}")
-            if data:
-                logger.debug(f"Request Data: {data}")
-            logger.debug(f"Response Status: {response.status_code}")
-            logger.debug(f"Response Headers: {response.headers}")
-            logger.debug(f"Response Content: {response.text}")
-            
-            try:
-                result = response.json()
-            except json.JSONDecodeError:
-                logger.error(f"JSON 파싱 실패. 응답 내용: {response.text}")
-                raise KisAPIError(f"응답을 JSON으로 파싱할 수 없습니다: {response.text}")
-            
-            # 토큰 만료 에러 체크 및 재시도
-            if (response.status_code == 500 and 
-                "rt_cd" in result and result["rt_cd"] == "1" and
-                "msg_cd" in result and result["msg_cd"] == "EGW00123" and
-                retry_count < 1):  # 최대 1회 재시도
-                
-                logger.warning("토큰이 만료되었습니다. 토큰을 갱신하고 재시도합니다.")
-                self._issue_token()
-                self._save_token()
-                
-                # 재시도 (retry_count 증가)
-                return self._request(method, endpoint, tr_id, params, data, retry_count + 1)
-            
-            # API 에러 체크
-            if response.status_code != 200 or ("rt_cd" in result and result["rt_cd"] != "0"):
-                error_msg = f"API 오류 발생 (Status: {response.status_code})"
-                if "rt_cd" in result:
-                    error_msg += f"\nrt_cd: {result.get('rt_cd')}"
-                    error_msg += f"\nmsg_cd: {result.get('msg_cd')}"
-                    error_msg += f"\nmsg1: {result.get('msg1')}"
-                logger.error(error_msg)
-                raise KisAPIError(error_msg)
-            
-            return result
-            
         except requests.exceptions.RequestException as e:
-            error_msg = f"API 요청 실패: {str(e)}"
-            if hasattr(e, 'response') and e.response is not None and hasattr(e.response, 'text'):
-                logger.debug(f"에러 응답 내용: {e.response.text}")  # 상세 내용은 파일에만 기록
-            logger.error(error_msg)
-            raise KisAPIError(error_msg)
+            self.request_log.log_failure(method, endpoint, tr_id, e)  # 상세 내용은 파일에만 기록
+            self.metrics.count_request(tr_id, "transport")
+            if deadline is not None:
+                deadline.record(STAGE_HTTP, time.perf_counter() - started_at)
+                if deadline.expired():
+                    # 마감 시각에 맞춰 줄인 타임아웃 때문에 실패한 것이므로 서버 장애로 세지 않음
+                    raise self._deadline_error(deadline, STAGE_HTTP, method)
+            error = KisAPIError(
+                f"API 요청 실패: {str(e)}",
+                retry_category=self.retry_policy.classify_transport_error(connected=not self._is_connect_error(e)),
+            )
+            self._record_circuit(breaker, error)
+            raise error
+        elapsed = time.perf_counter() - started_at
+        self.metrics.count_request(tr_id, str(response.status_code))
+        self.metrics.observe(tr_id, STAGE_NETWORK, elapsed)
+        if deadline is not None:
+            deadline.record(STAGE_HTTP, elapsed)
+        
+        # 상세 로그는 파일에만 기록 (민감 정보 제외, 필요할 때만 문자열 생성)
+        self.request_log.log_exchange(
+            method, endpoint, tr_id, response.status_code, elapsed,
+            headers=headers, params=params, data=data,
+            response_headers=response.headers, body=lambda: response.text,
+        )
+        
+        started_at = time.perf_counter()
+        try:
+            result = loads(response.content)
+        except ValueError:
+            error = self._json_error(response.status_code, response.text)
+            self._record_circuit(breaker, error, elapsed)
+            raise error
+        self.metrics.observe(tr_id, STAGE_PARSE, time.perf_counter() - started_at)
+        
+        # API 에러 체크 (토큰 만료면 갱신해 두고 재시도는 호출자가 판단)
+        error = self._result_error(response.status_code, result)
+        self._record_circuit(breaker, error, elapsed)
+        if error is not None:
+            if error.retry_category == RENEW_TOKEN:
+                logger.warning("토큰이 만료되었습니다. 토큰을 갱신합니다.")
+                self._renew_token(self._token_of(headers))
+            raise error
+        
+        # 연속조회 여부는 응답 헤더로만 오므로 녹화/재생되도록 응답 데이터에 옮겨 둠
+        if response.headers.get("tr_cont"):
+            result["tr_cont"] = response.headers["tr_cont"]
+        
+        self._record(method, endpoint, tr_id, params, data, result)
+        return result
     
-    def get_account_balance(self) -> Dict:
+    def _iter_pages(
+        self,
+        build_request: Callable[[str, str], Tuple[str, str, Dict]],
+        deadline: Optional[Deadline],
+    ) -> Iterator[Dict]:
         """
-        계좌 잔고 조회
+        연속조회키를 따라 페이지 단위로 GET 조회
+        
+        Args:
+            build_request: (CTX_AREA_FK100, CTX_AREA_NK100) -> (endpoint, tr_id, params)
+            deadline: 전체 페이지 조회의 마감 시각
+        
+        Yields:
+            Dict: 페이지별 응답
+        """
+        context: Optional[Tuple[str, str]] = ("", "")
+        page = 0
+        while context is not None:
+            page += 1
+            endpoint, tr_id, params = build_request(*context)
+            tr_cont = self.TR_CONT_NEXT if page > 1 else ""
+            result = self._request("GET", endpoint, tr_id, params=params, deadline=deadline, tr_cont=tr_cont)
+            yield result
+            context = self._next_page_context(result, context, page)
+        if page > 1:
+            logger.debug(f"연속조회 완료: {endpoint} {page}페이지")
+
+    def get_account_balance(self, deadline: DeadlineLike = None) -> Dict:
+        """
+        계좌 잔고 조회 (첫 페이지만, 보유 종목이 많으면 iter_balance_pages로 이어서 조회)
+        
+        Args:
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
         
         Returns:
             Dict: 계좌 잔고 정보
         """
-        endpoint = "/uapi/domestic-stock/v1/trading/inquire-balance"
+        endpoint, tr_id, params = self._account_balance_request()
+        return self._request("GET", endpoint, tr_id, params=params, deadline=Deadline.coerce(deadline))
 
-        tr_id = "TTTC8434R" if self.mode == self.MODE_REAL else "VTTC8434R"  # 실전투자 계좌 잔고 조회
-        account_no = KIS_PAPER_ACCOUNT_NO if self.mode == self.MODE_PAPER else KIS_ACCOUNT_NO
-        params = {
-            "CANO": account_no[:8],  # 계좌번호 앞 8자리
-            "ACNT_PRDT_CD": account_no[8:],  # 계좌번호 뒤 2자리
-            "AFHR_FLPR_YN": "N",  # 시간외 여부
-            "OFL_YN": "",  # 오프라인 여부
-            "INQR_DVSN": "02",  # 조회구분
-            "UNPR_DVSN": "01",  # 단가구분
-            "FUND_STTL_ICLD_YN": "N",  # 펀드결제분 포함여부
-            "FNCG_AMT_AUTO_RDPT_YN": "N",  # 융자금액 자동상환여부
-            "PRCS_DVSN": "01",  # 처리구분
-            "CTX_AREA_FK100": "",  # 연속조회검색조건
-            "CTX_AREA_NK100": "",  # 연속조회키
-        }
+    def iter_balance_pages(self, deadline: DeadlineLike = None) -> Iterator[Dict]:
+        """
+        계좌 잔고를 연속조회키를 따라 페이지 단위로 조회
+        
+        다음 페이지는 앞 페이지를 소비한 뒤에 요청하므로 전체 페이지를 메모리에 모아 두지 않습니다.
+        
+        Args:
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+        
+        Yields:
+            Dict: 페이지별 잔고 응답 (output1: 보유 종목, output2: 계좌 합계)
+        
+        Raises:
+            KisAPIError: API 요청 실패시
+        """
+        yield from self._iter_pages(self._account_balance_request, Deadline.coerce(deadline))
+
+    def iter_holdings(self, deadline: DeadlineLike = None) -> Iterator[Holding]:
+        """
+        보유 종목을 페이지 단위로 조회하며 하나씩 반환 (수량이 0인 종목 제외)
+        
+        Args:
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
         
-        return self._request("GET", endpoint, tr_id, params=params)
+        Yields:
+            Holding: 보유 종목
+        """
+        for result in self.iter_balance_pages(deadline=deadline):
+            yield from Holding.from_page(result)
+
+    def get_balance(self, deadline: DeadlineLike = None) -> Balance:
+        """
+        계좌 잔고 조회 (예수금, 주문 가능 금액, 보유 종목을 타입이 정해진 모델로 반환)
+        
+        보유 종목이 한 페이지를 넘으면 연속조회로 모든 페이지를 받아 하나의 잔고로 합칩니다.
+        
+        Args:
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+        
+        Returns:
+            Balance: 계좌 잔고
+        """
+        return Balance.from_pages(self.iter_balance_pages(deadline=deadline))
+
+    def iter_order_statuses(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> Iterator[OrderStatus]:
+        """
+        기간 내 모든 주문의 체결 현황 조회 (연속조회로 모든 페이지를 차례로 받음)
+        
+        주문마다 따로 조회하지 않고 계좌의 주문 전체를 한 번에 받아오므로,
+        여러 주문의 체결을 확인할 때도 호출 수가 늘지 않습니다.
+        
+        Args:
+            start_date: 조회시작일자 (YYYYMMDD, 생략 시 한국 시간 기준 오늘)
+            end_date: 조회종료일자 (YYYYMMDD, 생략 시 start_date)
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+        
+        Yields:
+            OrderStatus: 주문별 체결 현황 (최근 주문부터)
+        """
+        start_date = start_date or self._kst_today()
+        build_request = partial(self._daily_executions_request, start_date, end_date or start_date)
+        for result in self._iter_pages(build_request, Deadline.coerce(deadline)):
+            yield from OrderStatus.from_page(result)
 
-    def get_stock_price(self, code: str, market: str = "1") -> dict:
+    def iter_minute_bars(
+        self,
+        code: str,
+        end_time: Optional[str] = None,
+        start_time: str = KisAPIBase.SESSION_OPEN,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Iterator[MinuteBars]:
+        """
+        당일 분봉을 end_time부터 장 시작 쪽으로 거슬러 올라가며 페이지 단위로 조회
+        
+        다음 페이지는 앞 페이지를 소비한 뒤에 요청하므로, 필요한 만큼 받았으면 반복을 멈춰
+        남은 호출을 아낄 수 있습니다. (예: 최근 60분 변동성만 필요한 경우)
+        
+        Args:
+            code: 종목코드
+            end_time: 가장 최근 봉의 시각 (HHMMSS, 생략 시 장 마감 시각, 장중이면 현재까지)
+            start_time: 가장 이른 봉의 시각 (HHMMSS, 생략 시 장 시작 시각)
+            market: 시장구분 (J: 주식, ETF, ETN)
+            deadline: 전체 페이지 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+        
+        Yields:
+            MinuteBars: 페이지별 분봉 (최근 시각순, 최대 MINUTE_PAGE_SIZE건)
+        
+        Raises:
+            KisAPIError: API 요청 실패시
+        """
+        deadline = Deadline.coerce(deadline)
+        first_time = int(start_time)
+        hour: Optional[str] = end_time or self.SESSION_CLOSE
+        page = 0
+        while hour is not None:
+            page += 1
+            endpoint, tr_id, params = self._minute_bars_request(code, hour, market)
+            result = self._request("GET", endpoint, tr_id, params=params, deadline=deadline)
+            bars = MinuteBars.from_page(code, result, first_time)
+            if bars:
+                yield bars
+            hour = self._next_minute_hour(result, bars, hour, first_time, page)
+
+    def get_stock_price(
+        self,
+        code: str,
+        market: str = "1",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> dict:
         """
         국내주식 현재가(시세) 조회
         Args:
             code: 종목코드 (6자리 문자열)
             market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
         Returns:
-            dict: 시세 정보
+            dict: 시세 정보 (캐시된 값은 여러 호출자가 공유하므로 수정하지 말 것)
         """
-        endpoint = "/uapi/domestic-stock/v1/quotations/inquire-price"
-        tr_id = "FHKST01010100"   # 시세 조회는 동일한 tr_id 사용
-        params = {
-            "FID_COND_MRKT_DIV_CODE": market,
-            "FID_INPUT_ISCD": code
-        }
-        return self._request("GET", endpoint, tr_id, params=params)
+        deadline = Deadline.coerce(deadline)
+        endpoint, tr_id, params = self._stock_price_request(code, market)
+        if not use_cache or self.quote_cache is None:
+            return self._request("GET", endpoint, tr_id, params=params, deadline=deadline)
+        return self.quote_cache.get_or_fetch(
+            (code, market),
+            lambda: self._request("GET", endpoint, tr_id, params=params, deadline=deadline),
+        )
+
+    def get_quote(
+        self,
+        code: str,
+        market: str = "J",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> Quote:
+        """
+        국내주식 현재가 조회 (타입이 정해진 모델로 반환)
+        
+        Args:
+            code: 종목코드 (6자리 문자열)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+        
+        Returns:
+            Quote: 현재가
+        """
+        result = self.get_stock_price(code, market, use_cache=use_cache, deadline=deadline)
+        return Quote.from_output(code, result.get("output", {}))
+
+    def get_stock_prices(
+        self,
+        codes: Iterable[str],
+        market: str = "J",
+        use_cache: bool = True,
+        deadline: DeadlineLike = None,
+    ) -> StockPrices:
+        """
+        여러 종목 현재가 동시 조회
+        
+        중복 종목은 한 번만 조회하며, 요청은 호출 제한 범위 안에서 병렬로 실행됩니다.
+        일부 종목이 실패해도 예외를 던지지 않고 결과의 errors에 기록합니다.
+        
+        Args:
+            codes: 종목코드 목록
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            use_cache: 캐시 유효시간 안의 시세를 재사용할지 여부 (주문 수량 계산에는 False)
+            deadline: 전체 조회의 마감 시각 (마감 전에 받지 못한 종목은 errors에 기록)
+            
+        Returns:
+            StockPrices: 종목별 현재가, 거래량, 전일 대비 (요청 순서 유지)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        deadline = Deadline.coerce(deadline)
+        unique_codes = list(dict.fromkeys(codes))
+        prices = StockPrices()
+        if not unique_codes:
+            return prices
+        
+        workers = min(len(unique_codes), self.pool_size)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-quote") as executor:
+            futures = {
+                code: executor.submit(self.get_stock_price, code, market, use_cache=use_cache, deadline=deadline)
+                for code in unique_codes
+            }
+        
+        for code, future in futures.items():
+            try:
+                prices.add(code, future.result().get("output", {}))
+            except (KisAPIError, ValueError) as e:
+                prices.add_error(code, str(e))
+        
+        logger.info(f"현재가 일괄 조회 완료: {len(prices)}종목 성공, {len(prices.errors)}종목 실패")
+        return prices
 
     def place_order(
         self,
@@ -356,6 +1439,7 @@ class KisAPI:
         side: str = "BUY",  # BUY: 매수, SELL: 매도
         price: Optional[int] = None,  # 지정가 주문시 필요
         market: str = "J",  # KRX
+        deadline: DeadlineLike = None,
     ) -> Dict:
         """
         주식 주문 실행
@@ -367,54 +1451,91 @@ class KisAPI:
             side: 매매 구분 (BUY: 매수, SELL: 매도)
             price: 주문 가격 (지정가 주문시 필수)
             market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 접수 마감 시각 (예: datetime(2024, 1, 2, 10, 0, 5)이면 10:00:05까지 접수되지 않으면 포기)
             
         Returns:
             Dict: 주문 결과
             
         Raises:
+            KisDeadlineExceeded: 마감 시각까지 접수되지 않은 경우
             KisAPIError: 주문 실패시
         """
-        endpoint = "/uapi/domestic-stock/v1/trading/order-cash"
-        
-        # 실전투자/모의투자 tr_id 설정
-        if self.mode == self.MODE_PAPER:
-            BUY_TR_ID = "VTTC0012U"  # 모의투자 매수
-            SELL_TR_ID = "VTTC0011U"  # 모의투자 매도
-        else:
-            BUY_TR_ID = "TTTC0012U"  # 실전투자 매수
-            SELL_TR_ID = "TTTC0011U"  # 실전투자 매도
-            
-        tr_id = BUY_TR_ID if side == "BUY" else SELL_TR_ID
-        
-        # 주문 파라미터 검증
-        if order_type == "00" and price is None:
-            raise KisAPIError("지정가 주문시 가격을 입력해주세요.")
-        
-        account_no = KIS_PAPER_ACCOUNT_NO if self.mode == self.MODE_PAPER else KIS_ACCOUNT_NO
-        data = {
-            "CANO": account_no[:8],  # 계좌번호 앞 8자리
-            "ACNT_PRDT_CD": account_no[8:],  # 계좌번호 뒤 2자리
-            "PDNO": code,  # 종목코드
-            "ORD_DVSN": order_type,  # 주문구분
-            "ORD_QTY": str(quantity),  # 주문수량
-            "EXCG_ID_DVSN_CD": "KRX",  # 거래소코드
-            "ORD_UNPR": str(price) if order_type == "00" else "0",  # 지정가 주문시 가격 시장가 주문시 0 입력
-        }
-        
-        # 매도 주문시 추가 파라미터
-        if side == "SELL":
-            data["SLL_TYPE"] = "01"  # 매도시 주문구분코드 변경
+        endpoint, tr_id, data = self._order_request(code, quantity, order_type, side, price)
         
         try:
-            result = self._request("POST", endpoint, tr_id, data=data)
-            logger.info(f"주문 실행 완료: {'모의투자' if self.mode == self.MODE_PAPER else '실전투자'} {side} {code} {quantity}주")
+            result = self._request("POST", endpoint, tr_id, data=data, deadline=Deadline.coerce(deadline))
+            logger.info(f"주문 실행 완료: {self._mode_name} {side} {code} {quantity}주")
             return result
             
         except KisAPIError as e:
             logger.error(f"주문 실행 실패: {str(e)}")
             raise
 
-    def calculate_order_quantity(self, code: str, budget: int, market: str = "J") -> Tuple[int, int]:
+    def place_orders(self, specs: Iterable[OrderSpec], deadline: DeadlineLike = None) -> List[OrderResult]:
+        """
+        여러 주문 일괄 실행
+        
+        예산으로 수량을 정하는 주문의 현재가를 먼저 한꺼번에 조회해 같은 시점의 시세로 모든 수량을 계산한 뒤,
+        주문을 호출 제한(KIS_ORDER_RATE_LIMIT 주문 한도 포함) 범위 안에서 동시에 전송합니다.
+        일부 주문이 실패해도 나머지 주문은 계속 진행하고 결과의 error에 사유를 기록합니다.
+        
+        Args:
+            specs: 주문 목록
+            deadline: 시세 조회와 모든 주문 접수의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+            
+        Returns:
+            List[OrderResult]: 주문별 결과 (요청 순서 유지)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        deadline = Deadline.coerce(deadline)
+        specs = list(specs)
+        if not specs:
+            return []
+        
+        started_at = time.perf_counter()
+        quotes = {
+            market: self.get_stock_prices(codes, market, use_cache=False, deadline=deadline)
+            for market, codes in self._order_quote_codes(specs).items()
+        }
+        quote_elapsed = time.perf_counter() - started_at
+        
+        def submit(spec: OrderSpec) -> OrderResult:
+            try:
+                quantity, expected_amount = self._size_order(spec, quotes)
+            except KisAPIError as e:
+                return OrderResult(spec, 0, 0, None, 0.0, str(e))
+            
+            order_started_at = time.perf_counter()
+            try:
+                result = self.place_order(
+                    spec.code, quantity, spec.order_type, spec.side, spec.price, spec.market, deadline=deadline
+                )
+            except KisAPIError as e:
+                return OrderResult(spec, quantity, expected_amount, None, time.perf_counter() - order_started_at, str(e))
+            return OrderResult(
+                spec, quantity, expected_amount, OrderAck.from_result(result), time.perf_counter() - order_started_at, ""
+            )
+        
+        started_at = time.perf_counter()
+        workers = min(len(specs), self.pool_size)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-order") as executor:
+            results = list(executor.map(submit, specs))
+        
+        succeeded = sum(1 for result in results if result.ok)
+        logger.info(
+            f"일괄 주문 완료: {succeeded}건 성공, {len(results) - succeeded}건 실패 "
+            f"(시세 조회 {quote_elapsed:.2f}초, 주문 전송 {time.perf_counter() - started_at:.2f}초)"
+        )
+        return results
+
+    def calculate_order_quantity(
+        self,
+        code: str,
+        budget: int,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Tuple[int, int]:
         """
         주어진 예산 내에서 주문 가능한 최대 수량 계산
         
@@ -422,6 +1543,7 @@ class KisAPI:
             code: 종목코드
             budget: 주문 예산 (원)
             market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 마감 시각 (Deadline, datetime 또는 남은 시간(초))
             
         Returns:
             Tuple[int, int]: (주문 수량, 예상 주문 금액)
@@ -429,27 +1551,17 @@ class KisAPI:
         Raises:
             KisAPIError: 시세 조회 실패시
         """
-        # 현재가 조회
-        price_info = self.get_stock_price(code, market=market)
-        current_price = int(price_info.get("output", {}).get("stck_prpr", 0))
-        
-        if current_price == 0:
-            raise KisAPIError(f"종목 {code}의 현재가를 조회할 수 없습니다.")
-        
-        # 주문 가능 수량 계산 (예산을 현재가로 나눈 몫)
-        quantity = budget // current_price
-        
-        if quantity == 0:
-            raise KisAPIError(f"예산 {budget:,}원으로는 1주도 매수할 수 없습니다. (현재가: {current_price:,}원)")
-        
-        # 예상 주문 금액 계산
-        expected_amount = quantity * current_price
-        
-        logger.info(f"종목 {code} 주문 수량 계산: {quantity}주 (현재가: {current_price:,}원, 예상금액: {expected_amount:,}원)")
-        
-        return quantity, expected_amount
+        # 현재가 조회 (오래된 캐시 시세로 수량을 정하지 않도록 항상 새로 조회)
+        quote = self.get_quote(code, market=market, use_cache=False, deadline=deadline)
+        return self._order_quantity(code, budget, quote)
 
-    def place_regular_order(self, code: str, budget: int, market: str = "J") -> Dict:
+    def place_regular_order(
+        self,
+        code: str,
+        budget: int,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Dict:
         """
         정기 주문 실행 (시장가)
         
@@ -457,6 +1569,7 @@ class KisAPI:
             code: 종목코드
             budget: 주문 예산 (원)
             market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 시세 조회와 주문 접수 전체의 마감 시각
             
         Returns:
             Dict: 주문 결과
@@ -464,9 +1577,10 @@ class KisAPI:
         Raises:
             KisAPIError: 주문 실패시
         """
+        deadline = Deadline.coerce(deadline)
         try:
             # 주문 수량 계산
-            quantity, expected_amount = self.calculate_order_quantity(code, budget, market)
+            quantity, expected_amount = self.calculate_order_quantity(code, budget, market, deadline=deadline)
             
             # 시장가 주문 실행
             order = self.place_order(
@@ -474,7 +1588,8 @@ class KisAPI:
                 quantity=quantity,
                 order_type="01",  # 시장가
                 side="BUY",
-                market=market
+                market=market,
+                deadline=deadline,
             )
             
             logger.info(f"정기 주문 실행 완료: {code} {quantity}주 (예상금액: {expected_amount:,}원)")
@@ -484,71 +1599,113 @@ class KisAPI:
             logger.error(f"정기 주문 실패: {str(e)}")
             raise
 
-    def get_historical_prices(
+    def _fetch_price_window(
         self,
         code: str,
         start_date: str,
         end_date: str,
-        market: str = "J"
-    ) -> Dict:
+        market: str,
+        deadline: Optional[Deadline] = None,
+    ) -> List[DailyBar]:
+        """한 구간의 과거 시세 조회 (응답이 잘리면 남은 기간을 이어서 조회)"""
+        endpoint, tr_id, params = self._historical_prices_request(code, start_date, end_date, market)
+        result = self._request("GET", endpoint, tr_id, params=params, deadline=deadline)
+        price_data = self._parse_historical_prices(result)
+        
+        next_end = self._next_window_end(start_date, price_data)
+        if next_end:
+            price_data += self._fetch_price_window(code, start_date, next_end, market, deadline)
+        return price_data
+
+    def get_daily_bars(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> List[DailyBar]:
         """
-        과거 시세 데이터 조회
+        일별 시세 조회
+        
+        한 번에 조회 가능한 건수를 넘는 기간은 여러 구간으로 나눠 병렬로 조회한 뒤
+        기준일자로 중복을 제거해 합칩니다.
         
         Args:
             code: 종목코드
             start_date: 시작일자 (YYYYMMDD)
             end_date: 종료일자 (YYYYMMDD)
             market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 전체 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
             
         Returns:
-            Dict: 일별 시세 데이터
+            List[DailyBar]: 최근 일자순 일별 시세
             
         Raises:
             KisAPIError: API 요청 실패시
         """
-        endpoint = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-        tr_id = "FHKST03010100"  # 일별 시세 조회
+        from concurrent.futures import ThreadPoolExecutor
         
-        params = {
-            "FID_COND_MRKT_DIV_CODE": market,
-            "FID_INPUT_ISCD": code,
-            "FID_INPUT_DATE_1": start_date,
-            "FID_INPUT_DATE_2": end_date,
-            "FID_PERIOD_DIV_CODE": "D",  # 일별
-            "FID_ORG_ADJ_PRC": "1",  # 수정주가
-        }
+        deadline = Deadline.coerce(deadline)
+        windows = self._split_date_range(start_date, end_date)
         
-        try:
-            result = self._request("GET", endpoint, tr_id, params=params)
+        if len(windows) <= 1:
+            pages = [self._fetch_price_window(code, start, end, market, deadline) for start, end in windows]
+        else:
+            workers = min(len(windows), self.pool_size)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-history") as executor:
+                pages = list(executor.map(
+                    lambda window: self._fetch_price_window(code, window[0], window[1], market, deadline),
+                    windows,
+                ))
+        return self._merge_price_pages(pages)
+
+    def get_historical_prices(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        market: str = "J",
+        deadline: DeadlineLike = None,
+    ) -> Dict:
+        """
+        과거 시세 데이터 조회 (일별 시세를 딕셔너리로 반환, DailyBar 목록은 get_daily_bars 사용)
+        
+        Args:
+            code: 종목코드
+            start_date: 시작일자 (YYYYMMDD)
+            end_date: 종료일자 (YYYYMMDD)
+            market: 시장구분 (1: 코스피, J: 코스닥, 2: 코넥스)
+            deadline: 전체 조회의 마감 시각 (Deadline, datetime 또는 남은 시간(초))
+            
+        Returns:
+            Dict: 조회 조건과 일별 시세 (prices: 최근 일자순 일별 시세 딕셔너리 목록)
             
-            # 응답 데이터 가공
-            price_data = []
-            for item in result.get("output2", []):
-                price_data.append({
-                    "date": item.get("stck_bsop_date"),  # 기준일자
-                    "open": int(item.get("stck_oprc", 0)),  # 시가
-                    "high": int(item.get("stck_hgpr", 0)),  # 고가
-                    "low": int(item.get("stck_lwpr", 0)),   # 저가
-                    "close": int(item.get("stck_clpr", 0)), # 종가
-                    "volume": int(item.get("acml_vol", 0)), # 거래량
-                    "amount": int(item.get("acml_tr_pbmn", 0)), # 거래대금
-                })
+        Raises:
+            KisAPIError: API 요청 실패시
+        """
+        try:
+            bars = self.get_daily_bars(code, start_date, end_date, market, deadline=deadline)
             
             logger.info(f"과거 시세 데이터 조회 완료: {code} ({start_date} ~ {end_date})")
             return {
                 "code": code,
                 "start_date": start_date,
                 "end_date": end_date,
-                "prices": price_data
+                "prices": [bar.to_dict() for bar in bars]
             }
             
         except KisAPIError as e:
             logger.error(f"과거 시세 데이터 조회 실패: {str(e)}")
             raise
 
-
 # 사용 예시
 if __name__ == "__main__":
+    import json
+    
+    from src.utils.log_setup import setup_logging
+    
+    setup_logging()
     try:
         # 모의투자 모드로 API 클라이언트 초기화
         api = KisAPI(mode=KisAPI.MODE_PAPER)
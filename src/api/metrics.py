@@ -0,0 +1,225 @@
+"""
+API 호출 계측 모듈
+
+tr_id별로 호출 제한 대기, 토큰 발급, 네트워크, JSON 파싱 시간을 히스토그램으로 모으고
+요청/재시도/오류 코드 횟수를 셉니다. 프로세스 안의 카운터만 갱신하므로 부담이 적으며,
+Prometheus 텍스트 형식이나 JSON으로 내보낼 수 있습니다.
+
+사용 예:
+    from src.api.metrics import get_metrics
+    print(get_metrics().to_prometheus())
+
+KIS_METRICS_DUMP_PATH를 설정하면 프로세스 종료 시 해당 경로에 JSON으로 저장합니다.
+"""
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import KIS_METRICS_DUMP_PATH
+
+# 단계 이름
+STAGE_QUEUE_WAIT = "queue_wait"  # 호출 제한기 대기
+STAGE_TOKEN = "token"  # 토큰 확인/발급
+STAGE_NETWORK = "network"  # HTTP 요청/응답
+STAGE_PARSE = "parse"  # JSON 파싱
+STAGE_TOTAL = "total"  # 재시도를 포함한 호출 전체
+
+# 히스토그램 구간 상한 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """고정 구간 히스토그램 (잠금은 ApiMetrics가 관리)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(구간 상한, 누적 건수) 목록 (Prometheus의 le 라벨 형식)"""
+        result = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            result.append((f"{bound:g}", total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ApiMetrics:
+    """tr_id별 API 호출 계측 (스레드 안전)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: 히스토그램 구간 상한 (초)
+        """
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str], int] = defaultdict(int)  # (tr_id, 상태 코드) -> 횟수
+        self._retries: Dict[Tuple[str, str], int] = defaultdict(int)  # (tr_id, 사유) -> 횟수
+        self._errors: Dict[Tuple[str, str], int] = defaultdict(int)  # (tr_id, 오류 코드) -> 횟수
+        self._queue_depths: Dict[str, int] = {}  # 요청 분류 -> 대기 중인 요청 수
+        self._queue_depth_max: Dict[str, int] = defaultdict(int)  # 요청 분류 -> 최대 대기 요청 수
+        self._lock = threading.Lock()
+
+    def observe(self, tr_id: str, stage: str, seconds: float) -> None:
+        """단계 소요 시간 기록"""
+        key = (tr_id, stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count_request(self, tr_id: str, status: str) -> None:
+        """HTTP 요청 1회 기록 (status: HTTP 상태 코드, 응답이 없으면 transport)"""
+        with self._lock:
+            self._requests[(tr_id, status)] += 1
+
+    def count_retry(self, tr_id: str, reason: str) -> None:
+        """재시도 1회 기록 (reason: msg_cd 또는 재시도 분류)"""
+        with self._lock:
+            self._retries[(tr_id, reason)] += 1
+
+    def count_error(self, tr_id: str, code: str) -> None:
+        """실패한 시도 1회 기록 (code: msg_cd, http_<상태 코드>, transport, deadline, circuit_open)"""
+        with self._lock:
+            self._errors[(tr_id, code)] += 1
+
+    def set_queue_depth(self, priority: str, depth: int) -> None:
+        """요청 스케줄러의 분류별 대기 중인 요청 수 기록"""
+        with self._lock:
+            self._queue_depths[priority] = depth
+            if depth > self._queue_depth_max[priority]:
+                self._queue_depth_max[priority] = depth
+
+    def histogram(self, tr_id: str, stage: str) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get((tr_id, stage))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._retries.clear()
+            self._errors.clear()
+            self._queue_depth_max.clear()
+            self._queue_depth_max.update(self._queue_depths)  # 대기 중인 요청은 초기화와 관계없이 남아 있음
+            self.started_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 저장용 스냅샷 ({tr_id: {stages, requests, retries, errors}}, 분류별 대기열 길이는 queues)"""
+        result: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"stages": {}, "requests": {}, "retries": {}, "errors": {}}
+        )
+        with self._lock:
+            for (tr_id, stage), histogram in self._histograms.items():
+                result[tr_id]["stages"][stage] = histogram.to_dict()
+            for name, counters in (
+                ("requests", self._requests),
+                ("retries", self._retries),
+                ("errors", self._errors),
+            ):
+                for (tr_id, label), count in counters.items():
+                    result[tr_id][name][label] = count
+            queues = {
+                priority: {"depth": depth, "max_depth": self._queue_depth_max[priority]}
+                for priority, depth in self._queue_depths.items()
+            }
+        return {"started_at": self.started_at, "dumped_at": time.time(), "tr_ids": dict(result), "queues": queues}
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 스냅샷"""
+        lines = [
+            "# HELP kis_api_stage_seconds KIS API call time by tr_id and stage",
+            "# TYPE kis_api_stage_seconds histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = [
+                ("kis_api_requests_total", "HTTP requests by tr_id and status", "status", sorted(self._requests.items())),
+                ("kis_api_retries_total", "Retries by tr_id and reason", "reason", sorted(self._retries.items())),
+                ("kis_api_errors_total", "Failed attempts by tr_id and error code", "code", sorted(self._errors.items())),
+            ]
+            gauges = [
+                ("kis_api_queue_depth", "Requests waiting in the scheduler by priority", sorted(self._queue_depths.items())),
+                ("kis_api_queue_depth_max", "Peak scheduler queue depth by priority", sorted(self._queue_depth_max.items())),
+            ]
+            for (tr_id, stage), histogram in histograms:
+                labels = f'tr_id="{_escape(tr_id)}",stage="{_escape(stage)}"'
+                for bound, count in histogram.cumulative():
+                    lines.append(f'kis_api_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"kis_api_stage_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"kis_api_stage_seconds_count{{{labels}}} {histogram.count}")
+
+        for name, help_text, label, items in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (tr_id, value), count in items:
+                lines.append(f'{name}{{tr_id="{_escape(tr_id)}",{label}="{_escape(value)}"}} {count}')
+        for name, help_text, depths in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for priority, depth in depths:
+                lines.append(f'{name}{{priority="{_escape(priority)}"}} {depth}')
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str) -> None:
+        """JSON 스냅샷을 파일로 저장"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+# 프로세스 공유 인스턴스
+_metrics: Optional[ApiMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> ApiMetrics:
+    """
+    프로세스 공유 계측 인스턴스 반환
+
+    KIS_METRICS_DUMP_PATH가 설정되어 있으면 처음 생성할 때 종료 시 JSON 저장을 등록합니다.
+
+    Returns:
+        ApiMetrics: 공유 계측 인스턴스
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = ApiMetrics()
+            if KIS_METRICS_DUMP_PATH:
+                atexit.register(_metrics.dump_json, KIS_METRICS_DUMP_PATH)
+        return _metrics
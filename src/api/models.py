@@ -0,0 +1,433 @@
+"""
+한국투자증권 API 응답 데이터 모델
+
+KIS 응답은 숫자도 문자열로 내려오므로 응답을 받은 곳에서 한 번만 변환해
+타입이 정해진 모델로 넘깁니다. 대량으로 만들어지는 모델은 __slots__로 메모리를 줄였습니다.
+"""
+import json
+from array import array
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+try:
+    import orjson  # 설치되어 있으면 표준 json보다 빠른 파서 사용
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    JSON 응답 파싱 (orjson이 있으면 사용)
+
+    Raises:
+        ValueError: JSON 형식이 아닌 경우 (orjson/json의 JSONDecodeError 모두 ValueError의 하위 클래스)
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _int(value: Any) -> int:
+    """KIS 숫자 문자열을 int로 변환 (빈 값은 0, '12345.00' 같은 소수 표기도 허용)"""
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _float(value: Any) -> float:
+    return float(value) if value else 0.0
+
+
+@dataclass(frozen=True)
+class Quote:
+    """현재가 (inquire-price 응답의 output)"""
+
+    __slots__ = ("code", "price", "open", "high", "low", "volume", "change", "change_rate")
+
+    code: str  # 종목코드
+    price: int  # 현재가
+    open: int  # 시가
+    high: int  # 고가
+    low: int  # 저가
+    volume: int  # 누적 거래량
+    change: int  # 전일 대비
+    change_rate: float  # 전일 대비율 (%)
+
+    @classmethod
+    def from_output(cls, code: str, output: Mapping[str, Any]) -> "Quote":
+        return cls(
+            code=code,
+            price=_int(output.get("stck_prpr")),
+            open=_int(output.get("stck_oprc")),
+            high=_int(output.get("stck_hgpr")),
+            low=_int(output.get("stck_lwpr")),
+            volume=_int(output.get("acml_vol")),
+            change=_int(output.get("prdy_vrss")),
+            change_rate=_float(output.get("prdy_ctrt")),
+        )
+
+
+@dataclass(frozen=True)
+class DailyBar:
+    """일별 시세 (inquire-daily-price 응답의 output2 항목)"""
+
+    __slots__ = ("date", "open", "high", "low", "close", "volume", "amount")
+
+    date: str  # 기준일자 (YYYYMMDD)
+    open: int  # 시가
+    high: int  # 고가
+    low: int  # 저가
+    close: int  # 종가
+    volume: int  # 거래량
+    amount: int  # 거래대금
+
+    @classmethod
+    def from_output(cls, item: Mapping[str, Any]) -> "DailyBar":
+        return cls(
+            date=item["stck_bsop_date"],
+            open=_int(item.get("stck_oprc")),
+            high=_int(item.get("stck_hgpr")),
+            low=_int(item.get("stck_lwpr")),
+            close=_int(item.get("stck_clpr")),
+            volume=_int(item.get("acml_vol")),
+            amount=_int(item.get("acml_tr_pbmn")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환 (DataFrame 생성, JSON 저장용)"""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class MinuteBars:
+    """분봉 한 페이지 (inquire-time-itemchartprice 응답의 output2, 최근 시각순)
+
+    분봉은 한 번에 많이 받으므로 봉마다 객체를 만들지 않고 항목별 정수 배열(열 단위)로 바로 변환합니다.
+    i번째 봉은 dates[i], times[i], open[i], ... 입니다.
+    """
+
+    __slots__ = ("code", "dates", "times", "open", "high", "low", "close", "volume", "amount")
+
+    code: str  # 종목코드
+    dates: array  # 영업일자 (YYYYMMDD 정수)
+    times: array  # 체결시각 (HHMMSS 정수, 09:01:00 -> 90100)
+    open: array  # 시가
+    high: array  # 고가
+    low: array  # 저가
+    close: array  # 종가 (해당 분의 마지막 체결가)
+    volume: array  # 체결 거래량
+    amount: array  # 누적 거래대금
+
+    @classmethod
+    def from_page(cls, code: str, result: Mapping[str, Any], start_time: int = 0) -> "MinuteBars":
+        """
+        분봉 조회 응답 한 페이지를 배열로 변환
+
+        Args:
+            code: 종목코드
+            result: 분봉 조회 응답
+            start_time: 이 시각(HHMMSS 정수) 이전의 봉은 제외 (0이면 모두 포함)
+        """
+        columns = [array("q") for _ in range(8)]
+        dates, times, opens, highs, lows, closes, volumes, amounts = columns
+        for item in result.get("output2") or []:
+            hour = item.get("stck_cntg_hour")
+            if not hour or int(hour) < start_time:
+                continue  # 데이터가 없는 구간의 빈 항목 또는 조회 시작 시각 이전
+            dates.append(_int(item.get("stck_bsop_date")))
+            times.append(int(hour))
+            opens.append(_int(item.get("stck_oprc")))
+            highs.append(_int(item.get("stck_hgpr")))
+            lows.append(_int(item.get("stck_lwpr")))
+            closes.append(_int(item.get("stck_prpr")))
+            volumes.append(_int(item.get("cntg_vol")))
+            amounts.append(_int(item.get("acml_tr_pbmn")))
+        return cls(code, *columns)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        """항목별 리스트로 변환 (DataFrame 생성, JSON 저장용)"""
+        return {name: getattr(self, name).tolist() for name in self.__slots__[1:]}
+
+
+@dataclass(frozen=True)
+class Holding:
+    """보유 종목 (inquire-balance 응답의 output1 항목)"""
+
+    __slots__ = ("code", "name", "quantity", "avg_price", "current_price", "eval_amount", "profit", "profit_rate")
+
+    code: str  # 종목코드
+    name: str  # 종목명
+    quantity: int  # 보유 수량
+    avg_price: float  # 매입 평균가
+    current_price: int  # 현재가
+    eval_amount: int  # 평가 금액
+    profit: int  # 평가 손익
+    profit_rate: float  # 평가 손익률 (%)
+
+    @classmethod
+    def from_output(cls, item: Mapping[str, Any]) -> "Holding":
+        return cls(
+            code=item.get("pdno", ""),
+            name=item.get("prdt_name", ""),
+            quantity=_int(item.get("hldg_qty")),
+            avg_price=_float(item.get("pchs_avg_pric")),
+            current_price=_int(item.get("prpr")),
+            eval_amount=_int(item.get("evlu_amt")),
+            profit=_int(item.get("evlu_pfls_amt")),
+            profit_rate=_float(item.get("evlu_pfls_rt")),
+        )
+
+    @classmethod
+    def from_page(cls, result: Mapping[str, Any]) -> List["Holding"]:
+        """잔고 응답 한 페이지의 보유 종목 (수량이 0인 종목 제외)"""
+        return [
+            cls.from_output(item)
+            for item in result.get("output1") or []
+            if _int(item.get("hldg_qty")) > 0
+        ]
+
+
+@dataclass(frozen=True)
+class Balance:
+    """계좌 잔고 (inquire-balance 응답, 연속조회한 경우 모든 페이지를 합친 값)"""
+
+    __slots__ = ("deposit", "orderable_cash", "total_eval", "holdings")
+
+    deposit: int  # 예수금 총액
+    orderable_cash: int  # 가수도 정산 금액 (D+2 예수금, 주문 가능 금액으로 사용)
+    total_eval: int  # 총 평가 금액
+    holdings: Tuple[Holding, ...]  # 보유 종목 (수량이 0인 종목 제외)
+
+    @classmethod
+    def from_result(cls, result: Mapping[str, Any]) -> "Balance":
+        return cls.from_pages([result])
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Mapping[str, Any]]) -> "Balance":
+        """
+        연속조회한 잔고 응답 페이지들을 하나의 잔고로 병합
+
+        페이지를 하나씩 소비하며 보유 종목만 남기므로 응답 전체를 모아 둘 필요가 없습니다.
+        계좌 합계(output2)는 페이지마다 내려오므로 마지막으로 받은 값을 사용합니다.
+        """
+        summary: Mapping[str, Any] = {}
+        holdings: List[Holding] = []
+        for result in pages:
+            summary = cls.page_summary(result) or summary
+            holdings.extend(Holding.from_page(result))
+        return cls.from_summary(summary, holdings)
+
+    @staticmethod
+    def page_summary(result: Mapping[str, Any]) -> Mapping[str, Any]:
+        """잔고 응답 한 페이지의 계좌 합계 (output2 첫 항목, 없으면 빈 딕셔너리)"""
+        return (result.get("output2") or [{}])[0]
+
+    @classmethod
+    def from_summary(cls, summary: Mapping[str, Any], holdings: Iterable[Holding]) -> "Balance":
+        """계좌 합계(output2 항목)와 보유 종목으로 잔고 생성"""
+        return cls(
+            deposit=_int(summary.get("dnca_tot_amt")),
+            orderable_cash=_int(summary.get("prvs_rcdl_excc_amt")),
+            total_eval=_int(summary.get("tot_evlu_amt")),
+            holdings=tuple(holdings),
+        )
+
+
+@dataclass(frozen=True)
+class OrderAck:
+    """주문 접수 결과 (order-cash 응답의 output)"""
+
+    __slots__ = ("order_no", "order_time", "branch_no", "message")
+
+    order_no: str  # 주문번호
+    order_time: str  # 주문시각 (HHMMSS)
+    branch_no: str  # 한국거래소 전송 주문 조직번호 (정정/취소 시 필요)
+    message: str  # 응답 메시지
+
+    @classmethod
+    def from_result(cls, result: Mapping[str, Any]) -> "OrderAck":
+        output = result.get("output") or {}
+        return cls(
+            order_no=output.get("ODNO", ""),
+            order_time=output.get("ORD_TMD", ""),
+            branch_no=output.get("KRX_FWDG_ORD_ORGNO", ""),
+            message=result.get("msg1", ""),
+        )
+
+
+@dataclass(frozen=True)
+class OrderSpec:
+    """일괄 주문(place_orders)의 주문 1건 (수량 또는 예산 중 하나를 지정)"""
+
+    code: str  # 종목코드
+    quantity: Optional[int] = None  # 주문 수량
+    budget: Optional[int] = None  # 주문 예산 (원, 일괄 조회한 현재가로 수량 계산)
+    order_type: str = "01"  # 주문 유형 (00: 지정가, 01: 시장가)
+    side: str = "BUY"  # 매매 구분 (BUY: 매수, SELL: 매도)
+    price: Optional[int] = None  # 주문 가격 (지정가 주문시 필수)
+    market: str = "J"  # 시장구분
+
+    def __post_init__(self):
+        if (self.quantity is None) == (self.budget is None):
+            raise ValueError(f"종목 {self.code}: 주문 수량과 예산 중 하나만 지정해야 합니다.")
+
+
+@dataclass(frozen=True)
+class OrderResult:
+    """일괄 주문의 주문 1건 결과 (실패해도 예외 대신 error에 사유 기록)"""
+
+    __slots__ = ("spec", "quantity", "expected_amount", "ack", "latency", "error")
+
+    spec: OrderSpec  # 요청한 주문
+    quantity: int  # 실제 주문 수량 (수량 계산 전에 실패하면 0)
+    expected_amount: int  # 예상 주문 금액 (수량 x 지정가 또는 일괄 조회한 현재가, 현재가를 조회하지 못하면 0)
+    ack: Optional[OrderAck]  # 주문 접수 결과 (실패하면 None)
+    latency: float  # 주문 접수 요청 소요 시간 (초, 전송하지 않았으면 0)
+    error: str  # 실패 사유 (성공하면 빈 문자열)
+
+    @property
+    def ok(self) -> bool:
+        return self.ack is not None
+
+
+@dataclass(frozen=True)
+class OrderStatus:
+    """주문 체결 현황 (inquire-daily-ccld 응답의 output1 항목)"""
+
+    __slots__ = (
+        "order_no", "order_date", "order_time", "code", "side", "quantity",
+        "filled_quantity", "remaining_quantity", "avg_fill_price", "filled_amount", "cancelled",
+    )
+
+    order_no: str  # 주문번호
+    order_date: str  # 주문일자 (YYYYMMDD)
+    order_time: str  # 주문시각 (HHMMSS)
+    code: str  # 종목코드
+    side: str  # 매매 구분 (BUY: 매수, SELL: 매도)
+    quantity: int  # 주문 수량
+    filled_quantity: int  # 총 체결 수량
+    remaining_quantity: int  # 잔여 수량
+    avg_fill_price: float  # 체결 평균가
+    filled_amount: int  # 총 체결 금액
+    cancelled: bool  # 취소 여부
+
+    @classmethod
+    def from_output(cls, item: Mapping[str, Any]) -> "OrderStatus":
+        return cls(
+            order_no=item.get("odno", ""),
+            order_date=item.get("ord_dt", ""),
+            order_time=item.get("ord_tmd", ""),
+            code=item.get("pdno", ""),
+            side="SELL" if item.get("sll_buy_dvsn_cd") == "01" else "BUY",  # 01: 매도, 02: 매수
+            quantity=_int(item.get("ord_qty")),
+            filled_quantity=_int(item.get("tot_ccld_qty")),
+            remaining_quantity=_int(item.get("rmn_qty")),
+            avg_fill_price=_float(item.get("avg_prvs")),
+            filled_amount=_int(item.get("tot_ccld_amt")),
+            cancelled=item.get("cncl_yn") == "Y",
+        )
+
+    @classmethod
+    def from_page(cls, result: Mapping[str, Any]) -> List["OrderStatus"]:
+        """주문 체결 조회 응답 한 페이지의 주문 (주문번호가 없는 빈 항목 제외)"""
+        return [cls.from_output(item) for item in result.get("output1") or [] if item.get("odno")]
+
+    @property
+    def done(self) -> bool:
+        """더 체결될 수량이 없는지 여부 (전량 체결, 취소 또는 잔여 수량 없음)"""
+        return self.cancelled or self.remaining_quantity == 0 or self.filled_quantity >= self.quantity
+
+
+@dataclass(frozen=True)
+class FillEvent:
+    """주문 체결 이벤트 (FillTracker가 새 체결을 확인할 때마다 1건)"""
+
+    __slots__ = ("order_no", "code", "side", "quantity", "filled_quantity", "order_quantity", "avg_price", "done")
+
+    order_no: str  # 주문번호
+    code: str  # 종목코드
+    side: str  # 매매 구분 (BUY: 매수, SELL: 매도)
+    quantity: int  # 이번에 새로 체결된 수량
+    filled_quantity: int  # 누적 체결 수량
+    order_quantity: int  # 주문 수량
+    avg_price: float  # 누적 체결 평균가
+    done: bool  # 주문이 끝났는지 여부 (전량 체결 또는 취소)
+
+
+@dataclass(frozen=True)
+class Tick:
+    """실시간 체결 (H0STCNT0 체결가 프레임 1건)"""
+
+    __slots__ = ("time", "price", "volume", "cum_volume", "ask", "bid", "received_at")
+
+    time: str  # 체결시각 (HHMMSS)
+    price: int  # 체결가
+    volume: int  # 체결 거래량
+    cum_volume: int  # 누적 거래량
+    ask: int  # 매도 1호가
+    bid: int  # 매수 1호가
+    received_at: float  # 수신 시각 (time.time())
+
+
+@dataclass
+class StockPrices:
+    """여러 종목 현재가 조회 결과
+
+    종목별 딕셔너리 대신 항목별 리스트(열 단위)로 보관합니다.
+    실패한 종목은 예외 대신 errors에 사유가 기록됩니다.
+    """
+
+    codes: List[str] = field(default_factory=list)  # 종목코드
+    prices: List[int] = field(default_factory=list)  # 현재가
+    volumes: List[int] = field(default_factory=list)  # 누적 거래량
+    changes: List[int] = field(default_factory=list)  # 전일 대비
+    change_rates: List[float] = field(default_factory=list)  # 전일 대비율 (%)
+    errors: Dict[str, str] = field(default_factory=dict)  # 종목코드 -> 오류 메시지
+    _index: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def add(self, code: str, output: Dict) -> None:
+        """현재가 조회 응답(output)을 결과에 추가"""
+        self._index[code] = len(self.codes)
+        self.codes.append(code)
+        self.prices.append(_int(output.get("stck_prpr")))
+        self.volumes.append(_int(output.get("acml_vol")))
+        self.changes.append(_int(output.get("prdy_vrss")))
+        self.change_rates.append(_float(output.get("prdy_ctrt")))
+
+    def add_error(self, code: str, message: str) -> None:
+        """조회 실패 종목 기록"""
+        self.errors[code] = message
+
+    def price(self, code: str) -> Optional[int]:
+        """종목 현재가 (조회 실패 또는 요청하지 않은 종목이면 None)"""
+        index = self._index.get(code)
+        return None if index is None else self.prices[index]
+
+    def quote(self, code: str) -> Optional[Quote]:
+        """종목 시세 모델 (시가/고가/저가는 보관하지 않으므로 0)"""
+        index = self._index.get(code)
+        if index is None:
+            return None
+        return Quote(
+            code=code,
+            price=self.prices[index],
+            open=0,
+            high=0,
+            low=0,
+            volume=self.volumes[index],
+            change=self.changes[index],
+            change_rate=self.change_rates[index],
+        )
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+
+    def __len__(self) -> int:
+        return len(self.codes)
@@ -0,0 +1,176 @@
+"""
+현재가 조회 결과 캐시 모듈
+
+같은 종목을 짧은 시간 안에 여러 번 조회할 때 HTTP 요청을 다시 보내지 않도록
+TTL(유효시간)과 LRU 방식으로 시세를 보관합니다.
+동시에 같은 종목을 요청하면 하나의 조회만 실행하고 결과를 나눠 씁니다. (single-flight)
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _InFlight:
+    """진행 중인 조회 (같은 키를 기다리는 호출자들이 결과를 공유)"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class QuoteCache:
+    """TTL + LRU 시세 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl: float = 1.0, maxsize: int = 1024, ttl_by_code: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            ttl: 기본 유효시간 (초)
+            maxsize: 최대 보관 종목 수 (초과 시 가장 오래 사용하지 않은 종목부터 제거)
+            ttl_by_code: 종목별 유효시간 (초)
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.ttl_by_code: Dict[str, float] = dict(ttl_by_code or {})
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # 진행 중인 조회를 공유한 횟수
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, _InFlight] = {}
+        self._in_flight_async: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def _ttl_for(self, key: Hashable) -> float:
+        code = key[0] if isinstance(key, tuple) else key
+        return self.ttl_by_code.get(code, self.ttl)
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        """유효한 캐시 항목 조회 (lock을 잡은 상태에서 호출)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if now >= expires_at:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """캐시 항목 저장 (lock을 잡은 상태에서 호출)"""
+        self._entries[key] = (time.monotonic() + self._ttl_for(key), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        캐시된 값을 반환하거나, 없으면 조회 후 저장
+
+        Args:
+            key: 캐시 키 (예: (종목코드, 시장구분))
+            fetch: 캐시에 없을 때 실행할 조회 함수
+
+        Returns:
+            Any: 캐시된 값 또는 새로 조회한 값
+
+        Raises:
+            Exception: fetch에서 발생한 예외 (기다리던 호출자에게도 그대로 전달)
+        """
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            call = self._in_flight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                call = self._in_flight[key] = _InFlight()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+            with self._lock:
+                self._store(key, call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.event.set()
+
+    async def get_or_fetch_async(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        get_or_fetch의 asyncio 버전 (같은 이벤트 루프의 코루틴끼리 조회를 공유)
+
+        Args:
+            key: 캐시 키 (예: (종목코드, 시장구분))
+            fetch: 캐시에 없을 때 실행할 코루틴 함수
+
+        Returns:
+            Any: 캐시된 값 또는 새로 조회한 값
+        """
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            future = self._in_flight_async.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = self._in_flight_async[key] = asyncio.get_running_loop().create_future()
+                leader = True
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await fetch()
+            with self._lock:
+                self._store(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 코루틴이 없더라도 '예외가 회수되지 않음' 경고가 남지 않도록 처리
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight_async[key]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """캐시 항목 삭제 (key를 생략하면 전체 삭제)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 적중/실패 통계"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+            }
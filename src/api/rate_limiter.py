@@ -0,0 +1,228 @@
+"""
+API 호출 제한(유량) 관리 모듈
+
+한국투자증권 REST API는 앱키 단위로 초당 호출 건수를 제한합니다.
+(실전투자 초당 20건, 모의투자 초당 2건, 초과 시 EGW00201 오류)
+토큰 버킷 방식으로 짧은 순간의 몰림은 흡수하면서 한도를 넘지 않도록 조절합니다.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from config.settings import (
+    KIS_REAL_RATE_LIMIT,
+    KIS_REAL_RATE_BURST,
+    KIS_PAPER_RATE_LIMIT,
+    KIS_PAPER_RATE_BURST,
+    KIS_ORDER_RATE_LIMIT,
+    KIS_ORDER_RATE_BURST,
+)
+
+# 모드별 (초당 충전량, 버킷 용량)
+# 용량 + 초당 충전량이 공식 한도를 넘지 않아야 어떤 1초 구간에서도 한도를 지킬 수 있음
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "real": (KIS_REAL_RATE_LIMIT, KIS_REAL_RATE_BURST),
+    "paper": (KIS_PAPER_RATE_LIMIT, KIS_PAPER_RATE_BURST),
+}
+
+# 모드별 현금 주문 tr_id (매수, 매도), 모드 전체 한도와 함께 KIS_ORDER_RATE_LIMIT 한도도 적용 (0으로 끌 수 있음)
+ORDER_TR_IDS: Dict[str, Tuple[str, str]] = {
+    "real": ("TTTC0012U", "TTTC0011U"),
+    "paper": ("VTTC0012U", "VTTC0011U"),
+}
+ALL_ORDER_TR_IDS: FrozenSet[str] = frozenset(tr_id for tr_ids in ORDER_TR_IDS.values() for tr_id in tr_ids)
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷
+
+    토큰이 부족하면 음수(예약)로 차감하고, 호출자는 반환된 시간만큼 기다립니다.
+    대기를 호출자가 직접 하므로 스레드(time.sleep)와 asyncio(asyncio.sleep) 모두에서 사용할 수 있습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 초당 충전되는 토큰 수
+            capacity: 버킷 최대 용량 (순간 허용 호출 수)
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate는 0보다 크고 capacity는 1 이상이어야 합니다.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def reserve(self, tokens: float = 1, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        토큰 예약
+
+        Args:
+            tokens: 사용할 토큰 수
+            max_wait: 허용 가능한 최대 대기 시간 (초과 시 예약하지 않음)
+
+        Returns:
+            Optional[float]: 기다려야 하는 시간(초), 최대 대기 시간을 넘으면 None
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """버킷을 비워 이후 호출이 최소 seconds초 기다리도록 함 (서버가 호출 한도 초과로 거절했을 때)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """지금 예약하면 기다려야 하는 시간 (초, 예약하지는 않음)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def refund(self, tokens: float = 1) -> None:
+        """예약한 토큰 반환 (다른 버킷 예약에 실패했을 때 사용)"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+
+class RateLimiter:
+    """모드 전체 버킷과 tr_id별 버킷을 함께 관리하는 호출 제한기"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        tr_id_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        """
+        Args:
+            rate: 초당 허용 호출 수
+            capacity: 순간 허용 호출 수
+            tr_id_limits: tr_id별 (초당 허용 호출 수, 순간 허용 호출 수)
+        """
+        self._bucket = TokenBucket(rate, capacity)
+        self._tr_id_buckets: Dict[str, TokenBucket] = {
+            tr_id: TokenBucket(tr_rate, tr_capacity)
+            for tr_id, (tr_rate, tr_capacity) in (tr_id_limits or {}).items()
+        }
+
+    @property
+    def rate(self) -> float:
+        """모드 전체 초당 허용 호출 수"""
+        return self._bucket.rate
+
+    def pause(self, seconds: float) -> None:
+        """모든 호출자가 seconds초 동안 쉬도록 함 (EGW00201 응답을 받았을 때)"""
+        self._bucket.pause(seconds)
+
+    def wait_time(self, tr_id: str = "") -> float:
+        """지금 호출하면 기다려야 하는 시간 (초, 여러 클라이언트 중 덜 바쁜 쪽을 고를 때 사용)"""
+        wait = self._bucket.wait_time()
+        if tr_id in self._tr_id_buckets:
+            wait = max(wait, self._tr_id_buckets[tr_id].wait_time())
+        return wait
+
+    def _reserve(self, tr_id: str, max_wait: Optional[float]) -> Optional[float]:
+        buckets: List[TokenBucket] = [self._bucket]
+        if tr_id in self._tr_id_buckets:
+            buckets.append(self._tr_id_buckets[tr_id])
+
+        reserved: List[TokenBucket] = []
+        wait = 0.0
+        for bucket in buckets:
+            bucket_wait = bucket.reserve(max_wait=max_wait)
+            if bucket_wait is None:
+                for done in reserved:
+                    done.refund()
+                return None
+            reserved.append(bucket)
+            wait = max(wait, bucket_wait)
+        return wait
+
+    def try_acquire(self, tr_id: str = "") -> bool:
+        """기다리지 않고 호출 권한을 얻을 수 있으면 획득 (RequestScheduler가 차례가 된 요청에 사용)"""
+        return self._reserve(tr_id, 0.0) is not None
+
+    def acquire(self, tr_id: str = "", timeout: Optional[float] = None) -> float:
+        """
+        호출 권한 획득 (필요하면 현재 스레드에서 대기)
+
+        Args:
+            tr_id: 거래 ID
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            float: 실제 대기한 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 호출 권한을 얻을 수 없는 경우
+        """
+        wait = self._reserve(tr_id, timeout)
+        if wait is None:
+            raise TimeoutError(f"{timeout:.2f}초 안에 API 호출 권한을 얻을 수 없습니다. (tr_id: {tr_id})")
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tr_id: str = "", timeout: Optional[float] = None) -> float:
+        """
+        호출 권한 획득 (asyncio 버전, 이벤트 루프를 막지 않음)
+
+        Args:
+            tr_id: 거래 ID
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            float: 실제 대기한 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 호출 권한을 얻을 수 없는 경우
+        """
+        wait = self._reserve(tr_id, timeout)
+        if wait is None:
+            raise TimeoutError(f"{timeout:.2f}초 안에 API 호출 권한을 얻을 수 없습니다. (tr_id: {tr_id})")
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# 앱키별 공유 인스턴스 (유량 제한은 앱키 단위로 적용됨)
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(mode: str, app_key: str) -> RateLimiter:
+    """
+    모드/앱키에 해당하는 공유 호출 제한기 반환
+
+    같은 프로세스의 모든 KisAPI 인스턴스가 하나의 한도를 나눠 쓰도록 합니다.
+
+    Args:
+        mode: 거래 모드 (real, paper)
+        app_key: 앱키
+
+    Returns:
+        RateLimiter: 공유 호출 제한기
+    """
+    key = (mode, app_key)
+    with _limiters_lock:
+        if key not in _limiters:
+            rate, capacity = DEFAULT_LIMITS[mode]
+            tr_id_limits = {}
+            if KIS_ORDER_RATE_LIMIT > 0:
+                tr_id_limits = {tr_id: (KIS_ORDER_RATE_LIMIT, KIS_ORDER_RATE_BURST) for tr_id in ORDER_TR_IDS[mode]}
+            _limiters[key] = RateLimiter(rate, capacity, tr_id_limits)
+        return _limiters[key]
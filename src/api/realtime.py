@@ -0,0 +1,526 @@
+"""
+실시간 시세(WebSocket) 클라이언트 모듈
+
+REST 현재가 조회는 호출 한도 때문에 많은 종목을 자주 볼 수 없으므로,
+KIS 실시간 WebSocket에 체결가(H0STCNT0)/호가(H0STASP0)를 등록해 밀어주는 시세를 받습니다.
+접속키 발급, 등록/해제, 연결이 끊겼을 때의 재접속과 재등록을 처리하며,
+수신한 체결은 종목별로 미리 할당한 링 버퍼에, 호가는 종목별 스냅샷에 덮어씁니다.
+
+사용 예:
+    async with AsyncKisAPI(mode=AsyncKisAPI.MODE_PAPER) as api:
+        async with KisRealtimeClient(api) as stream:
+            for code in watchlist:
+                await stream.subscribe(code)
+            ...
+            tick = stream.ticks("005930").latest()
+
+수신 프레임 형식 (암호화여부|tr_id|건수|필드^필드^...):
+    0|H0STCNT0|001|005930^093354^71900^5^-100^-0.14^...
+"""
+import asyncio
+import json
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Set, TextIO, Tuple
+
+import aiohttp
+from loguru import logger
+
+from config.settings import (
+    KIS_WS_URL,
+    KIS_WS_RING_SIZE,
+    KIS_WS_MAX_SUBSCRIPTIONS,
+    KIS_WS_RECONNECT_MAX_DELAY,
+    KIS_HTTP_CONNECT_TIMEOUT,
+    KIS_HTTP_READ_TIMEOUT,
+)
+from src.api.kis_api import KisAPIBase, KisAPIError
+from src.api.models import Tick
+from src.api.retry import RetryPolicy
+
+# 실시간 서버 주소
+WS_URL = "ws://ops.koreainvestment.com:21000"
+PAPER_WS_URL = "ws://ops.koreainvestment.com:31000"
+
+# 실시간 tr_id
+TR_TRADE = "H0STCNT0"  # 국내주식 실시간 체결가
+TR_ORDER_BOOK = "H0STASP0"  # 국내주식 실시간 호가
+TR_PINGPONG = "PINGPONG"  # 서버 연결 확인 (받은 그대로 돌려보냄)
+
+# 등록 요청 구분
+SUBSCRIBE = "1"
+UNSUBSCRIBE = "2"
+
+# 체결가 프레임 필드 위치
+TRADE_CODE = 0  # 종목코드
+TRADE_TIME = 1  # 체결시각 (HHMMSS)
+TRADE_PRICE = 2  # 체결가
+TRADE_ASK = 10  # 매도 1호가
+TRADE_BID = 11  # 매수 1호가
+TRADE_VOLUME = 12  # 체결 거래량
+TRADE_CUM_VOLUME = 13  # 누적 거래량
+
+# 호가 프레임 필드 위치
+BOOK_CODE = 0  # 종목코드
+BOOK_TIME = 1  # 영업시각 (HHMMSS)
+BOOK_ASK_PRICES = 3  # 매도호가 1~10
+BOOK_BID_PRICES = 13  # 매수호가 1~10
+BOOK_ASK_QUANTITIES = 23  # 매도호가 잔량 1~10
+BOOK_BID_QUANTITIES = 33  # 매수호가 잔량 1~10
+BOOK_TOTAL_ASK = 43  # 총 매도호가 잔량
+BOOK_TOTAL_BID = 44  # 총 매수호가 잔량
+BOOK_DEPTH = 10
+
+
+class TickRing:
+    """종목별 최근 체결 링 버퍼
+
+    항목별 배열(열 단위)을 생성 시점에 한 번만 할당하고, 가득 차면 가장 오래된 체결을 덮어씁니다.
+    쓰기는 수신 루프 한 곳에서만 하며, 읽는 쪽은 latest()/last()로 Tick 복사본을 받습니다.
+    """
+
+    __slots__ = ("capacity", "times", "prices", "volumes", "cum_volumes", "asks", "bids", "received_at", "count", "_next")
+
+    def __init__(self, capacity: int = KIS_WS_RING_SIZE):
+        """
+        Args:
+            capacity: 보관할 최근 체결 수
+        """
+        if capacity < 1:
+            raise ValueError("capacity는 1 이상이어야 합니다.")
+        self.capacity = capacity
+        self.times = array("q", bytes(8 * capacity))  # 체결시각 (HHMMSS)
+        self.prices = array("q", bytes(8 * capacity))
+        self.volumes = array("q", bytes(8 * capacity))
+        self.cum_volumes = array("q", bytes(8 * capacity))
+        self.asks = array("q", bytes(8 * capacity))
+        self.bids = array("q", bytes(8 * capacity))
+        self.received_at = array("d", bytes(8 * capacity))
+        self.count = 0  # 지금까지 받은 체결 수 (덮어쓴 것 포함)
+        self._next = 0  # 다음에 쓸 위치
+
+    def append(self, hhmmss: int, price: int, volume: int, cum_volume: int, ask: int, bid: int, received_at: float) -> None:
+        i = self._next
+        self.times[i] = hhmmss
+        self.prices[i] = price
+        self.volumes[i] = volume
+        self.cum_volumes[i] = cum_volume
+        self.asks[i] = ask
+        self.bids[i] = bid
+        self.received_at[i] = received_at
+        self._next = (i + 1) % self.capacity
+        self.count += 1
+
+    def _tick(self, i: int) -> Tick:
+        return Tick(
+            time=f"{self.times[i]:06d}",
+            price=self.prices[i],
+            volume=self.volumes[i],
+            cum_volume=self.cum_volumes[i],
+            ask=self.asks[i],
+            bid=self.bids[i],
+            received_at=self.received_at[i],
+        )
+
+    def latest(self) -> Optional[Tick]:
+        """가장 최근 체결 (없으면 None)"""
+        if self.count == 0:
+            return None
+        return self._tick((self._next - 1) % self.capacity)
+
+    def last(self, n: Optional[int] = None) -> List[Tick]:
+        """
+        최근 체결 목록
+
+        Args:
+            n: 가져올 개수 (생략 시 보관 중인 전체)
+
+        Returns:
+            List[Tick]: 오래된 순서의 체결 목록
+        """
+        size = len(self)
+        if n is None or n > size:
+            n = size
+        start = self._next - n
+        return [self._tick((start + k) % self.capacity) for k in range(n)]
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+
+class OrderBook:
+    """종목별 최근 호가 (10단계, 미리 할당한 배열에 덮어씀)"""
+
+    __slots__ = ("time", "ask_prices", "bid_prices", "ask_quantities", "bid_quantities", "total_ask", "total_bid", "received_at")
+
+    def __init__(self):
+        self.time = ""  # 영업시각 (HHMMSS)
+        self.ask_prices = array("q", bytes(8 * BOOK_DEPTH))  # 매도호가 1~10
+        self.bid_prices = array("q", bytes(8 * BOOK_DEPTH))  # 매수호가 1~10
+        self.ask_quantities = array("q", bytes(8 * BOOK_DEPTH))  # 매도호가 잔량 1~10
+        self.bid_quantities = array("q", bytes(8 * BOOK_DEPTH))  # 매수호가 잔량 1~10
+        self.total_ask = 0  # 총 매도호가 잔량
+        self.total_bid = 0  # 총 매수호가 잔량
+        self.received_at = 0.0  # 수신 시각 (0이면 아직 받지 않음)
+
+    def update(self, fields: List[str], received_at: float) -> None:
+        """호가 프레임 1건으로 갱신"""
+        self.time = fields[BOOK_TIME]
+        for level in range(BOOK_DEPTH):
+            self.ask_prices[level] = int(fields[BOOK_ASK_PRICES + level])
+            self.bid_prices[level] = int(fields[BOOK_BID_PRICES + level])
+            self.ask_quantities[level] = int(fields[BOOK_ASK_QUANTITIES + level])
+            self.bid_quantities[level] = int(fields[BOOK_BID_QUANTITIES + level])
+        self.total_ask = int(fields[BOOK_TOTAL_ASK])
+        self.total_bid = int(fields[BOOK_TOTAL_BID])
+        self.received_at = received_at
+
+    @property
+    def best_ask(self) -> int:
+        return self.ask_prices[0]
+
+    @property
+    def best_bid(self) -> int:
+        return self.bid_prices[0]
+
+
+def parse_frame(text: str) -> Tuple[bool, str, List[List[str]]]:
+    """
+    실시간 데이터 프레임 분해
+
+    Args:
+        text: 수신 프레임 (암호화여부|tr_id|건수|필드^필드^...)
+
+    Returns:
+        Tuple[bool, str, List[List[str]]]: (암호화 여부, tr_id, 건별 필드 목록)
+
+    Raises:
+        ValueError: 형식이 맞지 않는 경우
+    """
+    encrypted, tr_id, raw_count, payload = text.split("|", 3)
+    if encrypted == "1":
+        return True, tr_id, []
+    fields = payload.split("^")
+    count = int(raw_count)
+    if count < 1 or len(fields) % count:
+        raise ValueError(f"필드 수({len(fields)})가 건수({count})와 맞지 않습니다.")
+    size = len(fields) // count
+    return False, tr_id, [fields[k * size:(k + 1) * size] for k in range(count)]
+
+
+class KisRealtimeClient:
+    """한국투자증권 실시간 시세 클라이언트 (asyncio)"""
+
+    def __init__(
+        self,
+        api: KisAPIBase,
+        ws_url: Optional[str] = None,
+        ring_size: int = KIS_WS_RING_SIZE,
+        max_subscriptions: int = KIS_WS_MAX_SUBSCRIPTIONS,
+        reconnect_policy: Optional[RetryPolicy] = None,
+        on_update: Optional[Callable[[str, str], None]] = None,
+        record_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            api: 모드, 서버 주소, 앱키를 가져올 API 클라이언트 (KisAPI 또는 AsyncKisAPI)
+            ws_url: 실시간 서버 주소 (생략 시 KIS_WS_URL, api에 서버 주소가 지정되어 있으면 같은 서버, 없으면 모드별 공식 주소)
+            ring_size: 종목별로 보관할 최근 체결 수
+            max_subscriptions: 세션당 최대 등록 수 (체결가/호가 합산)
+            reconnect_policy: 재접속 대기 시간 정책 (생략 시 1초부터 KIS_WS_RECONNECT_MAX_DELAY까지 지수 증가)
+            on_update: 데이터를 받을 때마다 호출할 함수 (tr_id, 종목코드), 수신 루프에서 실행되므로 가볍게 유지
+            record_path: 받은 데이터 프레임을 한 줄씩 기록할 파일 (재생 서버 입력용)
+        """
+        self.api = api
+        self.ws_url = ws_url or KIS_WS_URL or self._default_ws_url(api)
+        self.ring_size = ring_size
+        self.max_subscriptions = max_subscriptions
+        self.reconnect_policy = reconnect_policy or RetryPolicy(base_delay=1.0, max_delay=KIS_WS_RECONNECT_MAX_DELAY)
+        self.on_update = on_update
+        self.record_path = record_path
+
+        self._subscriptions: Set[Tuple[str, str]] = set()  # (tr_id, 종목코드)
+        self._rings: Dict[str, TickRing] = {}
+        self._books: Dict[str, OrderBook] = {}
+        self._approval_key: Optional[str] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._record_file: Optional[TextIO] = None
+
+        # 통계 (frames: 데이터 프레임, ticks: 체결 건수, books: 호가 건수, reconnects: 재접속 횟수, skipped: 처리하지 않은 프레임)
+        self.stats: Dict[str, int] = {"frames": 0, "ticks": 0, "books": 0, "reconnects": 0, "skipped": 0}
+
+    @staticmethod
+    def _default_ws_url(api: KisAPIBase) -> str:
+        if api.base_url:
+            # 로컬 재생 서버처럼 REST와 같은 서버를 쓰는 경우
+            return "ws" + api.base_url[len("http"):] if api.base_url.startswith("http") else api.base_url
+        return PAPER_WS_URL if api.mode == KisAPIBase.MODE_PAPER else WS_URL
+
+    async def __aenter__(self) -> "KisRealtimeClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    # 조회
+
+    def ticks(self, code: str) -> TickRing:
+        """
+        종목 체결 링 버퍼
+
+        Raises:
+            KeyError: 체결가를 등록한 적 없는 종목인 경우
+        """
+        return self._rings[code]
+
+    def order_book(self, code: str) -> OrderBook:
+        """
+        종목 호가
+
+        Raises:
+            KeyError: 호가를 등록한 적 없는 종목인 경우
+        """
+        return self._books[code]
+
+    @property
+    def subscriptions(self) -> Set[Tuple[str, str]]:
+        return set(self._subscriptions)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> None:
+        """접속될 때까지 대기 (asyncio.TimeoutError: 시간 내에 접속하지 못한 경우)"""
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    # 등록 관리
+
+    async def subscribe(self, code: str, tr_id: str = TR_TRADE) -> None:
+        """
+        실시간 시세 등록 (접속 전이면 접속 후 등록, 재접속 시 자동 재등록)
+
+        Args:
+            code: 종목코드
+            tr_id: TR_TRADE(체결가) 또는 TR_ORDER_BOOK(호가)
+
+        Raises:
+            KisAPIError: 세션당 최대 등록 수를 넘는 경우
+        """
+        key = (tr_id, code)
+        if key in self._subscriptions:
+            return
+        if len(self._subscriptions) >= self.max_subscriptions:
+            raise KisAPIError(f"실시간 등록은 세션당 최대 {self.max_subscriptions}건입니다.")
+        # 수신 전에 버퍼를 할당해 두고 수신 루프에서는 덮어쓰기만 함
+        if tr_id == TR_TRADE and code not in self._rings:
+            self._rings[code] = TickRing(self.ring_size)
+        elif tr_id == TR_ORDER_BOOK and code not in self._books:
+            self._books[code] = OrderBook()
+        self._subscriptions.add(key)
+        await self._send_subscription(SUBSCRIBE, tr_id, code)
+
+    async def unsubscribe(self, code: str, tr_id: str = TR_TRADE) -> None:
+        """실시간 시세 해제 (받은 데이터는 유지)"""
+        key = (tr_id, code)
+        if key not in self._subscriptions:
+            return
+        self._subscriptions.discard(key)
+        await self._send_subscription(UNSUBSCRIBE, tr_id, code)
+
+    async def _send_subscription(self, tr_type: str, tr_id: str, code: str) -> None:
+        ws = self._ws
+        if ws is None or ws.closed:
+            return
+        await ws.send_str(json.dumps({
+            "header": {
+                "approval_key": self._approval_key,
+                "custtype": "P",
+                "tr_type": tr_type,
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": tr_id, "tr_key": code}},
+        }))
+
+    # 접속/수신
+
+    async def start(self) -> None:
+        """백그라운드에서 접속/수신 시작"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """수신 중지 및 연결 정리"""
+        self._stopping.set()
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+
+    async def run(self) -> None:
+        """stop()을 부를 때까지 접속/수신, 끊기면 재접속 대기 후 다시 접속해 재등록"""
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                received = await self._connect_and_listen()
+                failures = 0 if received else failures + 1
+            except (aiohttp.ClientError, asyncio.TimeoutError, KisAPIError, ValueError) as e:
+                failures += 1
+                # 접속키가 무효가 됐을 수 있으므로 다시 발급
+                self._approval_key = None
+                logger.warning(f"실시간 시세 연결 실패: {str(e) or type(e).__name__}")
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+            if self._stopping.is_set():
+                break
+            delay = self.reconnect_policy.delay(max(failures, 1))
+            logger.info(f"실시간 시세 연결이 끊겼습니다. {delay:.1f}초 후 재접속합니다.")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                self.stats["reconnects"] += 1
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # 타임아웃은 접속키 발급과 WebSocket 핸드셰이크에만 적용 (접속 후 수신은 시간 제한 없음)
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=KIS_HTTP_READ_TIMEOUT, connect=KIS_HTTP_CONNECT_TIMEOUT)
+            )
+        return self._session
+
+    async def _issue_approval_key(self) -> str:
+        """
+        실시간 접속키 발급
+
+        Raises:
+            KisAPIError: 발급 실패 시
+        """
+        session = await self._ensure_session()
+        url, data = self.api._approval_request()
+        async with session.post(url, json=data) as response:
+            result = await response.json(content_type=None)
+        approval_key = result.get("approval_key") if isinstance(result, dict) else None
+        if not approval_key:
+            raise KisAPIError(f"실시간 접속키 발급 실패: {result}", status_code=response.status)
+        logger.info("실시간 접속키가 발급되었습니다.")
+        return approval_key
+
+    async def _connect_and_listen(self) -> bool:
+        """
+        접속 후 연결이 끊길 때까지 수신
+
+        Returns:
+            bool: 데이터 프레임을 하나라도 받았는지 여부 (재접속 대기 시간 초기화 기준)
+        """
+        if self._approval_key is None:
+            self._approval_key = await self._issue_approval_key()
+        session = await self._ensure_session()
+        frames_before = self.stats["frames"]
+
+        async with session.ws_connect(self.ws_url, autoping=True) as ws:
+            self._ws = ws
+            self._connected.set()
+            logger.info(f"실시간 시세에 접속했습니다. ({len(self._subscriptions)}건 등록)")
+            for tr_id, code in list(self._subscriptions):
+                await self._send_subscription(SUBSCRIBE, tr_id, code)
+
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    await self._on_message(ws, message.data)
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    raise ws.exception() or aiohttp.ClientError("WebSocket 오류")
+
+        return self.stats["frames"] > frames_before
+
+    async def _on_message(self, ws: aiohttp.ClientWebSocketResponse, text: str) -> None:
+        if text[:1] in ("0", "1"):
+            self._on_frame(text)
+            return
+
+        # JSON 메시지: 연결 확인(PINGPONG) 또는 등록/해제 응답
+        try:
+            message = json.loads(text)
+        except ValueError:
+            self.stats["skipped"] += 1
+            return
+        header = message.get("header", {})
+        if header.get("tr_id") == TR_PINGPONG:
+            await ws.send_str(text)
+            return
+        body = message.get("body", {})
+        if body.get("rt_cd", "0") != "0":
+            logger.warning(
+                f"실시간 등록 실패 ({header.get('tr_id')} {header.get('tr_key')}): "
+                f"{body.get('msg_cd')} {body.get('msg1')}"
+            )
+        else:
+            logger.debug(f"실시간 응답 ({header.get('tr_id')} {header.get('tr_key')}): {body.get('msg1')}")
+
+    def _on_frame(self, text: str) -> None:
+        """데이터 프레임을 링 버퍼/호가에 반영"""
+        try:
+            encrypted, tr_id, records = parse_frame(text)
+        except ValueError as e:
+            self.stats["skipped"] += 1
+            logger.debug(f"실시간 프레임 형식 오류: {str(e)}")
+            return
+        if encrypted:
+            # 암호화 프레임은 체결통보(H0STCNI0) 전용이며 이 클라이언트는 등록하지 않음
+            self.stats["skipped"] += 1
+            return
+
+        self.stats["frames"] += 1
+        if self.record_path:
+            if self._record_file is None:
+                self._record_file = open(self.record_path, "a", encoding="utf-8")
+            self._record_file.write(text + "\n")
+
+        received_at = time.time()
+        for fields in records:
+            code = fields[0]
+            try:
+                if tr_id == TR_TRADE:
+                    ring = self._rings.get(code)
+                    if ring is None:
+                        continue
+                    ring.append(
+                        int(fields[TRADE_TIME]),
+                        int(fields[TRADE_PRICE]),
+                        int(fields[TRADE_VOLUME]),
+                        int(fields[TRADE_CUM_VOLUME]),
+                        int(fields[TRADE_ASK]),
+                        int(fields[TRADE_BID]),
+                        received_at,
+                    )
+                    self.stats["ticks"] += 1
+                elif tr_id == TR_ORDER_BOOK:
+                    book = self._books.get(code)
+                    if book is None:
+                        continue
+                    book.update(fields, received_at)
+                    self.stats["books"] += 1
+                else:
+                    self.stats["skipped"] += 1
+                    continue
+            except (ValueError, IndexError) as e:
+                self.stats["skipped"] += 1
+                logger.debug(f"실시간 프레임 필드 오류 ({tr_id} {code}): {str(e)}")
+                continue
+            if self.on_update is not None:
+                self.on_update(tr_id, code)
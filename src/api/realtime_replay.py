@@ -0,0 +1,372 @@
+"""
+한국투자증권 실시간 시세(WebSocket) 로컬 재생 서버
+
+실제 장중 접속 없이 KisRealtimeClient의 접속키 발급, 등록/해제, PINGPONG, 재접속을 시험하기 위한
+로컬 서버입니다. KisRealtimeClient(record_path=...)로 기록한 프레임 파일을 재생하거나,
+파일이 없으면 스텁 서버와 같은 가상 시세를 기준으로 체결가/호가 프레임을 만들어 보냅니다.
+
+실행 예:
+    python -m src.api.realtime_replay --port 18081 --frames ticks.txt --interval 0.05
+    KIS_BASE_URL=http://127.0.0.1:18081 ...  # 접속키 발급과 WebSocket 모두 같은 주소 사용
+
+코드에서 사용:
+    with KisRealtimeReplayServer(interval=0.01, disconnect_after=500) as server:
+        api = AsyncKisAPI(base_url=server.url, app_key="stub", app_secret="stub", account_no="5000000001")
+        async with KisRealtimeClient(api) as stream:
+            await stream.subscribe("005930")
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+from src.api.realtime import (
+    BOOK_ASK_PRICES,
+    BOOK_ASK_QUANTITIES,
+    BOOK_BID_PRICES,
+    BOOK_BID_QUANTITIES,
+    BOOK_DEPTH,
+    BOOK_TOTAL_ASK,
+    BOOK_TOTAL_BID,
+    SUBSCRIBE,
+    TR_ORDER_BOOK,
+    TR_PINGPONG,
+    TR_TRADE,
+    UNSUBSCRIBE,
+)
+from src.api.stub_server import _MarketData
+
+PATH_APPROVAL = "/oauth2/Approval"
+
+# 등록 응답 코드
+MSG_SUBSCRIBED = ("OPSP0000", "SUBSCRIBE SUCCESS")
+MSG_ALREADY_SUBSCRIBED = ("OPSP0002", "ALREADY IN SUBSCRIBE")
+MSG_UNSUBSCRIBED = ("OPSP0003", "UNSUBSCRIBE SUCCESS")
+MSG_MAX_SUBSCRIPTIONS = ("OPSP0008", "MAX SUBSCRIBE OVER")
+MSG_INVALID_APPROVAL = ("OPSP0011", "invalid approval : NOT FOUND")
+
+TRADE_FIELD_COUNT = 46  # 체결가 프레임 필드 수
+BOOK_FIELD_COUNT = 59  # 호가 프레임 필드 수
+MAX_SUBSCRIPTIONS = 41  # 세션당 최대 등록 수
+
+
+def _tick_size(price: int) -> int:
+    """호가 단위 (유가증권시장 기준)"""
+    for limit, size in ((2_000, 1), (5_000, 5), (20_000, 10), (50_000, 50), (200_000, 100), (500_000, 500)):
+        if price < limit:
+            return size
+    return 1_000
+
+
+class _SyntheticTape:
+    """종목별 가상 체결/호가 프레임 생성 (기준가는 스텁 서버 가상 시세의 최근 종가)"""
+
+    def __init__(self, seed: int = 0):
+        self._market = _MarketData()
+        self._rng = random.Random(seed)
+        self._state: Dict[str, Dict[str, int]] = {}
+
+    def _stock(self, code: str) -> Dict[str, int]:
+        state = self._state.get(code)
+        if state is None:
+            bars = self._market.bars(code)
+            close = bars[-1]["close"]
+            state = self._state[code] = {
+                "prev_close": close, "price": close, "open": close, "high": close, "low": close,
+                "cum_volume": 0, "cum_amount": 0, "seconds": 0,
+            }
+        return state
+
+    @staticmethod
+    def _clock(seconds: int) -> str:
+        seconds = 9 * 3600 + seconds % (6 * 3600 + 1800)  # 09:00:00 ~ 15:30:00
+        return f"{seconds // 3600:02d}{seconds // 60 % 60:02d}{seconds % 60:02d}"
+
+    def frame(self, tr_id: str, code: str) -> str:
+        state = self._stock(code)
+        state["seconds"] += 1
+        tick = _tick_size(state["price"])
+        if tr_id == TR_TRADE:
+            state["price"] = max(tick, state["price"] + tick * self._rng.choice((-1, 0, 0, 1)))
+            price = state["price"]
+            state["high"] = max(state["high"], price)
+            state["low"] = min(state["low"], price)
+            volume = self._rng.randint(1, 500)
+            state["cum_volume"] += volume
+            state["cum_amount"] += volume * price
+            change = price - state["prev_close"]
+            fields = ["0"] * TRADE_FIELD_COUNT
+            fields[:15] = [
+                code, self._clock(state["seconds"]), str(price),
+                "2" if change > 0 else ("5" if change < 0 else "3"), str(change),
+                f"{change / state['prev_close'] * 100:.2f}", str(price),
+                str(state["open"]), str(state["high"]), str(state["low"]),
+                str(price + tick), str(price), str(volume), str(state["cum_volume"]), str(state["cum_amount"]),
+            ]
+        else:
+            price = state["price"]
+            fields = ["0"] * BOOK_FIELD_COUNT
+            fields[0] = code
+            fields[1] = self._clock(state["seconds"])
+            for level in range(BOOK_DEPTH):
+                fields[BOOK_ASK_PRICES + level] = str(price + tick * (level + 1))
+                fields[BOOK_BID_PRICES + level] = str(max(tick, price - tick * level))
+                fields[BOOK_ASK_QUANTITIES + level] = str(self._rng.randint(1, 5000))
+                fields[BOOK_BID_QUANTITIES + level] = str(self._rng.randint(1, 5000))
+            fields[BOOK_TOTAL_ASK] = str(sum(int(fields[BOOK_ASK_QUANTITIES + k]) for k in range(BOOK_DEPTH)))
+            fields[BOOK_TOTAL_BID] = str(sum(int(fields[BOOK_BID_QUANTITIES + k]) for k in range(BOOK_DEPTH)))
+        return f"0|{tr_id}|001|{'^'.join(fields)}"
+
+
+class KisRealtimeReplayServer:
+    """KIS 실시간 시세 흉내 서버 (별도 스레드의 이벤트 루프에서 실행)"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        frames_path: Optional[str] = None,
+        interval: float = 0.01,
+        ping_interval: float = 10.0,
+        disconnect_after: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            frames_path: 재생할 프레임 파일 (한 줄에 프레임 하나, 생략 시 가상 시세 생성)
+            interval: 프레임 전송 간격 (초)
+            ping_interval: PINGPONG 전송 간격 (초, 0이면 보내지 않음)
+            disconnect_after: 연결당 이 수만큼 프레임을 보낸 뒤 연결을 끊음 (0이면 끊지 않음, 재접속 시험용)
+            seed: 가상 시세 난수 시드
+        """
+        self.interval = interval
+        self.ping_interval = ping_interval
+        self.disconnect_after = disconnect_after
+        self._frames: List[Tuple[str, str, str]] = []  # (tr_id, 종목코드, 프레임)
+        if frames_path:
+            with open(frames_path, encoding="utf-8") as f:
+                self._frames = [self._frame_key(line.rstrip("\n")) for line in f if line.strip()]
+        self._tape = _SyntheticTape(seed)
+
+        # 통계 (재접속/등록 시험 결과 확인용)
+        self.stats: Dict[str, int] = defaultdict(int)
+
+        self._approval_keys: Set[str] = set()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    @staticmethod
+    def _frame_key(frame: str) -> Tuple[str, str, str]:
+        _, tr_id, _, payload = frame.split("|", 3)
+        return tr_id, payload.split("^", 1)[0], frame
+
+    @property
+    def url(self) -> str:
+        """서버 주소 (API 클라이언트의 base_url로 사용, 접속키 발급)"""
+        host, port = self._sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_url(self) -> str:
+        """WebSocket 주소"""
+        return "ws" + self.url[len("http"):]
+
+    # 실행
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(PATH_APPROVAL, self._approval)
+        app.router.add_get("/{tail:.*}", self._websocket)
+        return app
+
+    async def _startup(self) -> None:
+        self._runner = web.AppRunner(self._app())
+        await self._runner.setup()
+        await web.SockSite(self._runner, self._sock).start()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._startup())
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            if self._runner is not None:
+                self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+    def start(self) -> "KisRealtimeReplayServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self._run, name="kis-realtime-replay", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+        self._sock.close()
+
+    def __enter__(self) -> "KisRealtimeReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 서버 실행 (명령행 실행용)"""
+        self._run()
+
+    # 요청 처리
+
+    async def _approval(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            body = {}
+        if not body.get("appkey") or not body.get("secretkey"):
+            return web.json_response({"error_description": "유효하지 않은 AppKey입니다.", "error_code": "EGW00103"}, status=403)
+        approval_key = str(uuid.uuid4())
+        self._approval_keys.add(approval_key)
+        self.stats["approval_keys"] += 1
+        return web.json_response({"approval_key": approval_key})
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats["connections"] += 1
+
+        subscriptions: Set[Tuple[str, str]] = set()
+        pusher = asyncio.create_task(self._push(ws, subscriptions))
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.TEXT:
+                    await self._on_message(ws, message.data, subscriptions)
+        finally:
+            pusher.cancel()
+        return ws
+
+    @staticmethod
+    def _reply(tr_id: str, tr_key: str, code_message: Tuple[str, str], ok: bool) -> str:
+        body: Dict[str, Any] = {"rt_cd": "0" if ok else "1", "msg_cd": code_message[0], "msg1": code_message[1]}
+        if ok:
+            body["output"] = {"iv": uuid.uuid4().hex[:16], "key": uuid.uuid4().hex}
+        return json.dumps({"header": {"tr_id": tr_id, "tr_key": tr_key, "encrypt": "N"}, "body": body})
+
+    async def _on_message(self, ws: web.WebSocketResponse, text: str, subscriptions: Set[Tuple[str, str]]) -> None:
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        header = message.get("header", {})
+        if header.get("tr_id") == TR_PINGPONG:
+            self.stats["pongs"] += 1
+            return
+
+        request = message.get("body", {}).get("input", {})
+        tr_id, tr_key = request.get("tr_id", ""), request.get("tr_key", "")
+        if header.get("approval_key") not in self._approval_keys:
+            await ws.send_str(self._reply(tr_id, tr_key, MSG_INVALID_APPROVAL, ok=False))
+            return
+
+        key = (tr_id, tr_key)
+        if header.get("tr_type") == UNSUBSCRIBE:
+            subscriptions.discard(key)
+            await ws.send_str(self._reply(tr_id, tr_key, MSG_UNSUBSCRIBED, ok=True))
+        elif key in subscriptions:
+            await ws.send_str(self._reply(tr_id, tr_key, MSG_ALREADY_SUBSCRIBED, ok=False))
+        elif len(subscriptions) >= MAX_SUBSCRIPTIONS:
+            await ws.send_str(self._reply(tr_id, tr_key, MSG_MAX_SUBSCRIPTIONS, ok=False))
+        elif header.get("tr_type") == SUBSCRIBE:
+            subscriptions.add(key)
+            self.stats["subscribes"] += 1
+            await ws.send_str(self._reply(tr_id, tr_key, MSG_SUBSCRIBED, ok=True))
+
+    def _next_frames(self, subscriptions: Set[Tuple[str, str]], position: int) -> Iterator[Tuple[int, str]]:
+        """등록된 종목의 다음 프레임 (기록 파일은 위치를 이어서 한 바퀴, 가상 시세는 종목별 1건씩)"""
+        if not self._frames:
+            for tr_id, code in sorted(subscriptions):
+                if tr_id in (TR_TRADE, TR_ORDER_BOOK):
+                    yield position, self._tape.frame(tr_id, code)
+            return
+        for offset in range(len(self._frames)):
+            index = (position + offset) % len(self._frames)
+            tr_id, code, frame = self._frames[index]
+            if (tr_id, code) in subscriptions:
+                yield index + 1, frame
+
+    async def _push(self, ws: web.WebSocketResponse, subscriptions: Set[Tuple[str, str]]) -> None:
+        sent = 0
+        position = 0
+        last_ping = time.monotonic()
+        while not ws.closed:
+            sent_this_round = False
+            for position, frame in self._next_frames(subscriptions, position):
+                if ws.closed:
+                    return
+                await ws.send_str(frame)
+                sent += 1
+                sent_this_round = True
+                self.stats["frames"] += 1
+                if self.disconnect_after and sent >= self.disconnect_after:
+                    self.stats["disconnects"] += 1
+                    await ws.close()
+                    return
+                if self.interval > 0:
+                    await asyncio.sleep(self.interval)
+                if self._frames:
+                    break  # 등록이 바뀌었을 수 있으므로 기록 파일은 한 건씩 다시 찾음
+            if self.ping_interval > 0 and time.monotonic() - last_ping >= self.ping_interval:
+                await ws.send_str(json.dumps({"header": {"tr_id": TR_PINGPONG, "datetime": time.strftime("%Y%m%d%H%M%S")}}))
+                last_ping = time.monotonic()
+            if not sent_this_round:
+                await asyncio.sleep(max(self.interval, 0.05))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="한국투자증권 실시간 시세 로컬 재생 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18081)
+    parser.add_argument("--frames", default=None, help="재생할 프레임 파일 (생략 시 가상 시세)")
+    parser.add_argument("--interval", type=float, default=0.01, help="프레임 전송 간격 (초)")
+    parser.add_argument("--ping-interval", type=float, default=10.0, help="PINGPONG 전송 간격 (초)")
+    parser.add_argument("--disconnect-after", type=int, default=0, help="연결당 프레임 수 도달 시 연결 끊기 (0: 끊지 않음)")
+    parser.add_argument("--seed", type=int, default=0, help="가상 시세 난수 시드")
+    args = parser.parse_args()
+
+    server = KisRealtimeReplayServer(
+        host=args.host,
+        port=args.port,
+        frames_path=args.frames,
+        interval=args.interval,
+        ping_interval=args.ping_interval,
+        disconnect_after=args.disconnect_after,
+        seed=args.seed,
+    )
+    print(f"KIS 실시간 재생 서버 실행 중: {server.ws_url} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
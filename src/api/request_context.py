@@ -0,0 +1,92 @@
+"""
+요청 공통 정보(컨텍스트) 모듈
+
+서버 주소, 앱키/앱시크릿, 계좌번호는 클라이언트를 만든 뒤 바뀌지 않으므로
+요청마다 모드를 확인하고 헤더를 새로 조립하는 대신 클라이언트 생성 시 한 번만 계산해 둡니다.
+RequestContext와 PreparedRequest는 불변이므로 여러 스레드/코루틴이 잠금 없이 함께 사용합니다.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """클라이언트(모드/앱키/계좌/서버)별 요청 공통 정보"""
+
+    __slots__ = (
+        "mode", "base_url", "auth_url", "app_key", "app_secret",
+        "account_no", "cano", "account_product_code", "header_template",
+    )
+
+    mode: str  # 거래 모드 (real, paper)
+    base_url: str  # 요청을 보낼 서버 주소 (지정한 주소 또는 모드별 공식 주소)
+    auth_url: str  # 토큰 발급 주소
+    app_key: str  # 앱키
+    app_secret: str  # 앱시크릿
+    account_no: str  # 계좌번호 10자리
+    cano: str  # 계좌번호 앞 8자리 (CANO)
+    account_product_code: str  # 계좌번호 뒤 2자리 (ACNT_PRDT_CD)
+    header_template: "MappingProxyType[str, str]"  # 토큰/tr_id를 제외한 요청 헤더 (읽기 전용)
+
+    @classmethod
+    def create(cls, mode: str, base_url: str, auth_url: str, app_key: str, app_secret: str, account_no: str) -> "RequestContext":
+        """
+        요청 공통 정보 생성
+
+        Args:
+            mode: 거래 모드 (real, paper)
+            base_url: 요청을 보낼 서버 주소
+            auth_url: 토큰 발급 주소
+            app_key: 앱키
+            app_secret: 앱시크릿
+            account_no: 계좌번호 10자리
+        """
+        return cls(
+            mode=mode,
+            base_url=base_url,
+            auth_url=auth_url,
+            app_key=app_key,
+            app_secret=app_secret,
+            account_no=account_no,
+            cano=account_no[:8],
+            account_product_code=account_no[8:],
+            header_template=MappingProxyType({
+                "Content-Type": "application/json",
+                "appKey": app_key,
+                "appSecret": app_secret,
+            }),
+        )
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}{endpoint}"
+
+    def headers(self, access_token: str, tr_id: str, tr_cont: str = "") -> Dict[str, str]:
+        """요청 헤더 (템플릿 사본에 토큰과 tr_id만 추가, tr_cont는 연속조회 요청에만 추가)"""
+        headers = self.header_template.copy()  # MappingProxyType.copy()는 원본 dict의 빠른 복사 사용
+        headers["authorization"] = f"Bearer {access_token}"
+        headers["tr_id"] = tr_id
+        if tr_cont:
+            headers["tr_cont"] = tr_cont
+        return headers
+
+
+@dataclass(frozen=True)
+class PreparedRequest:
+    """고정 값을 미리 채워 둔 요청 (엔드포인트, tr_id, 매번 같은 파라미터)"""
+
+    __slots__ = ("endpoint", "tr_id", "params")
+
+    endpoint: str  # API 엔드포인트
+    tr_id: str  # 거래 ID
+    params: "MappingProxyType[str, Any]"  # 요청마다 같은 파라미터 (읽기 전용)
+
+    @classmethod
+    def create(cls, endpoint: str, tr_id: str, params: Mapping[str, Any]) -> "PreparedRequest":
+        return cls(endpoint, tr_id, MappingProxyType(dict(params)))
+
+    def with_params(self, **values: Any) -> Dict[str, Any]:
+        """고정 파라미터 사본에 요청별 값을 채운 파라미터 (GET 파라미터 또는 POST 본문)"""
+        params = self.params.copy()
+        params.update(values)
+        return params
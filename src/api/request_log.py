@@ -0,0 +1,156 @@
+"""
+API 요청/응답 로깅 모듈
+
+요청마다 헤더와 응답 본문 전체를 f-string으로 만들어 기록하면 로그 레벨과 무관하게
+문자열 생성 비용이 들고, 앱시크릿/토큰 같은 민감 정보가 파일에 남습니다.
+이 모듈은 로그 레코드를 필요할 때만(lazy) 만들고, 민감 정보를 가리고,
+큰 본문은 잘라내거나 일부만 샘플링해서 기록합니다.
+"""
+import random
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+from loguru import logger
+
+from config.settings import (
+    KIS_REQUEST_LOG_LEVEL,
+    KIS_REQUEST_LOG_ENDPOINTS,
+    KIS_REQUEST_LOG_MAX_BODY,
+    KIS_REQUEST_LOG_SAMPLE_RATE,
+)
+
+# 상세 수준 (숫자가 클수록 자세히 기록)
+VERBOSITY_OFF = "off"  # 기록하지 않음 (오류는 기록)
+VERBOSITY_SUMMARY = "summary"  # 메서드, URL, tr_id, 상태 코드, 소요 시간
+VERBOSITY_HEADERS = "headers"  # + 요청 헤더/파라미터/본문, 응답 헤더 (민감 정보 제외)
+VERBOSITY_FULL = "full"  # + 응답 본문 (잘라내기/샘플링 적용)
+_VERBOSITY_ORDER = {VERBOSITY_OFF: 0, VERBOSITY_SUMMARY: 1, VERBOSITY_HEADERS: 2, VERBOSITY_FULL: 3}
+
+# 기록하지 않을 키 (대소문자 구분 없음)
+SENSITIVE_KEYS = frozenset({
+    "appkey",
+    "appsecret",
+    "secretkey",
+    "authorization",
+    "access_token",
+    "approval_key",
+})
+REDACTED = "***"
+
+
+def redact(values: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """민감한 키의 값을 가린 사본 반환"""
+    if not values:
+        return {}
+    return {
+        key: REDACTED if key.lower() in SENSITIVE_KEYS else value
+        for key, value in values.items()
+    }
+
+
+def truncate(text: str, limit: int = KIS_REQUEST_LOG_MAX_BODY) -> str:
+    """긴 문자열을 limit 글자로 자르고 잘린 길이를 표시"""
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit} chars)"
+
+
+def _parse_endpoint_levels(spec: str) -> Dict[str, str]:
+    """'inquire-price=off,order-cash=full' 형식의 설정을 딕셔너리로 변환"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = (part.strip() for part in item.split("=", 1))
+        if level in _VERBOSITY_ORDER:
+            levels[name] = level
+    return levels
+
+
+class RequestLogger:
+    """구조화된 API 요청 로그 기록기"""
+
+    def __init__(
+        self,
+        level: str = KIS_REQUEST_LOG_LEVEL,
+        endpoint_levels: Optional[Dict[str, str]] = None,
+        max_body_chars: int = KIS_REQUEST_LOG_MAX_BODY,
+        body_sample_rate: float = KIS_REQUEST_LOG_SAMPLE_RATE,
+    ):
+        """
+        Args:
+            level: 기본 상세 수준 (off, summary, headers, full)
+            endpoint_levels: 엔드포인트(경로 마지막 부분) 또는 tr_id별 상세 수준
+            max_body_chars: 본문 최대 기록 길이 (0이면 자르지 않음)
+            body_sample_rate: full 수준에서 응답 본문을 기록할 비율 (0.0 ~ 1.0)
+        """
+        self.level = level
+        self.endpoint_levels = (
+            endpoint_levels if endpoint_levels is not None
+            else _parse_endpoint_levels(KIS_REQUEST_LOG_ENDPOINTS)
+        )
+        self.max_body_chars = max_body_chars
+        self.body_sample_rate = body_sample_rate
+
+    def verbosity(self, endpoint: str, tr_id: str) -> int:
+        """요청에 적용할 상세 수준"""
+        level = self.endpoint_levels.get(tr_id) or self.endpoint_levels.get(endpoint.rsplit("/", 1)[-1])
+        return _VERBOSITY_ORDER[level or self.level]
+
+    def log_exchange(
+        self,
+        method: str,
+        endpoint: str,
+        tr_id: str,
+        status_code: int,
+        elapsed: float,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Optional[Mapping[str, Any]] = None,
+        response_headers: Optional[Mapping[str, str]] = None,
+        body: Union[str, Callable[[], str], None] = None,
+    ) -> None:
+        """
+        요청/응답 한 쌍을 기록 (오류 응답은 상세 수준과 관계없이 본문까지 기록)
+
+        Args:
+            method: HTTP 메서드
+            endpoint: API 엔드포인트
+            tr_id: 거래 ID
+            status_code: 응답 상태 코드
+            elapsed: 소요 시간 (초)
+            headers: 요청 헤더
+            params: URL 파라미터
+            data: 요청 본문
+            response_headers: 응답 헤더
+            body: 응답 본문 (또는 본문을 반환하는 함수, 기록할 때만 호출)
+        """
+        failed = status_code != 200
+        verbosity = _VERBOSITY_ORDER[VERBOSITY_FULL] if failed else self.verbosity(endpoint, tr_id)
+        if verbosity == 0:
+            return
+
+        # lazy=True: DEBUG를 받는 sink가 없으면 아래 람다는 실행되지 않음
+        log = logger.opt(lazy=True)
+        log.debug(
+            "{} {} tr_id={} status={} elapsed={:.3f}s",
+            lambda: method, lambda: endpoint, lambda: tr_id, lambda: status_code, lambda: elapsed,
+        )
+        if verbosity >= _VERBOSITY_ORDER[VERBOSITY_HEADERS]:
+            log.debug(
+                "Request headers={} params={} data={} | Response headers={}",
+                lambda: redact(headers), lambda: params or {}, lambda: data or {},
+                lambda: redact(response_headers),
+            )
+        if verbosity >= _VERBOSITY_ORDER[VERBOSITY_FULL] and body is not None:
+            if failed or self.body_sample_rate >= 1.0 or random.random() < self.body_sample_rate:
+                log.debug(
+                    "Response body={}",
+                    lambda: truncate(body() if callable(body) else body, self.max_body_chars),
+                )
+
+    def log_failure(self, method: str, endpoint: str, tr_id: str, error: BaseException) -> None:
+        """응답을 받지 못한 요청 기록"""
+        logger.opt(lazy=True).debug(
+            "{} {} tr_id={} failed: {}",
+            lambda: method, lambda: endpoint, lambda: tr_id, lambda: repr(error),
+        )
@@ -0,0 +1,105 @@
+"""
+API 요청 재시도 정책 모듈
+
+KIS 응답 코드(msg_cd)와 HTTP/네트워크 오류를 재시도 가능 여부로 분류하고,
+최대값이 있는 지수 백오프 + 지터로 재시도 간격을 정합니다.
+서버가 처리했을 수도 있는 주문(POST)은 다시 보내지 않습니다.
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+
+from config.settings import KIS_RETRY_MAX_ATTEMPTS, KIS_RETRY_BASE_DELAY, KIS_RETRY_MAX_DELAY
+
+# 오류 분류 결과
+REJECTED = "rejected"  # 서버가 처리하지 않고 거절 (호출 한도 초과, 연결 실패) -> 모든 요청 재시도 가능
+RENEW_TOKEN = "renew_token"  # 토큰 만료/무효로 거절 -> 토큰 갱신 후 모든 요청 재시도 가능
+TRANSIENT = "transient"  # 일시적 오류지만 서버가 처리했을 수 있음 -> 멱등 요청(GET)만 재시도
+
+# KIS 게이트웨이 응답 코드
+MSG_RATE_LIMITED = "EGW00201"  # 초당 거래건수를 초과하였습니다
+MSG_TOKEN_EXPIRED = "EGW00123"  # 기간이 만료된 token 입니다
+MSG_TOKEN_INVALID = "EGW00121"  # 유효하지 않은 token 입니다
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """재시도 정책"""
+
+    max_attempts: int = KIS_RETRY_MAX_ATTEMPTS  # 최초 요청을 포함한 최대 시도 횟수
+    base_delay: float = KIS_RETRY_BASE_DELAY  # 첫 재시도 대기 시간 (초)
+    max_delay: float = KIS_RETRY_MAX_DELAY  # 재시도 대기 시간 상한 (초)
+    jitter: float = 0.5  # 대기 시간을 무작위로 줄이는 비율 (0: 고정, 1: 0 ~ 대기 시간 전체)
+    retryable_msg_codes: FrozenSet[str] = frozenset({MSG_RATE_LIMITED})
+    token_msg_codes: FrozenSet[str] = frozenset({MSG_TOKEN_EXPIRED, MSG_TOKEN_INVALID})
+    retryable_status_codes: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    idempotent_methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def classify_response(self, status_code: int, result: Dict) -> Optional[str]:
+        """
+        응답 분류
+
+        Args:
+            status_code: HTTP 상태 코드
+            result: 응답 본문
+
+        Returns:
+            Optional[str]: 재시도 분류 (REJECTED, RENEW_TOKEN, TRANSIENT), 재시도 대상이 아니면 None
+        """
+        msg_cd = result.get("msg_cd")
+        if msg_cd in self.token_msg_codes:
+            return RENEW_TOKEN
+        if msg_cd in self.retryable_msg_codes:
+            return REJECTED
+        if result.get("rt_cd", "0") == "0" and status_code == 200:
+            return None
+        if status_code in self.retryable_status_codes:
+            return TRANSIENT
+        return None
+
+    def classify_transport_error(self, connected: bool) -> str:
+        """
+        네트워크 오류 분류
+
+        Args:
+            connected: 서버와 연결된 뒤 발생한 오류인지 여부 (요청이 전달되었을 수 있음)
+
+        Returns:
+            str: 재시도 분류
+        """
+        return TRANSIENT if connected else REJECTED
+
+    def can_retry(self, category: Optional[str], method: str, attempt: int) -> bool:
+        """
+        재시도 여부 판단
+
+        Args:
+            category: 오류 분류
+            method: HTTP 메서드
+            attempt: 지금까지 실패한 시도 횟수 (1부터)
+
+        Returns:
+            bool: 재시도 여부
+        """
+        if category is None or attempt >= self.max_attempts:
+            return False
+        if category == TRANSIENT:
+            return method.upper() in self.idempotent_methods
+        return True
+
+    def delay(self, attempt: int) -> float:
+        """
+        재시도 전 대기 시간 (최대값이 있는 지수 백오프 + 지터)
+
+        Args:
+            attempt: 지금까지 실패한 시도 횟수 (1부터)
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (1 - self.jitter * random.random())
+
+
+# 재시도하지 않는 정책 (테스트/수동 호출용)
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,276 @@
+"""
+우선순위 요청 스케줄러 모듈
+
+시세/과거 시세 조회와 주문이 같은 호출 한도를 나눠 쓰므로, 토큰 버킷에 먼저 예약한 순서대로 보내면
+대량의 과거 시세 조회 뒤에 급한 주문이 몇 초씩 밀릴 수 있습니다.
+RequestScheduler는 호출 제한기 앞에서 대기열을 관리해 호출 권한이 생길 때마다 다음 요청을 고릅니다.
+
+- 주문은 항상 먼저 보냅니다. (대기 중인 다른 요청을 앞지름)
+- 계좌 조회, 시세 조회, 과거 시세 조회는 가중치에 따라 번갈아 보냅니다. (한 분류가 한도를 독차지하지 않음)
+- 대기열이 비어 있고 호출 권한이 남아 있으면 대기열을 거치지 않고 바로 보냅니다.
+
+분류별 대기 중인 요청 수는 ApiMetrics의 queue_depth로 내보냅니다.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from src.api.metrics import ApiMetrics, get_metrics
+from src.api.rate_limiter import ORDER_TR_IDS, RateLimiter
+
+# 요청 분류 (숫자가 작을수록 우선)
+PRIORITY_ORDER = 0  # 현금 주문 (항상 먼저)
+PRIORITY_ACCOUNT = 1  # 잔고/체결 조회
+PRIORITY_QUOTE = 2  # 현재가 조회
+PRIORITY_HISTORY = 3  # 과거 시세 등 대량 조회
+
+PRIORITY_NAMES: Dict[int, str] = {
+    PRIORITY_ORDER: "order",
+    PRIORITY_ACCOUNT: "account",
+    PRIORITY_QUOTE: "quote",
+    PRIORITY_HISTORY: "history",
+}
+
+# 주문 외 분류의 가중치 (모두 대기 중이면 가중치 비율대로 호출 권한을 나눔)
+DEFAULT_WEIGHTS: Dict[int, int] = {
+    PRIORITY_ACCOUNT: 1,
+    PRIORITY_QUOTE: 1,
+    PRIORITY_HISTORY: 1,
+}
+
+# tr_id별 분류 (등록되지 않은 tr_id는 시세 조회로 취급)
+TR_ID_PRIORITIES: Dict[str, int] = {
+    **{tr_id: PRIORITY_ORDER for tr_ids in ORDER_TR_IDS.values() for tr_id in tr_ids},
+    "TTTC8434R": PRIORITY_ACCOUNT,  # 잔고 조회
+    "VTTC8434R": PRIORITY_ACCOUNT,
+    "TTTC8001R": PRIORITY_ACCOUNT,  # 일별 주문 체결 조회
+    "VTTC8001R": PRIORITY_ACCOUNT,
+    "FHKST01010100": PRIORITY_QUOTE,  # 현재가 조회
+    "FHKST03010100": PRIORITY_HISTORY,  # 일별 시세 조회
+    "FHKST03010200": PRIORITY_HISTORY,  # 당일 분봉 조회
+}
+
+# 호출 권한을 얻지 못했을 때 다시 확인하기까지의 최소 대기 시간 (초, 바쁜 대기 방지)
+MIN_WAIT = 0.001
+
+
+class _Ticket:
+    """대기 중인 요청 1건"""
+
+    __slots__ = ("tr_id", "priority")
+
+    def __init__(self, tr_id: str, priority: int):
+        self.tr_id = tr_id
+        self.priority = priority
+
+
+class RequestScheduler:
+    """호출 제한기 앞의 우선순위 대기열 (스레드/asyncio 모두에서 사용 가능)"""
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        weights: Optional[Dict[int, int]] = None,
+        metrics: Optional[ApiMetrics] = None,
+    ):
+        """
+        Args:
+            rate_limiter: 호출 권한을 받을 호출 제한기
+            weights: 주문 외 분류별 가중치 (생략 시 DEFAULT_WEIGHTS)
+            metrics: 대기열 길이를 기록할 계측 인스턴스 (생략 시 프로세스 공유 인스턴스)
+
+        Raises:
+            ValueError: 주문 외 분류가 아닌 키가 있거나 가중치가 1보다 작은 경우
+        """
+        unknown = set(weights or {}) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"가중치는 주문 외 분류({sorted(DEFAULT_WEIGHTS)})에만 지정할 수 있습니다: {sorted(unknown)}")
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        if any(weight < 1 for weight in weights.values()):
+            raise ValueError("가중치는 1 이상이어야 합니다.")
+        self.rate_limiter = rate_limiter
+        self.weights = weights
+        self.metrics = metrics or get_metrics()
+        self._queues: Dict[int, Deque[_Ticket]] = {priority: deque() for priority in PRIORITY_NAMES}
+        self._credits: Dict[int, int] = {priority: 0 for priority in weights}  # 분류별 누적 몫 (가중 라운드 로빈)
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    @staticmethod
+    def classify(tr_id: str) -> int:
+        """tr_id의 요청 분류"""
+        return TR_ID_PRIORITIES.get(tr_id, PRIORITY_QUOTE)
+
+    def depths(self) -> Dict[str, int]:
+        """분류별 대기 중인 요청 수"""
+        with self._lock:
+            return {PRIORITY_NAMES[priority]: len(queue) for priority, queue in self._queues.items()}
+
+    def wait_time(self, tr_id: str = "") -> float:
+        """지금 요청하면 기다려야 하는 예상 시간 (초, 같거나 높은 우선순위의 대기 요청 포함)"""
+        priority = self.classify(tr_id)
+        with self._lock:
+            ahead = sum(len(queue) for queue_priority, queue in self._queues.items() if queue_priority <= priority)
+        return self.rate_limiter.wait_time(tr_id) + ahead / self.rate_limiter.rate
+
+    # 대기열 (모두 self._lock을 잡은 상태에서 호출)
+
+    def _enqueue(self, tr_id: str) -> _Ticket:
+        ticket = _Ticket(tr_id, self.classify(tr_id))
+        queue = self._queues[ticket.priority]
+        queue.append(ticket)
+        self._waiting += 1
+        self.metrics.set_queue_depth(PRIORITY_NAMES[ticket.priority], len(queue))
+        return ticket
+
+    def _remove(self, ticket: _Ticket) -> None:
+        queue = self._queues[ticket.priority]
+        queue.remove(ticket)
+        self._waiting -= 1
+        if not queue and ticket.priority in self._credits:
+            self._credits[ticket.priority] = 0  # 쉬고 있던 분류가 몫을 쌓아 두지 않도록
+        self.metrics.set_queue_depth(PRIORITY_NAMES[ticket.priority], len(queue))
+        self._cond.notify_all()  # 다음 차례가 된 요청이 호출 권한을 확인하도록
+
+    def _head(self) -> Optional[_Ticket]:
+        """다음에 보낼 요청 (주문 우선, 나머지는 누적 몫 + 가중치가 가장 큰 분류)"""
+        orders = self._queues[PRIORITY_ORDER]
+        if orders:
+            return orders[0]
+        best = None
+        best_score = 0
+        for priority, weight in self.weights.items():
+            if self._queues[priority]:
+                score = self._credits[priority] + weight
+                if best is None or score > best_score:
+                    best, best_score = priority, score
+        return self._queues[best][0] if best is not None else None
+
+    def _dispatch(self, ticket: _Ticket) -> None:
+        """호출 권한을 받은 요청을 대기열에서 빼고 분류별 몫 갱신"""
+        if ticket.priority in self._credits:
+            active = [priority for priority in self.weights if self._queues[priority]]
+            for priority in active:
+                self._credits[priority] += self.weights[priority]
+            self._credits[ticket.priority] -= sum(self.weights[priority] for priority in active)
+        self._remove(ticket)
+
+    def _try_dispatch(self, ticket: _Ticket, expires_at: Optional[float]) -> Optional[float]:
+        """
+        차례가 된 요청이면 호출 권한 획득 시도
+
+        Returns:
+            Optional[float]: 호출 권한을 얻었으면 None, 아니면 다시 확인하기까지 기다릴 시간 (초, 차례가 아니면 0)
+
+        Raises:
+            TimeoutError: 마감 전에 호출 권한을 얻을 수 없는 경우
+        """
+        now = time.monotonic()
+        if self._head() is not ticket:
+            wait = 0.0
+        else:
+            wait = self.rate_limiter.wait_time(ticket.tr_id)
+            if wait <= 0 and self.rate_limiter.try_acquire(ticket.tr_id):
+                self._dispatch(ticket)
+                return None
+            wait = max(wait, MIN_WAIT)
+        if expires_at is not None and (now >= expires_at or now + wait > expires_at):
+            raise TimeoutError(f"{expires_at - now:.2f}초 안에 API 호출 권한을 얻을 수 없습니다. (tr_id: {ticket.tr_id})")
+        return wait
+
+    # 호출 권한 획득
+
+    def acquire(self, tr_id: str = "", timeout: Optional[float] = None) -> float:
+        """
+        호출 권한 획득 (차례가 올 때까지 현재 스레드에서 대기)
+
+        Args:
+            tr_id: 거래 ID (요청 분류 기준)
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            float: 실제 대기한 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 호출 권한을 얻을 수 없는 경우
+        """
+        started_at = time.monotonic()
+        expires_at = None if timeout is None else started_at + timeout
+        with self._cond:
+            if not self._waiting and self.rate_limiter.try_acquire(tr_id):
+                return 0.0
+            ticket = self._enqueue(tr_id)
+            try:
+                while True:
+                    wait = self._try_dispatch(ticket, expires_at)
+                    if wait is None:
+                        break
+                    if wait == 0:
+                        # 차례가 아니면 앞 요청이 나갈 때까지 (마감이 있으면 마감까지) 대기
+                        wait = None if expires_at is None else expires_at - time.monotonic()
+                    self._cond.wait(wait)
+            except BaseException:
+                self._remove(ticket)
+                raise
+        return time.monotonic() - started_at
+
+    async def acquire_async(self, tr_id: str = "", timeout: Optional[float] = None) -> float:
+        """
+        호출 권한 획득 (asyncio 버전, 이벤트 루프를 막지 않음)
+
+        차례가 아닌 동안에는 호출 제한기에 다음 권한이 생길 때까지 잠들었다가 다시 확인합니다.
+
+        Args:
+            tr_id: 거래 ID (요청 분류 기준)
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            float: 실제 대기한 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 호출 권한을 얻을 수 없는 경우
+        """
+        started_at = time.monotonic()
+        expires_at = None if timeout is None else started_at + timeout
+        with self._lock:
+            if not self._waiting and self.rate_limiter.try_acquire(tr_id):
+                return 0.0
+            ticket = self._enqueue(tr_id)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_dispatch(ticket, expires_at)
+                if wait is None:
+                    break
+                await asyncio.sleep(max(wait, self.rate_limiter.wait_time(tr_id), MIN_WAIT))
+        except BaseException:
+            with self._lock:
+                self._remove(ticket)
+            raise
+        return time.monotonic() - started_at
+
+
+# 호출 제한기별 공유 인스턴스 (같은 한도를 쓰는 클라이언트가 하나의 대기열을 나눠 씀)
+_schedulers: "weakref.WeakKeyDictionary[RateLimiter, RequestScheduler]" = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(rate_limiter: RateLimiter) -> RequestScheduler:
+    """
+    호출 제한기에 해당하는 공유 스케줄러 반환
+
+    Args:
+        rate_limiter: 호출 제한기
+
+    Returns:
+        RequestScheduler: 공유 스케줄러
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(rate_limiter)
+        if scheduler is None:
+            scheduler = _schedulers[rate_limiter] = RequestScheduler(rate_limiter)
+        return scheduler
@@ -0,0 +1,720 @@
+"""
+한국투자증권 API 로컬 스텁 서버
+
+실제 키나 네트워크 없이 클라이언트, 호출 제한기, 자동 주문을 실행/부하 테스트하기 위한
+로컬 HTTP 서버입니다. 토큰 발급, 현재가, 일별 시세, 당일 분봉, 잔고, 현금 주문을 실제와 같은 응답 형식으로
+흉내 내며, 응답 지연, 호출 한도 초과(EGW00201), 토큰 만료(EGW00123)를 설정할 수 있습니다.
+주문 체결 조회는 주문 후 fill_delay초에 걸쳐 나눠 체결된 것처럼 보여 줍니다. (잔고에는 주문 즉시 반영)
+
+실행 예:
+    python -m src.api.stub_server --port 18080 --latency 0.05 --rate-limit 20 --seed seed.json
+    KIS_BASE_URL=http://127.0.0.1:18080 python -m src.backtest.run_backtest  # 앱키/계좌번호는 아무 값이나 설정
+
+코드에서 사용:
+    with KisStubServer(latency=0.02) as server:
+        api = KisAPI(base_url=server.url, app_key="stub", app_secret="stub", account_no="5000000001")
+
+시드 파일(JSON) 형식 (모든 항목 선택, 없는 종목은 종목코드로 정해지는 가상 시세 사용):
+    {
+        "quotes": {"379800": {"stck_prpr": "17000"}},              # 현재가 응답 output 덮어쓰기
+        "daily": {"379800": "379800.csv"},                         # date,open,high,low,close,volume[,amount] CSV
+        "balance": {"cash": 10000000, "holdings": {"379800": {"quantity": 10, "avg_price": 15000}}}
+    }
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# 응답 코드 (실제 게이트웨이와 같은 코드/메시지 사용)
+MSG_RATE_LIMITED = ("EGW00201", "초당 거래건수를 초과하였습니다.")
+MSG_TOKEN_EXPIRED = ("EGW00123", "기간이 만료된 token 입니다.")
+MSG_TOKEN_INVALID = ("EGW00121", "유효하지 않은 token 입니다.")
+MSG_OK = ("MCA00000", "정상처리 되었습니다.")
+MSG_ORDER_OK = ("APBK0013", "주문 전송 완료 되었습니다.")
+MSG_ORDER_NO_CASH = ("APBK0952", "주문가능금액을 초과 했습니다")
+MSG_ORDER_NO_STOCK = ("APBK0400", "주문 가능한 수량을 초과했습니다.")
+
+# 가상 시세 생성 시작일
+HISTORY_START = date(2000, 1, 3)
+
+PATH_TOKEN = "/oauth2/tokenP"
+PATH_PRICE = "/uapi/domestic-stock/v1/quotations/inquire-price"
+PATH_DAILY = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+PATH_DAILY_CHART = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+PATH_MINUTE_CHART = "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+PATH_BALANCE = "/uapi/domestic-stock/v1/trading/inquire-balance"
+PATH_ORDER = "/uapi/domestic-stock/v1/trading/order-cash"
+PATH_DAILY_CCLD = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+
+DAILY_PAGE_SIZE = 100  # 일별 시세 1회 최대 응답 건수
+MINUTE_PAGE_SIZE = 30  # 분봉 1회 최대 응답 건수
+BALANCE_PAGE_SIZE = 50  # 잔고 보유 종목 1회 최대 응답 건수 (넘으면 연속조회)
+CCLD_PAGE_SIZE = 100  # 주문 체결 조회 1회 최대 응답 건수 (넘으면 연속조회)
+
+
+class _MarketData:
+    """종목별 일별 시세 (시드 파일 또는 종목코드로 정해지는 가상 시세)"""
+
+    def __init__(self, seed: Optional[Dict[str, Any]] = None, seed_dir: str = "."):
+        seed = seed or {}
+        self.quote_overrides: Dict[str, Dict[str, str]] = seed.get("quotes", {})
+        self._bars: Dict[str, List[Dict[str, Any]]] = {}
+        self._minute_bars: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        for code, source in seed.get("daily", {}).items():
+            if isinstance(source, str):
+                source = self._read_csv(os.path.join(seed_dir, source))
+            self._bars[code] = sorted(source, key=lambda bar: bar["date"])
+
+    @staticmethod
+    def _read_csv(path: str) -> List[Dict[str, Any]]:
+        with open(path, newline="", encoding="utf-8") as f:
+            return [
+                {
+                    "date": row["date"].replace("-", ""),
+                    "open": int(float(row["open"])),
+                    "high": int(float(row["high"])),
+                    "low": int(float(row["low"])),
+                    "close": int(float(row["close"])),
+                    "volume": int(float(row["volume"])),
+                    "amount": int(float(row.get("amount") or 0)),
+                }
+                for row in csv.DictReader(f)
+            ]
+
+    @staticmethod
+    def _generate(code: str) -> List[Dict[str, Any]]:
+        """종목코드를 시드로 한 평일 랜덤워크 시세 (같은 종목은 항상 같은 시세)"""
+        rng = random.Random(code)
+        base = rng.randint(50, 1000) * 100
+        price = base
+        bars = []
+        day = HISTORY_START
+        today = date.today()
+        while day <= today:
+            if day.weekday() < 5:
+                open_price = price
+                # 기준가 쪽으로 약하게 되돌아가는 랜덤워크 (장기간 생성해도 가격대가 유지됨)
+                drift = 0.002 * math.log(base / price)
+                close = max(100, int(price * math.exp(drift + rng.gauss(0, 0.015))) // 5 * 5)
+                high = max(open_price, close) + rng.randint(0, 20) * 5
+                low = max(5, min(open_price, close) - rng.randint(0, 20) * 5)
+                volume = rng.randint(10_000, 2_000_000)
+                bars.append({
+                    "date": day.strftime("%Y%m%d"),
+                    "open": open_price,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": volume,
+                    "amount": volume * close,
+                })
+                price = close
+            day += timedelta(days=1)
+        return bars
+
+    def bars(self, code: str) -> List[Dict[str, Any]]:
+        """일별 시세 (오래된 일자순)"""
+        with self._lock:
+            if code not in self._bars:
+                self._bars[code] = self._generate(code)
+            return self._bars[code]
+
+    def minute_bars(self, code: str) -> List[Dict[str, Any]]:
+        """마지막 일별 시세의 장중(09:01~15:30) 분봉 (오래된 시각순, 시가에서 시작해 종가로 끝남)"""
+        with self._lock:
+            cached = self._minute_bars.get(code)
+        if cached is not None:
+            return cached
+        last = self.bars(code)[-1]
+        rng = random.Random(f"{code}:{last['date']}")
+        count = 390
+        bars = []
+        price = last["open"]
+        minute = datetime.strptime("0900", "%H%M")
+        for i in range(count):
+            minute += timedelta(minutes=1)
+            # 남은 분 수만큼 종가 쪽으로 당기는 랜덤워크 (마지막 봉의 종가가 일별 종가와 같음)
+            remaining = count - i
+            close = price + (last["close"] - price) / remaining + rng.gauss(0, price * 0.001)
+            close = last["close"] if remaining == 1 else max(5, int(close) // 5 * 5)
+            volume = max(1, last["volume"] // count + rng.randint(-50, 50))
+            bars.append({
+                "time": minute.strftime("%H%M%S"),
+                "open": price,
+                "high": max(price, close) + rng.randint(0, 2) * 5,
+                "low": max(5, min(price, close) - rng.randint(0, 2) * 5),
+                "close": close,
+                "volume": volume,
+            })
+            price = close
+        with self._lock:
+            return self._minute_bars.setdefault(code, bars)
+
+    def quote_output(self, code: str) -> Dict[str, str]:
+        """현재가 응답 output (가장 최근 일별 시세 기준)"""
+        bars = self.bars(code)
+        last = bars[-1]
+        prev_close = bars[-2]["close"] if len(bars) > 1 else last["open"]
+        change = last["close"] - prev_close
+        output = {
+            "iscd_stat_cls_code": "55",
+            "rprs_mrkt_kor_name": "KOSPI200",
+            "stck_prpr": str(last["close"]),
+            "prdy_vrss": str(change),
+            "prdy_vrss_sign": "2" if change > 0 else ("5" if change < 0 else "3"),
+            "prdy_ctrt": f"{change / prev_close * 100:.2f}" if prev_close else "0.00",
+            "acml_vol": str(last["volume"]),
+            "acml_tr_pbmn": str(last["amount"]),
+            "stck_oprc": str(last["open"]),
+            "stck_hgpr": str(last["high"]),
+            "stck_lwpr": str(last["low"]),
+            "stck_mxpr": str(int(prev_close * 1.3)),
+            "stck_llam": str(int(prev_close * 0.7)),
+            "stck_sdpr": str(prev_close),
+        }
+        output.update(self.quote_overrides.get(code, {}))
+        return output
+
+
+class KisStubServer:
+    """KIS 게이트웨이 흉내 서버 (별도 스레드에서 실행)"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        rate_limit_error_rate: float = 0.0,
+        token_ttl: int = 86400,
+        token_expiry_rate: float = 0.0,
+        seed_path: Optional[str] = None,
+        cash: int = 10_000_000,
+        fill_delay: float = 0.0,
+    ):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            latency: 기본 응답 지연 (초)
+            latency_jitter: 응답 지연에 더할 무작위 시간의 최대값 (초)
+            rate_limit: 앱키별 초당 허용 호출 수 (0이면 제한 없음, 초과 시 EGW00201)
+            rate_limit_error_rate: 한도와 무관하게 EGW00201을 돌려줄 확률 (0.0 ~ 1.0)
+            token_ttl: 발급 토큰 유효시간 (초, 지나면 EGW00123)
+            token_expiry_rate: 유효한 토큰에도 EGW00123을 돌려줄 확률 (0.0 ~ 1.0)
+            seed_path: 시드 JSON 파일 경로
+            cash: 시드 파일에 잔고가 없을 때의 초기 예수금 (원)
+            fill_delay: 주문이 전량 체결되기까지 걸리는 시간 (초, 그 전에는 경과 시간만큼 일부 체결로 조회됨)
+        """
+        seed: Dict[str, Any] = {}
+        seed_dir = "."
+        if seed_path:
+            with open(seed_path, encoding="utf-8") as f:
+                seed = json.load(f)
+            seed_dir = os.path.dirname(os.path.abspath(seed_path))
+
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_limit = rate_limit
+        self.rate_limit_error_rate = rate_limit_error_rate
+        self.token_ttl = token_ttl
+        self.token_expiry_rate = token_expiry_rate
+        self.fill_delay = fill_delay
+        self.market = _MarketData(seed, seed_dir)
+
+        balance = seed.get("balance", {})
+        self.cash: int = int(balance.get("cash", cash))
+        self.holdings: Dict[str, Dict[str, float]] = {
+            code: {"quantity": int(item["quantity"]), "avg_price": float(item["avg_price"])}
+            for code, item in balance.get("holdings", {}).items()
+        }
+        self.orders: List[Dict[str, Any]] = []
+
+        # 통계 (부하 테스트 결과 확인용)
+        self.stats: Dict[str, int] = defaultdict(int)
+
+        self._tokens: Dict[str, float] = {}  # 토큰 -> 만료 시각 (time.time())
+        self._calls: Dict[str, Deque[float]] = defaultdict(deque)  # 앱키 -> 최근 1초 호출 시각
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """서버 주소 (KisAPI의 base_url로 사용)"""
+        host, port = self._httpd.server_address[:2]
+        if isinstance(host, bytes):  # 타입 정의상 bytes일 수 있음 (AF_INET 서버는 항상 str)
+            host = host.decode("ascii")
+        return f"http://{host}:{port}"
+
+    def start(self) -> "KisStubServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="kis-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "KisStubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 서버 실행 (명령행 실행용)"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def expire_tokens(self) -> None:
+        """발급한 토큰을 모두 만료시킴 (토큰 갱신 경로 테스트용)"""
+        with self._lock:
+            for token in self._tokens:
+                self._tokens[token] = 0.0
+
+    # 요청 처리
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (클라이언트 커넥션 풀 재사용)
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @staticmethod
+    def _send(
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        body: Dict[str, Any],
+        tr_id: str = "",
+        tr_cont: str = "",
+    ) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(payload)))
+        if tr_id:
+            handler.send_header("tr_id", tr_id)
+            handler.send_header("tr_cont", tr_cont)
+            handler.send_header("gt_uid", uuid.uuid4().hex)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    @staticmethod
+    def _error(code_message: Tuple[str, str]) -> Dict[str, str]:
+        return {"rt_cd": "1", "msg_cd": code_message[0], "msg1": code_message[1]}
+
+    @staticmethod
+    def _ok(code_message: Tuple[str, str] = MSG_OK, **outputs: Any) -> Dict[str, Any]:
+        return {"rt_cd": "0", "msg_cd": code_message[0], "msg1": code_message[1], **outputs}
+
+    def _delay(self) -> None:
+        wait = self.latency + (random.uniform(0, self.latency_jitter) if self.latency_jitter > 0 else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _rate_limited(self, app_key: str) -> bool:
+        """초당 호출 한도 초과 여부 (최근 1초 구간 기준)"""
+        if self.rate_limit_error_rate > 0 and random.random() < self.rate_limit_error_rate:
+            return True
+        if self.rate_limit <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls[app_key]
+            while calls and now - calls[0] >= 1.0:
+                calls.popleft()
+            if len(calls) >= self.rate_limit:
+                return True
+            calls.append(now)
+            return False
+
+    def _token_error(self, authorization: str) -> Optional[Tuple[str, str]]:
+        """토큰 검증 (문제가 없으면 None)"""
+        token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else ""
+        with self._lock:
+            expires_at = self._tokens.get(token)
+        if expires_at is None:
+            return MSG_TOKEN_INVALID
+        if time.time() >= expires_at:
+            return MSG_TOKEN_EXPIRED
+        if self.token_expiry_rate > 0 and random.random() < self.token_expiry_rate:
+            return MSG_TOKEN_EXPIRED
+        return None
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        parsed = urlparse(handler.path)
+        path = parsed.path
+        query = {key: values[0] for key, values in parse_qs(parsed.query, keep_blank_values=True).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(handler.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+        tr_id = handler.headers.get("tr_id", "")
+
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[path] += 1
+        self._delay()
+
+        if path == PATH_TOKEN and method == "POST":
+            self._send(handler, *self._issue_token(body))
+            return
+
+        routes = {
+            ("GET", PATH_PRICE): self._price,
+            ("GET", PATH_DAILY): self._daily,
+            ("GET", PATH_DAILY_CHART): self._daily,
+            ("GET", PATH_MINUTE_CHART): self._minute,
+            ("GET", PATH_BALANCE): self._balance,
+            ("POST", PATH_ORDER): self._order,
+            ("GET", PATH_DAILY_CCLD): self._daily_ccld,
+        }
+        route = routes.get((method, path))
+        if route is None:
+            self._send(handler, 404, {"rt_cd": "1", "msg_cd": "EGW00003", "msg1": "존재하지 않는 API 입니다."})
+            return
+
+        if self._rate_limited(handler.headers.get("appkey", "")):
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            self._send(handler, 500, self._error(MSG_RATE_LIMITED), tr_id)
+            return
+
+        token_error = self._token_error(handler.headers.get("authorization", ""))
+        if token_error is not None:
+            with self._lock:
+                self.stats["token_rejected"] += 1
+            self._send(handler, 500, self._error(token_error), tr_id)
+            return
+
+        result = route(query, body, tr_id)
+        self._send(handler, 200, result, tr_id, self._tr_cont(handler.headers.get("tr_cont", ""), result))
+
+    @staticmethod
+    def _tr_cont(request_tr_cont: str, result: Dict[str, Any]) -> str:
+        """
+        연속조회 응답 헤더 (연속조회키가 없는 API는 빈 값)
+
+        F/M: 다음 페이지 있음 (첫 페이지/이어서 조회한 페이지), D/E: 마지막 페이지 (첫 페이지/이어서 조회한 페이지)
+        """
+        if "ctx_area_nk100" not in result:
+            return ""
+        more = bool(result["ctx_area_nk100"])
+        if request_tr_cont == "N":
+            return "M" if more else "E"
+        return "F" if more else "D"
+
+    # 엔드포인트
+
+    def _issue_token(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        if not body.get("appkey") or not body.get("appsecret"):
+            return 403, {"error_description": "유효하지 않은 AppKey입니다.", "error_code": "EGW00103"}
+        token = uuid.uuid4().hex
+        expires_at = time.time() + self.token_ttl
+        with self._lock:
+            self._tokens[token] = expires_at
+            self.stats["tokens_issued"] += 1
+        return 200, {
+            "access_token": token,
+            "access_token_token_expired": datetime.fromtimestamp(expires_at).strftime("%Y-%m-%d %H:%M:%S"),
+            "token_type": "Bearer",
+            "expires_in": self.token_ttl,
+        }
+
+    def _price(self, query: Dict[str, str], body: Dict[str, Any], tr_id: str) -> Dict[str, Any]:
+        return self._ok(output=self.market.quote_output(query.get("FID_INPUT_ISCD", "")))
+
+    def _daily(self, query: Dict[str, str], body: Dict[str, Any], tr_id: str) -> Dict[str, Any]:
+        """기간 내 일별 시세 (최근 일자순, 최대 100건)"""
+        code = query.get("FID_INPUT_ISCD", "")
+        start = query.get("FID_INPUT_DATE_1", "")
+        end = query.get("FID_INPUT_DATE_2", "99999999")
+        bars = [bar for bar in self.market.bars(code) if start <= bar["date"] <= end]
+        page = list(reversed(bars))[:DAILY_PAGE_SIZE]
+        quote = self.market.quote_output(code)
+        return self._ok(
+            output1={
+                "stck_prpr": quote["stck_prpr"],
+                "prdy_vrss": quote["prdy_vrss"],
+                "prdy_ctrt": quote["prdy_ctrt"],
+                "stck_shrn_iscd": code,
+            },
+            output2=[
+                {
+                    "stck_bsop_date": bar["date"],
+                    "stck_oprc": str(bar["open"]),
+                    "stck_hgpr": str(bar["high"]),
+                    "stck_lwpr": str(bar["low"]),
+                    "stck_clpr": str(bar["close"]),
+                    "acml_vol": str(bar["volume"]),
+                    "acml_tr_pbmn": str(bar["amount"]),
+                    "flng_cls_code": "00",
+                    "prtt_rate": "0.00",
+                    "mod_yn": "N",
+                }
+                for bar in page
+            ],
+        )
+
+    def _minute(self, query: Dict[str, str], body: Dict[str, Any], tr_id: str) -> Dict[str, Any]:
+        """기준 시각 이전 분봉 (최근 시각순, 최대 30건, 마지막 일별 시세의 일자를 당일로 취급)"""
+        code = query.get("FID_INPUT_ISCD", "")
+        hour = query.get("FID_INPUT_HOUR_1") or "999999"
+        bars = [bar for bar in self.market.minute_bars(code) if bar["time"] <= hour]
+        page = list(reversed(bars))[:MINUTE_PAGE_SIZE]
+        day = self.market.bars(code)[-1]["date"]
+        quote = self.market.quote_output(code)
+        amount = 0
+        amounts = []
+        for bar in bars:
+            amount += bar["volume"] * bar["close"]
+            amounts.append(amount)
+        amounts = list(reversed(amounts))[:MINUTE_PAGE_SIZE]
+        return self._ok(
+            output1={
+                "prdy_vrss": quote["prdy_vrss"],
+                "prdy_ctrt": quote["prdy_ctrt"],
+                "stck_prdy_clpr": quote["stck_sdpr"],
+                "acml_vol": quote["acml_vol"],
+                "acml_tr_pbmn": quote["acml_tr_pbmn"],
+                "stck_prpr": quote["stck_prpr"],
+            },
+            output2=[
+                {
+                    "stck_bsop_date": day,
+                    "stck_cntg_hour": bar["time"],
+                    "stck_prpr": str(bar["close"]),
+                    "stck_oprc": str(bar["open"]),
+                    "stck_hgpr": str(bar["high"]),
+                    "stck_lwpr": str(bar["low"]),
+                    "cntg_vol": str(bar["volume"]),
+                    "acml_tr_pbmn": str(amount),
+                }
+                for bar, amount in zip(page, amounts)
+            ],
+        )
+
+    def _balance(self, query: Dict[str, str], body: Dict[str, Any], tr_id: str) -> Dict[str, Any]:
+        with self._lock:
+            cash = self.cash
+            holdings = {code: dict(item) for code, item in self.holdings.items()}
+
+        # 연속조회키는 다음 페이지 첫 종목의 순번 (종목코드순)
+        try:
+            offset = max(0, int(query.get("CTX_AREA_NK100", "").strip() or 0))
+        except ValueError:
+            offset = 0
+        page_end = offset + BALANCE_PAGE_SIZE
+        next_key = str(page_end) if page_end < len(holdings) else ""
+
+        output1 = []
+        total_purchase = 0
+        total_eval = 0
+        for index, (code, item) in enumerate(sorted(holdings.items())):
+            price = int(self.market.quote_output(code)["stck_prpr"])
+            quantity = int(item["quantity"])
+            purchase = int(quantity * item["avg_price"])
+            evaluation = quantity * price
+            total_purchase += purchase
+            total_eval += evaluation
+            if not offset <= index < page_end:
+                continue  # 계좌 합계는 전체 종목 기준
+            output1.append({
+                "pdno": code,
+                "prdt_name": f"STUB{code}",
+                "trad_dvsn_name": "현금",
+                "hldg_qty": str(quantity),
+                "ord_psbl_qty": str(quantity),
+                "pchs_avg_pric": f"{item['avg_price']:.4f}",
+                "pchs_amt": str(purchase),
+                "prpr": str(price),
+                "evlu_amt": str(evaluation),
+                "evlu_pfls_amt": str(evaluation - purchase),
+                "evlu_pfls_rt": f"{(evaluation - purchase) / purchase * 100:.2f}" if purchase else "0.00",
+            })
+        return self._ok(
+            output1=output1,
+            output2=[{
+                "dnca_tot_amt": str(cash),
+                "nxdy_excc_amt": str(cash),
+                "prvs_rcdl_excc_amt": str(cash),
+                "scts_evlu_amt": str(total_eval),
+                "tot_evlu_amt": str(cash + total_eval),
+                "pchs_amt_smtl_amt": str(total_purchase),
+                "evlu_amt_smtl_amt": str(total_eval),
+                "evlu_pfls_smtl_amt": str(total_eval - total_purchase),
+            }],
+            ctx_area_fk100=next_key,
+            ctx_area_nk100=next_key,
+        )
+
+    def _order(self, query: Dict[str, str], body: Dict[str, Any], tr_id: str) -> Dict[str, Any]:
+        """현금 주문 (시장가/지정가 모두 즉시 전량 체결된 것으로 처리)"""
+        code = body.get("PDNO", "")
+        quantity = int(body.get("ORD_QTY") or 0)
+        market_price = int(self.market.quote_output(code)["stck_prpr"])
+        price = market_price if body.get("ORD_DVSN") == "01" else int(body.get("ORD_UNPR") or 0)
+        if quantity <= 0 or price <= 0:
+            return self._error(("APBK0919", "주문수량 또는 주문단가를 확인하세요."))
+
+        buying = tr_id.endswith("0012U")
+        amount = quantity * price
+        with self._lock:
+            holding = self.holdings.setdefault(code, {"quantity": 0, "avg_price": 0.0})
+            if buying:
+                if amount > self.cash:
+                    return self._error(MSG_ORDER_NO_CASH)
+                total = holding["quantity"] + quantity
+                holding["avg_price"] = (holding["quantity"] * holding["avg_price"] + amount) / total
+                holding["quantity"] = total
+                self.cash -= amount
+            else:
+                if quantity > holding["quantity"]:
+                    return self._error(MSG_ORDER_NO_STOCK)
+                holding["quantity"] -= quantity
+                self.cash += amount
+            if holding["quantity"] == 0:
+                del self.holdings[code]
+
+            order_no = f"{len(self.orders) + 1:010d}"
+            order_time = datetime.now().strftime("%H%M%S")
+            self.orders.append({
+                "order_no": order_no,
+                "order_time": order_time,
+                "code": code,
+                "side": "BUY" if buying else "SELL",
+                "quantity": quantity,
+                "price": price,
+                "placed_at": time.monotonic(),
+            })
+        return self._ok(
+            MSG_ORDER_OK,
+            output={"KRX_FWDG_ORD_ORGNO": "91252", "ODNO": order_no, "ORD_TMD": order_time},
+        )
+
+    def _daily_ccld(self, query: Dict[str, str], body: Dict[str, Any], tr_id: str) -> Dict[str, Any]:
+        """주문 체결 조회 (오늘 주문, 최근 주문부터, 체결 수량은 주문 후 경과 시간에 비례)"""
+        with self._lock:
+            orders = [dict(order) for order in reversed(self.orders)]
+        order_no = query.get("ODNO", "")
+        if order_no:
+            orders = [order for order in orders if order["order_no"] == order_no]
+
+        # 연속조회키는 다음 페이지 첫 주문의 순번
+        try:
+            offset = max(0, int(query.get("CTX_AREA_NK100", "").strip() or 0))
+        except ValueError:
+            offset = 0
+        page_end = offset + CCLD_PAGE_SIZE
+        next_key = str(page_end) if page_end < len(orders) else ""
+
+        now = time.monotonic()
+        today = date.today().strftime("%Y%m%d")
+        output1 = []
+        total_filled = 0
+        total_amount = 0
+        for order in orders[offset:page_end]:
+            progress = 1.0 if self.fill_delay <= 0 else min(1.0, (now - order["placed_at"]) / self.fill_delay)
+            filled = int(order["quantity"] * progress)
+            amount = filled * order["price"]
+            total_filled += filled
+            total_amount += amount
+            output1.append({
+                "ord_dt": today,
+                "ord_gno_brno": "91252",
+                "odno": order["order_no"],
+                "orgn_odno": "",
+                "sll_buy_dvsn_cd": "02" if order["side"] == "BUY" else "01",
+                "pdno": order["code"],
+                "prdt_name": f"STUB{order['code']}",
+                "ord_qty": str(order["quantity"]),
+                "ord_unpr": str(order["price"]),
+                "ord_tmd": order["order_time"],
+                "tot_ccld_qty": str(filled),
+                "avg_prvs": str(order["price"] if filled else 0),
+                "cncl_yn": "N",
+                "tot_ccld_amt": str(amount),
+                "rmn_qty": str(order["quantity"] - filled),
+                "rjct_qty": "0",
+            })
+        return self._ok(
+            output1=output1,
+            output2={
+                "tot_ord_qty": str(sum(order["quantity"] for order in orders)),
+                "tot_ccld_qty": str(total_filled),
+                "tot_ccld_amt": str(total_amount),
+            },
+            ctx_area_fk100=next_key,
+            ctx_area_nk100=next_key,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="한국투자증권 API 로컬 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.0, help="기본 응답 지연 (초)")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="무작위 추가 지연 최대값 (초)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="앱키별 초당 허용 호출 수 (0: 제한 없음)")
+    parser.add_argument("--rate-limit-error-rate", type=float, default=0.0, help="EGW00201 무작위 발생 확률")
+    parser.add_argument("--token-ttl", type=int, default=86400, help="토큰 유효시간 (초)")
+    parser.add_argument("--token-expiry-rate", type=float, default=0.0, help="EGW00123 무작위 발생 확률")
+    parser.add_argument("--seed", default=None, help="시드 JSON 파일 경로")
+    parser.add_argument("--cash", type=int, default=10_000_000, help="초기 예수금 (원)")
+    parser.add_argument("--fill-delay", type=float, default=0.0, help="주문이 전량 체결되기까지 걸리는 시간 (초)")
+    args = parser.parse_args()
+
+    server = KisStubServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        rate_limit=args.rate_limit,
+        rate_limit_error_rate=args.rate_limit_error_rate,
+        token_ttl=args.token_ttl,
+        token_expiry_rate=args.token_expiry_rate,
+        seed_path=args.seed,
+        cash=args.cash,
+        fill_delay=args.fill_delay,
+    )
+    print(f"KIS 스텁 서버 실행 중: {server.url} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+인증 토큰 저장소 모듈
+
+백테스터, 자동 주문, 임시 스크립트처럼 여러 프로세스가 같은 토큰 파일을 쓰므로
+파일 잠금과 원자적 교체(os.replace)로 토큰을 저장합니다.
+다른 프로세스가 방금 발급한 토큰이 있으면 새로 발급하지 않고 재사용합니다.
+(토큰 발급 API는 분당 1회로 제한됨)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from loguru import logger
+
+# 플랫폼별 파일 잠금 (mypy가 플랫폼별로 분기를 좁힐 수 있도록 sys.platform으로 구분)
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# 토큰 저장 파일 경로
+TOKEN_FILE = os.path.join(os.path.dirname(__file__), ".token_cache.json")
+
+Token = Tuple[str, datetime]  # (access_token, 만료 시각)
+
+
+def token_key(mode: str, app_key: str, base_url: str = "") -> str:
+    """
+    토큰 구분 키 생성 (모드 + 앱키, 공식 주소가 아닌 서버면 서버 주소 포함)
+
+    앱키 원문이 파일에 남지 않도록 해시 일부만 사용합니다.
+    """
+    digest = hashlib.sha256(f"{app_key}{base_url}".encode("utf-8")).hexdigest()[:16]
+    return f"{mode}:{digest}"
+
+
+class TokenStore:
+    """프로세스 간에 공유되는 토큰 파일 저장소"""
+
+    def __init__(self, path: str = TOKEN_FILE):
+        """
+        Args:
+            path: 토큰 저장 파일 경로 (잠금 파일은 path + ".lock")
+        """
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    def _acquire(self, exclusive: bool) -> int:
+        """잠금 파일을 열고 잠금 획득 (다른 프로세스가 잡고 있으면 대기)"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if sys.platform == "win32":
+                # Windows는 공유 잠금이 없으므로 항상 배타 잠금 사용
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    @staticmethod
+    def _release(fd: int) -> None:
+        try:
+            if sys.platform == "win32":
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        fd = self._acquire(exclusive)
+        try:
+            yield
+        finally:
+            self._release(fd)
+
+    def _read_all(self) -> Dict[str, Dict[str, str]]:
+        """저장 파일 전체 읽기 (잠금을 잡은 상태에서 호출)"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"토큰 파일을 읽을 수 없습니다: {str(e)}")
+            return {}
+        # 예전 형식(토큰 하나만 저장)은 어느 모드의 토큰인지 알 수 없으므로 무시
+        if not isinstance(data, dict) or "access_token" in data:
+            return {}
+        return data
+
+    def _write_all(self, data: Dict[str, Dict[str, str]]) -> None:
+        """임시 파일에 쓴 뒤 원자적으로 교체 (배타 잠금을 잡은 상태에서 호출)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".token_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _valid_token(entry: Optional[Dict[str, str]]) -> Optional[Token]:
+        """만료되지 않은 토큰만 반환"""
+        if not entry:
+            return None
+        try:
+            expired_at = datetime.fromisoformat(entry["expired_at"])
+            token = entry["access_token"]
+        except (KeyError, TypeError, ValueError):
+            return None
+        if datetime.now() >= expired_at:
+            return None
+        return token, expired_at
+
+    def load(self, key: str) -> Optional[Token]:
+        """
+        저장된 토큰 조회
+
+        Args:
+            key: 토큰 구분 키 (token_key로 생성)
+
+        Returns:
+            Optional[Token]: 유효한 (토큰, 만료 시각), 없거나 만료되었으면 None
+        """
+        with self._locked(exclusive=False):
+            return self._valid_token(self._read_all().get(key))
+
+    def save(self, key: str, token: str, expired_at: datetime) -> None:
+        """
+        토큰 저장 (다른 키의 토큰은 유지)
+
+        Args:
+            key: 토큰 구분 키
+            token: 접근 토큰
+            expired_at: 만료 시각
+        """
+        with self._locked(exclusive=True):
+            data = self._read_all()
+            data[key] = {"access_token": token, "expired_at": expired_at.isoformat()}
+            self._write_all(data)
+
+    def _reusable(self, key: str, stale_token: Optional[str]) -> Optional[Token]:
+        """발급 전에 다른 프로세스가 저장한 토큰이 있는지 확인 (잠금을 잡은 상태에서 호출)"""
+        cached = self._valid_token(self._read_all().get(key))
+        if cached is not None and cached[0] != stale_token:
+            logger.debug("다른 프로세스가 발급한 토큰을 재사용합니다.")
+            return cached
+        return None
+
+    def _store_issued(self, key: str, token: Token) -> None:
+        data = self._read_all()
+        data[key] = {"access_token": token[0], "expired_at": token[1].isoformat()}
+        self._write_all(data)
+
+    def get_or_issue(
+        self,
+        key: str,
+        issue: Callable[[], Token],
+        stale_token: Optional[str] = None,
+    ) -> Token:
+        """
+        저장된 토큰을 재사용하거나, 없으면 발급 후 저장
+
+        발급하는 동안 배타 잠금을 유지하므로, 동시에 기다리던 다른 프로세스는
+        발급이 끝난 뒤 같은 토큰을 읽어 갑니다.
+
+        Args:
+            key: 토큰 구분 키
+            issue: 토큰을 새로 발급하는 함수
+            stale_token: 만료된 것으로 확인된 토큰 (저장소에 남아 있어도 재사용하지 않음)
+
+        Returns:
+            Token: (토큰, 만료 시각)
+        """
+        with self._locked(exclusive=True):
+            cached = self._reusable(key, stale_token)
+            if cached is not None:
+                return cached
+            token = issue()
+            self._store_issued(key, token)
+            return token
+
+    async def get_or_issue_async(
+        self,
+        key: str,
+        issue: Callable[[], Awaitable[Token]],
+        stale_token: Optional[str] = None,
+    ) -> Token:
+        """
+        get_or_issue의 asyncio 버전 (잠금 대기는 스레드에서 처리해 이벤트 루프를 막지 않음)
+
+        Args:
+            key: 토큰 구분 키
+            issue: 토큰을 새로 발급하는 코루틴 함수
+            stale_token: 만료된 것으로 확인된 토큰
+
+        Returns:
+            Token: (토큰, 만료 시각)
+        """
+        fd = await asyncio.to_thread(self._acquire, True)
+        try:
+            cached = self._reusable(key, stale_token)
+            if cached is not None:
+                return cached
+            token = await issue()
+            self._store_issued(key, token)
+            return token
+        finally:
+            self._release(fd)
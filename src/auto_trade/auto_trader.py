@@ -8,7 +8,11 @@ from typing import List, Dict
 import pytz
 from loguru import logger
 
-from src.api.kis_api import KisAPI
+from config.settings import KIS_FILL_TIMEOUT
+from src.api.fill_tracker import FillTracker
+from src.api.kis_api import KisAPI, KisAPIError
+from src.api.models import FillEvent, OrderSpec
+from src.utils.log_setup import setup_logging
 
 
 class AutoTrader:
@@ -19,7 +23,8 @@ class AutoTrader:
         api: KisAPI,
         codes: List[str],
         weekly_budget: int,
-        market: str = "J"
+        market: str = "J",
+        fill_timeout: float = KIS_FILL_TIMEOUT,
     ):
         """
         자동 주문 시스템 초기화
@@ -29,11 +34,14 @@ class AutoTrader:
             codes: 종목코드 리스트
             weekly_budget: 주간 투자 예산
             market: 시장구분
+            fill_timeout: 주문 후 체결을 확인하는 최대 시간 (초, 지나면 미체결 경고 후 추적 중지)
         """
         self.api = api
         self.codes = codes
         self.weekly_budget = weekly_budget
         self.market = market
+        self.fill_timeout = fill_timeout
+        self.fill_tracker = FillTracker(api, on_fill=self._log_fill)
         self.seoul_tz = pytz.timezone('Asia/Seoul')
         
         logger.info(f"자동 주문 시스템이 초기화되었습니다.")
@@ -67,80 +75,72 @@ class AutoTrader:
                 logger.warning("현재 시장이 닫혀있습니다.")
                 return
                 
-            # API 토큰 상태 확인 및 갱신
+            # 계좌 잔고 확인 (토큰 만료, 호출 한도 초과 등 일시적 오류는 API 클라이언트가 재시도)
             try:
-                # 계좌 잔고 확인 (토큰 상태 테스트)
-                balance_info = self.api.get_account_balance()
-                available_balance = int(balance_info.get("output2", [{}])[0].get("prvs_rcdl_excc_amt", 0))
+                available_balance = self.api.get_balance().orderable_cash
                 logger.info(f"계좌 잔고 확인 완료: {available_balance:,}원")
                 
-            except Exception as e:
-                if "EGW00123" in str(e) or "만료된 token" in str(e):
-                    logger.warning("토큰이 만료되었습니다. 토큰을 갱신하고 재시도합니다.")
-                    # 토큰 갱신을 위해 새로운 API 인스턴스 생성
-                    from src.api.kis_api import KisAPI
-                    self.api = KisAPI(mode=self.api.mode)
-                    # 재귀 호출로 다시 시도
-                    self._execute_orders()
-                    return
-                else:
-                    logger.error(f"계좌 잔고 확인 실패: {str(e)}")
-                    return
+            except KisAPIError as e:
+                logger.error(f"계좌 잔고 확인 실패: {str(e)}")
+                return
             
             if available_balance < self.weekly_budget:
                 logger.warning(f"잔고 부족: {available_balance:,}원 (필요: {self.weekly_budget:,}원)")
                 return
                 
-            # 각 종목별 주문 실행
+            # 모든 종목 현재가를 한꺼번에 조회해 같은 시점 시세로 수량을 정하고 주문은 동시에 전송
             budget_per_stock = self.weekly_budget // len(self.codes)
+            specs = [
+                OrderSpec(code=code, budget=budget_per_stock, order_type="01", market=self.market)  # 시장가
+                for code in self.codes
+            ]
             
-            for code in self.codes:
-                try:
-                    # 주문 수량 계산 및 주문 실행
-                    result = self.api.place_regular_order(
-                        code=code,
-                        budget=budget_per_stock,
-                        market=self.market
-                    )
-                    
-                    # 주문 결과 로깅
-                    order_info = result.get("output", {})
-                    logger.info(
-                        f"주문 실행 완료: {code}\n"
-                        f"주문 수량: {order_info.get('ord_qty')}주\n"
-                        f"주문 금액: {int(order_info.get('ord_amt', 0)):,}원\n"
-                        f"주문 번호: {order_info.get('ord_no')}"
-                    )
-                    
-                except Exception as e:
-                    if "EGW00123" in str(e) or "만료된 token" in str(e):
-                        logger.warning(f"종목 {code} 주문 중 토큰 만료. 토큰을 갱신하고 재시도합니다.")
-                        # 토큰 갱신을 위해 새로운 API 인스턴스 생성
-                        from src.api.kis_api import KisAPI
-                        self.api = KisAPI(mode=self.api.mode)
-                        # 해당 종목 다시 시도
-                        try:
-                            result = self.api.place_regular_order(
-                                code=code,
-                                budget=budget_per_stock,
-                                market=self.market
-                            )
-                            order_info = result.get("output", {})
-                            logger.info(
-                                f"재시도 주문 실행 완료: {code}\n"
-                                f"주문 수량: {order_info.get('ord_qty')}주\n"
-                                f"주문 금액: {int(order_info.get('ord_amt', 0)):,}원\n"
-                                f"주문 번호: {order_info.get('ord_no')}"
-                            )
-                        except Exception as retry_e:
-                            logger.error(f"재시도 후 종목 {code} 주문 실패: {str(retry_e)}")
-                    else:
-                        logger.error(f"종목 {code} 주문 실패: {str(e)}")
+            results = self.api.place_orders(specs)
+            for result in results:
+                if not result.ok:
+                    logger.error(f"종목 {result.spec.code} 주문 실패: {result.error}")
                     continue
                     
+                # 주문 결과 로깅
+                logger.info(
+                    f"주문 접수 완료: {result.spec.code}\n"
+                    f"주문 수량: {result.quantity}주\n"
+                    f"예상 금액: {result.expected_amount:,}원\n"
+                    f"주문 번호: {result.ack.order_no} (접수 {result.latency * 1000:.0f}ms)"
+                )
+            
+            # 접수된 주문의 체결 확인 (모든 주문을 한 번의 조회로 확인)
+            order_nos = [result.ack.order_no for result in results if result.ok and result.ack is not None]
+            if not self.fill_tracker.track_results(results):
+                return
+            if self.fill_tracker.running:
+                # 스케줄 루프를 막지 않도록 백그라운드에서 조회하고, fill_timeout 뒤에 미체결 주문만 확인
+                schedule.every(max(1, round(self.fill_timeout))).seconds.do(self._check_unfilled, order_nos)
+            else:
+                # 백그라운드 조회 없이 실행한 경우(run_once)에는 최대 fill_timeout초 동안 여기서 조회
+                self.fill_tracker.wait(timeout=self.fill_timeout)
+                self._check_unfilled(order_nos)
+                    
         except Exception as e:
             logger.error(f"주문 실행 중 오류 발생: {str(e)}")
             
+    def _check_unfilled(self, order_nos: List[str]):
+        """fill_timeout이 지나도 전량 체결되지 않은 주문을 경고하고 추적 중지 (스케줄에서 한 번만 실행)"""
+        open_orders = set(self.fill_tracker.open_orders)
+        for order_no in order_nos:
+            if order_no in open_orders:
+                logger.warning(f"주문 {order_no}이(가) {self.fill_timeout:.0f}초 안에 전량 체결되지 않았습니다.")
+                self.fill_tracker.untrack(order_no)
+        return schedule.CancelJob
+        
+    @staticmethod
+    def _log_fill(event: FillEvent) -> None:
+        """체결 로깅"""
+        logger.info(
+            f"체결 확인: {event.code} {event.quantity}주 "
+            f"(누적 {event.filled_quantity}/{event.order_quantity}주, 평균가 {event.avg_price:,.0f}원, 주문 번호: {event.order_no})"
+        )
+        
     def _seoul_to_utc_time(self, seoul_time_str: str) -> str:
         """
         서울 시간을 UTC 시간으로 변환
@@ -179,6 +179,12 @@ class AutoTrader:
         # UTC 시간으로 스케줄 설정
         schedule.every().tuesday.at(utc_time).do(self._execute_orders)
         
+        # 주문 시점에 토큰 발급을 기다리지 않도록 만료 전에 미리 갱신
+        self.api.start_token_refresher()
+        
+        # 체결 확인은 백그라운드 스레드에서 (주문 실행이 체결을 기다리며 스케줄 루프를 막지 않음)
+        self.fill_tracker.start()
+        
         logger.info("자동 주문 시스템이 시작되었습니다.")
         logger.info("매주 화요일 오전 10시(서울 시간)에 주문이 실행됩니다.")
         
@@ -187,6 +193,8 @@ class AutoTrader:
                 schedule.run_pending()
                 time.sleep(1)
         except KeyboardInterrupt:
+            self.fill_tracker.stop()
+            self.api.stop_token_refresher()
             logger.info("자동 주문 시스템이 중지되었습니다.")
             
     def run_once(self):
@@ -197,6 +205,7 @@ class AutoTrader:
 
 # 사용 예시
 if __name__ == "__main__":
+    setup_logging()
     try:
         # API 클라이언트 초기화
         api = KisAPI(mode=KisAPI.MODE_REAL)
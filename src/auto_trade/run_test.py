@@ -3,6 +3,7 @@
 """
 from src.api.kis_api import KisAPI
 from src.auto_trade.auto_trader import AutoTrader
+from src.utils.log_setup import setup_logging
 from loguru import logger
 
 
@@ -15,14 +16,14 @@ class TestTrader(AutoTrader):
 
 
 def main():
+    setup_logging()
     try:
         # API 클라이언트 초기화 (모의투자 모드)
         api = KisAPI(mode=KisAPI.MODE_PAPER)
         logger.info("API 클라이언트가 초기화되었습니다.")
         
         # 계좌 잔고 확인
-        balance_info = api.get_account_balance()
-        available_balance = int(balance_info.get("output2", [{}])[0].get("prvs_rcdl_excc_amt", 0))
+        available_balance = api.get_balance().orderable_cash
         logger.info(f"현재 계좌 잔고: {available_balance:,}원")
         
         # 테스트용 트레이더 초기화
@@ -8,6 +8,7 @@ import numpy as np
 from loguru import logger
 
 from src.api.kis_api import KisAPI
+from src.utils.log_setup import setup_logging
 
 
 class BacktestResult:
@@ -127,10 +128,10 @@ class BacktestEngine:
         price_data = {}
         for code in codes:
             try:
-                data = self.api.get_historical_prices(code, start_date, end_date, market)
+                bars = self.api.get_daily_bars(code, start_date, end_date, market)
                 # 날짜별 가격 데이터를 딕셔너리로 변환
                 price_data[code] = {
-                    item['date']: item for item in data['prices']
+                    bar.date: bar for bar in bars
                 }
             except Exception as e:
                 logger.error(f"종목 {code} 시세 데이터 조회 실패: {str(e)}")
@@ -155,7 +156,7 @@ class BacktestEngine:
                         continue
                         
                     price_info = price_data[code][date]
-                    current_price = price_info['close']
+                    current_price = price_info.close
                     
                     # 주간 예산으로 주문 가능한 수량 계산
                     budget = weekly_budget // len(codes)  # 종목당 예산
@@ -188,7 +189,7 @@ class BacktestEngine:
             total_value = current_balance
             for code, quantity in holdings.items():
                 if code in price_data and date in price_data[code]:
-                    price = price_data[code][date]['close']
+                    price = price_data[code][date].close
                     position_value = quantity * price
                     total_value += position_value
                     
@@ -219,6 +220,7 @@ class BacktestEngine:
 
 # 사용 예시
 if __name__ == "__main__":
+    setup_logging()
     try:
         # API 클라이언트 초기화
         api = KisAPI(mode=KisAPI.MODE_PAPER)
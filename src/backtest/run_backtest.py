@@ -1,7 +1,10 @@
 from src.api.kis_api import KisAPI
 from src.backtest.backtest_engine import BacktestEngine
+from src.utils.log_setup import setup_logging
 from datetime import datetime, timedelta
 
+setup_logging()
+
 # API 클라이언트 초기화
 api = KisAPI(mode=KisAPI.MODE_PAPER)
 
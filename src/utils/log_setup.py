@@ -0,0 +1,68 @@
+"""
+로그 출력 설정 모듈
+
+라이브러리 모듈(src.api 등)은 import만으로 로거 설정을 바꾸지 않고,
+실행 스크립트가 시작할 때 setup_logging()을 한 번 호출해 터미널/파일 출력을 설정합니다.
+"""
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Optional
+
+from loguru import logger
+
+from config.settings import LOG_LEVEL
+
+# 로그 디렉토리 (src/logs)
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+
+_log_file: Optional[str] = None
+_lock = threading.Lock()
+
+
+def setup_logging(level: str = LOG_LEVEL, log_dir: str = LOG_DIR, force: bool = False) -> str:
+    """
+    터미널/파일 로그 출력 설정 (여러 번 호출해도 한 번만 적용)
+
+    기존 출력(loguru 기본 stderr 출력 포함)을 제거하고
+    터미널에는 level 이상을 간단한 형식으로, 파일에는 DEBUG 이상을 상세 형식으로 기록합니다.
+
+    Args:
+        level: 터미널 출력 수준
+        log_dir: 로그 파일 디렉토리 (날짜별 kis_api_YYYYMMDD.log)
+        force: 이미 설정했더라도 다시 설정할지 여부
+
+    Returns:
+        str: 로그 파일 경로
+    """
+    global _log_file
+    with _lock:
+        if _log_file is not None and not force:
+            return _log_file
+
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = os.path.join(log_dir, f"kis_api_{datetime.now().strftime('%Y%m%d')}.log")
+
+        logger.remove()
+
+        # 터미널 출력 설정 (간단한 포맷)
+        logger.add(
+            sys.stderr,
+            format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
+            level=level,
+            colorize=True
+        )
+
+        # 파일 출력 설정 (상세 포맷)
+        logger.add(
+            log_file,
+            format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} | {message}",
+            level="DEBUG",
+            rotation="00:00",  # 매일 자정에 새 파일 생성
+            retention="30 days",  # 30일간 보관
+            encoding="utf-8"
+        )
+
+        _log_file = log_file
+        return log_file
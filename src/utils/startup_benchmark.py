@@ -0,0 +1,100 @@
+"""
+모듈 import 시간(콜드 스타트) 측정 스크립트
+
+매번 새 인터프리터에서 모듈을 import하고 -X importtime 결과로 해당 모듈의 누적 import 시간을 잽니다.
+짧게 실행되는 스크립트/워커의 시작 시간이 늘어나지 않았는지 확인할 때 사용합니다.
+
+실행 예:
+    python -m src.utils.startup_benchmark
+    python -m src.utils.startup_benchmark src.api.kis_api src.api.async_kis_api --runs 20 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULES = ["src.api.kis_api", "src.api.async_kis_api", "src.auto_trade.auto_trader"]
+
+# 프로젝트 루트 (src의 상위 디렉토리)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """
+    새 인터프리터에서 module을 import했을 때 module과 module이 불러온 모듈별 누적 import 시간
+
+    Returns:
+        Dict[str, int]: 모듈 이름 -> 누적 import 시간 (마이크로초)
+
+    Raises:
+        RuntimeError: import에 실패한 경우
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{process.stderr[-2000:]}")
+
+    # import time:       self [us] |  cumulative | imported package
+    # 하위 모듈이 먼저 출력되고 들여쓰기가 깊이를 나타내므로,
+    # 직전 최상위 항목 이후부터 module까지가 module이 불러온 모듈 (인터프리터 시작 시 import는 제외)
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        top_level = not name[1:].startswith(" ")
+        if top_level and name.strip() != module:
+            times.clear()
+            continue
+        times[name.strip()] = int(cumulative)
+        if top_level:
+            break
+    return times
+
+
+def measure(module: str, runs: int) -> Tuple[List[float], Dict[str, int]]:
+    """
+    module의 import 시간을 runs번 측정
+
+    Returns:
+        Tuple[List[float], Dict[str, int]]: (회차별 import 시간(ms), 마지막 회차의 모듈별 누적 시간(us))
+    """
+    samples = []
+    times: Dict[str, int] = {}
+    for _ in range(runs):
+        times = _import_times(module)
+        samples.append(times.get(module, 0) / 1000)
+    return samples, times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="모듈 import 시간(콜드 스타트) 측정")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="측정할 모듈")
+    parser.add_argument("--runs", type=int, default=10, help="모듈별 측정 횟수")
+    parser.add_argument("--top", type=int, default=10, help="오래 걸린 하위 import 표시 개수 (0이면 표시 안 함)")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        samples, times = measure(module, args.runs)
+        print(
+            f"{module}: 중앙값 {statistics.median(samples):.1f}ms, "
+            f"최소 {min(samples):.1f}ms, 최대 {max(samples):.1f}ms ({args.runs}회)"
+        )
+        if args.top > 0:
+            slowest = sorted(
+                ((name, cumulative) for name, cumulative in times.items() if name != module),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:args.top]
+            for name, cumulative in slowest:
+                print(f"    {cumulative / 1000:8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+테스트 공통 fixture
+
+모든 API 테스트는 로컬 스텁 서버(KisStubServer)에 접속하므로 실제 키나 네트워크가 필요 없습니다.
+클라이언트마다 호출 제한기와 토큰 파일을 따로 만들어 테스트끼리 한도나 토큰을 공유하지 않습니다.
+"""
+import json
+from typing import Any, Callable, Dict, Iterator, List
+
+import pytest
+
+from src.api.kis_api import KisAPI
+from src.api.rate_limiter import RateLimiter
+from src.api.stub_server import KisStubServer
+from src.api.token_store import TokenStore
+
+ACCOUNT_NO = "5000000001"
+
+
+@pytest.fixture
+def stub() -> Iterator[KisStubServer]:
+    """기본 설정의 스텁 서버"""
+    with KisStubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def seed_file(tmp_path) -> Callable[[Dict[str, Any]], str]:
+    """시드 JSON 파일을 만들어 경로를 돌려주는 함수"""
+
+    def write(seed: Dict[str, Any]) -> str:
+        path = tmp_path / "seed.json"
+        path.write_text(json.dumps(seed), encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def make_api(tmp_path) -> Iterator[Callable[..., KisAPI]]:
+    """스텁 서버에 접속하는 KisAPI를 만드는 함수 (테스트가 끝나면 모두 닫음)"""
+    clients: List[KisAPI] = []
+
+    def make(server: KisStubServer, **kwargs: Any) -> KisAPI:
+        options: Dict[str, Any] = {
+            "base_url": server.url,
+            "app_key": "stub",
+            "app_secret": "stub",
+            "account_no": ACCOUNT_NO,
+            "rate_limiter": RateLimiter(1000, 100),
+            "token_store": TokenStore(str(tmp_path / "token.json")),
+        }
+        options.update(kwargs)
+        api = KisAPI(**options)
+        clients.append(api)
+        return api
+
+    yield make
+    for api in clients:
+        api.close()
@@ -0,0 +1,89 @@
+"""응답 녹화/재생(Cassette) 테스트"""
+import os
+
+import pytest
+
+from src.api.cassette import Cassette
+from src.api.kis_api import KisAPI, KisAPIError
+
+
+def _replay_api(path: str, allow_orders: bool = False) -> KisAPI:
+    # 재생 모드는 서버에 접속하지 않으므로 주소와 키는 아무 값이나 사용
+    return KisAPI(
+        base_url="http://127.0.0.1:9",
+        app_key="replay",
+        app_secret="replay",
+        account_no="5000000001",
+        cassette=Cassette(path, Cassette.MODE_REPLAY, allow_orders=allow_orders),
+    )
+
+
+def test_recorded_responses_replay_without_network(stub, make_api, tmp_path):
+    path = str(tmp_path / "kis.json.gz")
+    cassette = Cassette(path, Cassette.MODE_RECORD)
+    api = make_api(stub, cassette=cassette)
+    quote = api.get_quote("005930", use_cache=False)
+    bars = api.get_daily_bars("005930", "20240101", "20240131")
+    balance = api.get_balance()
+    api.close()
+    assert os.path.exists(path)
+
+    replay = _replay_api(path)
+    requests_before = stub.stats["requests"]
+    assert replay.get_quote("005930", use_cache=False) == quote
+    assert replay.get_daily_bars("005930", "20240101", "20240131") == bars
+    assert replay.get_balance() == balance
+    assert stub.stats["requests"] == requests_before
+
+    with pytest.raises(KisAPIError):
+        replay.get_quote("000660", use_cache=False)  # 녹화되지 않은 요청
+
+
+def test_orders_are_neither_recorded_nor_replayed_by_default(stub, make_api, tmp_path):
+    path = str(tmp_path / "kis.json.gz")
+    cassette = Cassette(path, Cassette.MODE_RECORD)
+    api = make_api(stub, cassette=cassette)
+    api.get_quote("005930", use_cache=False)
+    api.place_order("005930", 1, "01")
+    api.close()
+
+    # 주문이 녹화되어 있지 않으므로 allow_orders로 열어도 재생할 응답이 없음
+    with pytest.raises(KisAPIError):
+        _replay_api(path, allow_orders=True).place_order("005930", 1, "01")
+    # 기본 녹화 파일은 재생 중 주문 요청 자체를 거절
+    with pytest.raises(KisAPIError, match="주문"):
+        _replay_api(path).place_order("005930", 1, "01")
+
+
+def test_orders_round_trip_when_allowed(stub, make_api, tmp_path):
+    path = str(tmp_path / "kis.json.gz")
+    cassette = Cassette(path, Cassette.MODE_RECORD, allow_orders=True)
+    api = make_api(stub, cassette=cassette)
+    recorded = api.place_order("005930", 1, "01")
+    api.close()
+
+    replayed = _replay_api(path, allow_orders=True).place_order("005930", 1, "01")
+    assert replayed["output"]["ODNO"] == recorded["output"]["ODNO"]
+    assert len(stub.orders) == 1
+
+
+def test_repeated_requests_replay_in_recorded_order(stub, make_api, tmp_path):
+    path = str(tmp_path / "kis.json.gz")
+    cassette = Cassette(path, Cassette.MODE_RECORD, allow_orders=True)
+    api = make_api(stub, cassette=cassette)
+    api.place_order("005930", 1, "01")
+    first = api.get_balance()
+    api.place_order("005930", 1, "01")
+    second = api.get_balance()
+    api.close()
+    assert first != second
+
+    replay = _replay_api(path, allow_orders=True)
+    assert replay.get_balance() == first
+    assert replay.get_balance() == second
+    assert replay.get_balance() == second  # 녹화가 끝나면 마지막 응답 반복
+
+
+def test_invalid_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "kis.json.gz"), "rewind")
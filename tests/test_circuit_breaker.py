@@ -0,0 +1,91 @@
+"""서킷 브레이커(CircuitBreaker) 테스트"""
+import time
+
+import pytest
+
+from src.api.circuit_breaker import (
+    CLOSED,
+    ENDPOINT_ACCOUNT,
+    ENDPOINT_ORDER,
+    ENDPOINT_QUOTE,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    endpoint_class,
+)
+
+RESET_TIMEOUT = 0.05
+
+
+def _open_breaker(failure_threshold: int = 3) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=RESET_TIMEOUT, latency_slo=0)
+    for _ in range(failure_threshold):
+        assert breaker.allow() is None
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=RESET_TIMEOUT, latency_slo=0)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # 성공하면 연속 실패 횟수 초기화
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    remaining = breaker.allow()
+    assert remaining is not None and 0 < remaining <= RESET_TIMEOUT
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_allows_a_single_probe_and_closes_on_success():
+    breaker = _open_breaker()
+    time.sleep(RESET_TIMEOUT * 1.5)
+
+    assert breaker.allow() is None
+    assert breaker.state == HALF_OPEN
+    # 시험 요청 결과가 나오기 전의 다른 요청은 차단
+    assert breaker.allow() is not None
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() is None
+
+
+def test_failed_probe_reopens_immediately():
+    breaker = _open_breaker(failure_threshold=5)
+    time.sleep(RESET_TIMEOUT * 1.5)
+    assert breaker.allow() is None
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow() is not None
+
+
+def test_slow_success_counts_as_failure():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=RESET_TIMEOUT, latency_slo=0.5)
+    breaker.record_success(elapsed=0.1)
+    breaker.record_success(elapsed=1.0)
+    breaker.record_success(elapsed=1.0)
+    assert breaker.state == OPEN
+
+
+def test_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(reset_timeout=0)
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("/uapi/domestic-stock/v1/trading/order-cash", ENDPOINT_ORDER),
+        ("/uapi/domestic-stock/v1/trading/inquire-balance", ENDPOINT_ACCOUNT),
+        ("/uapi/domestic-stock/v1/quotations/inquire-price", ENDPOINT_QUOTE),
+    ],
+)
+def test_endpoint_class(endpoint, expected):
+    assert endpoint_class(endpoint) == expected
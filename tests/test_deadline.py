@@ -0,0 +1,64 @@
+"""요청 마감 시각(Deadline) 테스트"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api.deadline import STAGE_HTTP, STAGE_RATE_LIMIT, Deadline
+from src.api.kis_api import KisDeadlineExceeded
+from src.api.rate_limiter import RateLimiter
+from src.api.stub_server import KisStubServer, PATH_PRICE
+
+
+def test_deadline_expires():
+    deadline = Deadline.after(0.05)
+    assert not deadline.expired()
+    assert 0 < deadline.remaining() <= 0.05
+    assert deadline.clamp(10) <= 0.05
+    time.sleep(0.06)
+    assert deadline.expired()
+    assert deadline.remaining() == 0
+    assert deadline.clamp(10) == 0
+
+
+def test_coerce_accepts_seconds_datetime_and_deadline():
+    assert Deadline.coerce(None) is None
+    existing = Deadline.after(1)
+    assert Deadline.coerce(existing) is existing
+    assert Deadline.coerce(2.0).remaining() == pytest.approx(2.0, abs=0.05)
+    at = Deadline.coerce(datetime.now() + timedelta(seconds=3))
+    assert at.remaining() == pytest.approx(3.0, abs=0.1)
+
+
+def test_record_accumulates_stage_timings():
+    deadline = Deadline.after(1)
+    deadline.record(STAGE_HTTP, 0.1)
+    deadline.record(STAGE_HTTP, 0.2)
+    deadline.record(STAGE_RATE_LIMIT, 0.05)
+    assert deadline.timings[STAGE_HTTP] == pytest.approx(0.3)
+    assert "rate_limit=0.050s" in deadline.summary()
+
+
+def test_slow_response_raises_deadline_exceeded(make_api):
+    with KisStubServer(latency=0.5) as server:
+        api = make_api(server)
+        started_at = time.monotonic()
+        with pytest.raises(KisDeadlineExceeded) as excinfo:
+            api.get_stock_price("005930", use_cache=False, deadline=0.2)
+        # 응답을 끝까지 기다리지 않고 마감 시각에 포기
+        assert time.monotonic() - started_at < 0.45
+        assert excinfo.value.stage == STAGE_HTTP
+
+
+def test_rate_limit_wait_beyond_deadline_fails_fast(stub, make_api):
+    api = make_api(stub, rate_limiter=RateLimiter(1, 1))
+    api.get_stock_price("005930", use_cache=False)
+    requests_before = stub.stats[PATH_PRICE]
+
+    started_at = time.monotonic()
+    with pytest.raises(KisDeadlineExceeded) as excinfo:
+        api.get_stock_price("000660", use_cache=False, deadline=0.1)
+    # 다음 호출 권한까지 1초를 기다려야 하므로 기다리지 않고 바로 실패하고 요청도 보내지 않음
+    assert time.monotonic() - started_at < 0.2
+    assert excinfo.value.stage == STAGE_RATE_LIMIT
+    assert stub.stats[PATH_PRICE] == requests_before
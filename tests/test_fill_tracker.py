@@ -0,0 +1,101 @@
+"""주문 체결 추적(FillTracker) 테스트 (로컬 스텁 서버 사용)"""
+import threading
+import time
+
+import pytest
+
+from src.api.fill_tracker import FillTracker
+from src.api.models import OrderSpec
+from src.api.stub_server import KisStubServer, PATH_DAILY_CCLD
+
+FILL_DELAY = 0.6  # 스텁 서버가 주문을 전량 체결하기까지 걸리는 시간 (초)
+SPECS = [OrderSpec("005930", quantity=10), OrderSpec("000660", quantity=7), OrderSpec("035720", quantity=4)]
+
+
+@pytest.fixture
+def slow_fill():
+    with KisStubServer(fill_delay=FILL_DELAY) as server:
+        yield server
+
+
+def test_wait_reports_gradual_fills_until_done(slow_fill, make_api):
+    api = make_api(slow_fill)
+    results = api.place_orders(SPECS + [OrderSpec("005930", budget=10)])
+    received = []
+    tracker = FillTracker(api, on_fill=received.append, min_interval=0.1, max_interval=0.3)
+    assert tracker.track_results(results) == len(SPECS)  # 실패한 주문은 추적하지 않음
+
+    events = tracker.wait(timeout=5)
+    assert tracker.open_orders == []
+    assert events == received and tracker.events == len(events)
+    assert tracker.polls > 1  # 한 번에 전량 체결되지 않으므로 여러 번 조회
+    for result in results[:len(SPECS)]:
+        order_events = [event for event in events if event.order_no == result.ack.order_no]
+        # 새로 체결된 수량만 알리므로 합계가 주문 수량과 같고 마지막 이벤트에서 주문 종료
+        assert sum(event.quantity for event in order_events) == result.quantity
+        assert [event.done for event in order_events][-1]
+        assert [event.filled_quantity for event in order_events] == sorted({event.filled_quantity for event in order_events})
+
+
+def test_wait_returns_at_timeout_with_open_orders(make_api):
+    with KisStubServer(fill_delay=60) as server:
+        api = make_api(server)
+        tracker = FillTracker(api, min_interval=0.05, max_interval=0.1)
+        tracker.track_results(api.place_orders(SPECS[:1]))
+        started_at = time.monotonic()
+        tracker.wait(timeout=0.3)
+        assert time.monotonic() - started_at < 1
+        assert len(tracker.open_orders) == 1
+
+
+def test_interval_backs_off_without_new_fills(make_api):
+    with KisStubServer(fill_delay=60) as server:
+        api = make_api(server)
+        tracker = FillTracker(api, min_interval=0.1, max_interval=0.4, backoff=2)
+        tracker.track_results(api.place_orders(SPECS[:1]))
+        intervals = []
+        for _ in range(4):
+            tracker.poll()
+            intervals.append(tracker.interval)
+        assert intervals == [pytest.approx(value) for value in (0.2, 0.4, 0.4, 0.4)]
+        tracker.track("0000009999")  # 새 주문을 추적하면 다시 짧은 간격으로 조회
+        assert tracker.interval == 0.1
+
+
+def test_background_polling_and_untrack(slow_fill, make_api):
+    api = make_api(slow_fill)
+    done = threading.Event()
+    filled = []
+
+    def on_fill(event):
+        filled.append(event)
+        if event.done:
+            done.set()
+
+    tracker = FillTracker(api, on_fill=on_fill, min_interval=0.1, max_interval=0.3)
+    with tracker:
+        assert tracker.running
+        # 추적 중인 주문이 없으면 조회하지 않음
+        time.sleep(0.2)
+        assert slow_fill.stats[PATH_DAILY_CCLD] == 0
+
+        first, second = api.place_orders(SPECS[:2])
+        tracker.untrack("0000009999")  # 추적 중이 아닌 주문은 무시
+        tracker.track(first.ack.order_no)
+        tracker.track(second.ack.order_no)
+        tracker.untrack(second.ack.order_no)
+        assert tracker.open_orders == [first.ack.order_no]
+        assert done.wait(timeout=5)
+    assert not tracker.running
+    assert {event.order_no for event in filled} == {first.ack.order_no}
+    assert sum(event.quantity for event in filled) == first.quantity
+
+
+def test_rejects_invalid_intervals(stub, make_api):
+    api = make_api(stub)
+    with pytest.raises(ValueError):
+        FillTracker(api, min_interval=0)
+    with pytest.raises(ValueError):
+        FillTracker(api, min_interval=1, max_interval=0.5)
+    with pytest.raises(ValueError):
+        FillTracker(api, backoff=0.5)
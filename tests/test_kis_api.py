@@ -0,0 +1,139 @@
+"""KisAPI 조회/주문 테스트 (로컬 스텁 서버 사용)"""
+import pytest
+
+from src.api.kis_api import KisAPIError
+from src.api.models import OrderSpec
+from src.api.stub_server import (
+    BALANCE_PAGE_SIZE,
+    MINUTE_PAGE_SIZE,
+    KisStubServer,
+    PATH_BALANCE,
+    PATH_MINUTE_CHART,
+    PATH_ORDER,
+)
+
+HOLDINGS = 130  # 잔고 3페이지 (50 + 50 + 30)
+SESSION_MINUTES = 390  # 09:01 ~ 15:30
+
+
+@pytest.fixture
+def seeded(seed_file):
+    codes = [f"{i:06d}" for i in range(HOLDINGS)]
+    # 보유 종목마다 2000년부터 시세를 만들지 않도록 짧은 일별 시세를 시드로 넣음
+    bars = [
+        {"date": "20240102", "open": 1000, "high": 1100, "low": 900, "close": 1000, "volume": 100, "amount": 100_000},
+        {"date": "20240103", "open": 1000, "high": 1300, "low": 1000, "close": 1200, "volume": 100, "amount": 120_000},
+    ]
+    seed = {
+        "balance": {
+            "cash": 1_000_000,
+            "holdings": {code: {"quantity": i + 1, "avg_price": 1000} for i, code in enumerate(codes)},
+        },
+        "daily": {code: bars for code in codes},
+    }
+    with KisStubServer(seed_path=seed_file(seed)) as server:
+        yield server
+
+
+# 잔고 연속조회
+
+
+def test_balance_pages_follow_continuation_keys(seeded, make_api):
+    api = make_api(seeded)
+    pages = list(api.iter_balance_pages())
+    assert [len(page["output1"]) for page in pages] == [BALANCE_PAGE_SIZE, BALANCE_PAGE_SIZE, 30]
+    assert [page["tr_cont"] for page in pages] == ["F", "M", "E"]
+    assert seeded.stats[PATH_BALANCE] == 3
+
+
+def test_balance_merges_every_page_once(seeded, make_api):
+    api = make_api(seeded)
+    balance = api.get_balance()
+    codes = [holding.code for holding in balance.holdings]
+    assert len(codes) == HOLDINGS
+    assert len(set(codes)) == HOLDINGS
+    assert sum(holding.quantity for holding in balance.holdings) == HOLDINGS * (HOLDINGS + 1) // 2
+    assert balance.orderable_cash == 1_000_000
+    assert all(holding.current_price == 1200 for holding in balance.holdings)
+    assert balance.total_eval == 1_000_000 + sum(holding.eval_amount for holding in balance.holdings)
+
+    # 기존 딕셔너리 형식은 첫 페이지만 반환
+    assert len(api.get_account_balance()["output1"]) == BALANCE_PAGE_SIZE
+    assert [holding.code for holding in api.iter_holdings()] == codes
+
+
+# 일괄 주문
+
+
+def test_place_orders_reports_each_failure_without_stopping(seed_file, make_api):
+    with KisStubServer(seed_path=seed_file({"balance": {"cash": 300_000}})) as server:
+        api = make_api(server)
+        price = api.get_quote("005930", use_cache=False).price
+        specs = [
+            OrderSpec("005930", quantity=1),
+            OrderSpec("000660", budget=10),  # 예산으로 1주도 살 수 없음 (전송하지 않음)
+            OrderSpec("035720", quantity=10_000),  # 주문가능금액 초과 (서버가 거절)
+            OrderSpec("005930", budget=price * 2),
+        ]
+        results = api.place_orders(specs)
+
+    assert [result.spec for result in results] == specs  # 요청 순서 유지
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert results[0].quantity == 1 and results[0].expected_amount == price
+    assert results[1].quantity == 0 and results[1].latency == 0 and results[1].error
+    assert results[2].ack is None and results[2].quantity == 10_000 and results[2].error
+    assert results[3].quantity == 2 and results[3].expected_amount == price * 2
+    assert len({result.ack.order_no for result in results if result.ack is not None}) == 2
+    assert server.stats[PATH_ORDER] == 3
+
+
+def test_place_orders_with_no_specs(stub, make_api):
+    assert make_api(stub).place_orders([]) == []
+    assert stub.stats[PATH_ORDER] == 0
+
+
+# 당일 분봉
+
+
+def test_minute_bars_page_back_to_session_open(stub, make_api):
+    api = make_api(stub)
+    pages = list(api.iter_minute_bars("005930"))
+    times = [time for page in pages for time in page.times]
+    assert len(pages) == SESSION_MINUTES // MINUTE_PAGE_SIZE
+    assert all(len(page) == MINUTE_PAGE_SIZE for page in pages)
+    assert len(times) == len(set(times)) == SESSION_MINUTES
+    assert times == sorted(times, reverse=True)
+    assert (times[0], times[-1]) == (153000, 90100)
+
+
+def test_minute_bars_window_and_early_stop(stub, make_api):
+    api = make_api(stub)
+    window = [time for page in api.iter_minute_bars("005930", end_time="120000", start_time="110000") for time in page.times]
+    assert (window[0], window[-1], len(window)) == (120000, 110000, 61)
+
+    requests_before = stub.stats[PATH_MINUTE_CHART]
+    pages = api.iter_minute_bars("000660")
+    first = next(pages)
+    pages.close()
+    # 첫 페이지만 소비하면 다음 페이지는 요청하지 않음
+    assert len(first) == MINUTE_PAGE_SIZE
+    assert stub.stats[PATH_MINUTE_CHART] == requests_before + 1
+
+
+# 일별 시세
+
+
+def test_historical_prices_keep_dict_rows(stub, make_api):
+    api = make_api(stub)
+    data = api.get_historical_prices("005930", "20230101", "20231231")
+    bars = api.get_daily_bars("005930", "20230101", "20231231")
+    assert len(bars) > 200  # 한 번에 100건을 넘으므로 여러 구간으로 나눠 조회
+    assert data["prices"] == [bar.to_dict() for bar in bars]
+    dates = [bar.date for bar in bars]
+    assert dates == sorted(set(dates), reverse=True)
+    assert "20230101" <= dates[-1] and dates[0] <= "20231231"
+
+
+def test_missing_credentials_are_rejected(stub, make_api):
+    with pytest.raises(KisAPIError):
+        make_api(stub, app_key="", app_secret="", account_no="", mode="unknown-mode")
@@ -0,0 +1,123 @@
+"""응답 모델 파싱 테스트"""
+import pytest
+
+from src.api.models import (
+    Balance,
+    DailyBar,
+    Holding,
+    MinuteBars,
+    OrderAck,
+    OrderSpec,
+    OrderStatus,
+    Quote,
+    StockPrices,
+    loads,
+)
+
+
+def test_loads_accepts_bytes_and_str():
+    assert loads(b'{"rt_cd": "0"}') == {"rt_cd": "0"}
+    assert loads('{"msg1": "정상"}') == {"msg1": "정상"}
+    with pytest.raises(ValueError):
+        loads(b"<html>")
+
+
+def test_quote_converts_kis_numeric_strings():
+    quote = Quote.from_output("005930", {
+        "stck_prpr": "71500",
+        "stck_oprc": "71000.00",
+        "stck_hgpr": "72000",
+        "stck_lwpr": "",
+        "acml_vol": "1234567",
+        "prdy_vrss": "-500",
+        "prdy_ctrt": "-0.69",
+    })
+    assert quote == Quote("005930", 71500, 71000, 72000, 0, 1234567, -500, -0.69)
+
+
+def test_daily_bar_round_trips_to_dict():
+    bar = DailyBar.from_output({
+        "stck_bsop_date": "20240102",
+        "stck_oprc": "100",
+        "stck_hgpr": "110",
+        "stck_lwpr": "90",
+        "stck_clpr": "105",
+        "acml_vol": "1000",
+        "acml_tr_pbmn": "105000",
+    })
+    assert bar.to_dict() == {
+        "date": "20240102", "open": 100, "high": 110, "low": 90, "close": 105, "volume": 1000, "amount": 105000,
+    }
+    assert DailyBar(**bar.to_dict()) == bar
+
+
+def test_minute_bars_skip_blank_rows_and_early_bars():
+    result = {"output2": [
+        {"stck_bsop_date": "20240102", "stck_cntg_hour": "090300", "stck_prpr": "103", "cntg_vol": "3"},
+        {"stck_bsop_date": "20240102", "stck_cntg_hour": "090200", "stck_prpr": "102", "cntg_vol": "2"},
+        {"stck_bsop_date": "", "stck_cntg_hour": ""},
+        {"stck_bsop_date": "20240102", "stck_cntg_hour": "090100", "stck_prpr": "101", "cntg_vol": "1"},
+    ]}
+    bars = MinuteBars.from_page("005930", result, start_time=90200)
+    assert len(bars) == 2
+    assert bars.times.tolist() == [90300, 90200]
+    assert bars.to_dict()["close"] == [103, 102]
+    assert bars.dates.tolist() == [20240102, 20240102]
+
+
+def test_balance_merges_pages_and_keeps_last_summary():
+    page1 = {
+        "output1": [
+            {"pdno": "000001", "hldg_qty": "10", "pchs_avg_pric": "1500.5000", "prpr": "1600"},
+            {"pdno": "000002", "hldg_qty": "0"},
+        ],
+        "output2": [{"dnca_tot_amt": "1000", "prvs_rcdl_excc_amt": "900", "tot_evlu_amt": "17000"}],
+    }
+    page2 = {
+        "output1": [{"pdno": "000003", "hldg_qty": "1", "prpr": "500"}],
+        "output2": [{"dnca_tot_amt": "1000", "prvs_rcdl_excc_amt": "800", "tot_evlu_amt": "17500"}],
+    }
+    balance = Balance.from_pages([page1, page2])
+    assert [holding.code for holding in balance.holdings] == ["000001", "000003"]
+    assert balance.holdings[0].avg_price == 1500.5
+    assert (balance.deposit, balance.orderable_cash, balance.total_eval) == (1000, 800, 17500)
+    assert Balance.from_result({}) == Balance(0, 0, 0, ())
+    assert Holding.from_page({"output1": None}) == []
+
+
+def test_order_ack_and_status():
+    ack = OrderAck.from_result({
+        "msg1": "주문 전송 완료 되었습니다.",
+        "output": {"ODNO": "0000000001", "ORD_TMD": "100000", "KRX_FWDG_ORD_ORGNO": "91252"},
+    })
+    assert (ack.order_no, ack.order_time, ack.branch_no) == ("0000000001", "100000", "91252")
+
+    partial = OrderStatus.from_output({
+        "odno": "0000000001", "pdno": "005930", "sll_buy_dvsn_cd": "02",
+        "ord_qty": "10", "tot_ccld_qty": "4", "rmn_qty": "6", "avg_prvs": "71500.0",
+    })
+    assert partial.side == "BUY" and not partial.done
+    cancelled = OrderStatus.from_output({"odno": "2", "sll_buy_dvsn_cd": "01", "ord_qty": "10", "rmn_qty": "6", "cncl_yn": "Y"})
+    assert cancelled.side == "SELL" and cancelled.done
+    assert len(OrderStatus.from_page({"output1": [{"odno": ""}, {"odno": "3", "ord_qty": "1", "tot_ccld_qty": "1"}]})) == 1
+
+
+def test_order_spec_requires_exactly_one_of_quantity_and_budget():
+    OrderSpec("005930", quantity=1)
+    OrderSpec("005930", budget=100_000)
+    with pytest.raises(ValueError):
+        OrderSpec("005930")
+    with pytest.raises(ValueError):
+        OrderSpec("005930", quantity=1, budget=100_000)
+
+
+def test_stock_prices_columns_and_errors():
+    prices = StockPrices()
+    prices.add("005930", {"stck_prpr": "71500", "acml_vol": "10", "prdy_vrss": "100", "prdy_ctrt": "0.14"})
+    prices.add_error("000660", "timeout")
+    assert "005930" in prices and "000660" not in prices
+    assert len(prices) == 1
+    assert prices.price("005930") == 71500
+    assert prices.price("000660") is None
+    assert prices.quote("005930").change_rate == 0.14
+    assert prices.errors == {"000660": "timeout"}
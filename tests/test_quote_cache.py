@@ -0,0 +1,125 @@
+"""현재가 캐시(QuoteCache) 테스트"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.api.models import OrderSpec
+from src.api.quote_cache import QuoteCache
+from src.api.stub_server import PATH_PRICE
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = QuoteCache(ttl=10)
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"price": 100}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("005930", fetch))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)  # 모든 스레드가 진행 중인 조회를 기다리도록
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"price": 100}] * 10
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 9
+
+
+def test_fetch_error_reaches_every_waiter_and_is_not_cached():
+    cache = QuoteCache(ttl=10)
+    release = threading.Event()
+
+    def failing():
+        release.wait(1)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_fetch("005930", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 5
+    assert cache.get_or_fetch("005930", lambda: "fresh") == "fresh"
+
+
+def test_entries_expire_after_ttl():
+    cache = QuoteCache(ttl=0.05, ttl_by_code={"000660": 10})
+    values = iter(range(100))
+    assert cache.get_or_fetch(("005930", "J"), lambda: next(values)) == 0
+    assert cache.get_or_fetch(("005930", "J"), lambda: next(values)) == 0
+    assert cache.get_or_fetch(("000660", "J"), lambda: next(values)) == 1
+    time.sleep(0.08)
+    assert cache.get_or_fetch(("005930", "J"), lambda: next(values)) == 2
+    # 종목별 유효시간은 기본값보다 우선
+    assert cache.get_or_fetch(("000660", "J"), lambda: next(values)) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QuoteCache(ttl=10, maxsize=2)
+    cache.get_or_fetch("a", lambda: 1)
+    cache.get_or_fetch("b", lambda: 2)
+    cache.get_or_fetch("a", lambda: 0)  # a를 최근 사용으로 갱신
+    cache.get_or_fetch("c", lambda: 3)
+    assert cache.get_or_fetch("a", lambda: -1) == 1
+    assert cache.get_or_fetch("b", lambda: -1) == -1
+
+
+def test_async_concurrent_misses_share_one_fetch():
+    cache = QuoteCache(ttl=10)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch_async("005930", fetch) for _ in range(8)))
+
+    assert asyncio.run(main()) == [42] * 8
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_order_sizing_bypasses_the_cache(stub, make_api):
+    api = make_api(stub, quote_cache=QuoteCache(ttl=60))
+    api.get_quote("005930")
+    api.get_quote("005930")
+    assert stub.stats[PATH_PRICE] == 1
+
+    # 주문 수량 계산은 캐시 유효시간과 관계없이 항상 새로 조회
+    api.calculate_order_quantity("005930", 1_000_000)
+    assert stub.stats[PATH_PRICE] == 2
+    results = api.place_orders([OrderSpec("005930", budget=500_000)])
+    assert results[0].ok
+    assert stub.stats[PATH_PRICE] == 3
+
+
+@pytest.mark.parametrize("key", [None, "a"])
+def test_invalidate(key):
+    cache = QuoteCache(ttl=10)
+    cache.get_or_fetch("a", lambda: 1)
+    cache.invalidate(key)
+    assert cache.get_or_fetch("a", lambda: 2) == 2
@@ -0,0 +1,125 @@
+"""호출 제한기(TokenBucket, RateLimiter) 테스트"""
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from config.settings import KIS_ORDER_RATE_BURST, KIS_ORDER_RATE_LIMIT
+from src.api.rate_limiter import ORDER_TR_IDS, RateLimiter, TokenBucket, get_rate_limiter
+
+QUOTE_TR_ID = "FHKST01010100"
+ORDER_TR_ID = "TTTC0012U"
+
+
+def test_bucket_reserves_burst_then_waits_for_refill():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # 세 번째 호출은 토큰 1개가 충전될 때까지(0.1초) 기다려야 함
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+
+def test_bucket_max_wait_does_not_consume():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.reserve() == 0
+    assert bucket.reserve(max_wait=0.0) is None
+    assert bucket.wait_time() == pytest.approx(1.0, abs=0.05)
+
+
+def test_bucket_pause_delays_every_caller():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(0.5)
+    # 남은 토큰을 비우고 0.5초만큼 빚을 지므로 다음 호출은 0.5초 이상 대기
+    assert bucket.wait_time() >= 0.5
+
+
+def test_bucket_refund_never_exceeds_capacity():
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.refund()
+    assert bucket.reserve(max_wait=0.0) == 0
+    assert bucket.reserve(max_wait=0.0) is None
+
+
+def test_bucket_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0.5)
+
+
+def test_limiter_refunds_mode_bucket_when_tr_id_bucket_is_empty():
+    limiter = RateLimiter(rate=100, capacity=3, tr_id_limits={ORDER_TR_ID: (1, 1)})
+    assert limiter.try_acquire(ORDER_TR_ID)
+    # 주문 버킷이 비어 실패한 예약은 모드 버킷 토큰을 돌려줘야 함
+    assert not limiter.try_acquire(ORDER_TR_ID)
+    assert limiter.try_acquire(QUOTE_TR_ID)
+    assert limiter.try_acquire(QUOTE_TR_ID)
+    assert not limiter.try_acquire(QUOTE_TR_ID)
+
+
+def test_limiter_acquire_timeout():
+    limiter = RateLimiter(rate=1, capacity=1)
+    limiter.acquire()
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.1)
+
+
+def test_limiter_pause_applies_to_all_tr_ids():
+    limiter = RateLimiter(rate=10, capacity=5)
+    limiter.pause(0.3)
+    assert limiter.wait_time(QUOTE_TR_ID) >= 0.3
+    assert limiter.wait_time(ORDER_TR_ID) >= 0.3
+
+
+def test_limiter_spreads_threads_over_the_rate():
+    rate, capacity, callers = 50, 5, 30
+    limiter = RateLimiter(rate=rate, capacity=capacity)
+    acquired_at = []
+    lock = threading.Lock()
+
+    def worker():
+        limiter.acquire(QUOTE_TR_ID)
+        with lock:
+            acquired_at.append(time.monotonic())
+
+    started_at = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(acquired_at) == callers
+    # 순간 허용량을 넘는 호출은 초당 rate건 속도로만 통과
+    assert max(acquired_at) - started_at >= (callers - capacity) / rate * 0.9
+    # 어떤 1/5초 구간에서도 순간 허용량 + 충전량을 넘지 않음
+    window = 0.2
+    for start in acquired_at:
+        in_window = sum(1 for at in acquired_at if start <= at < start + window)
+        assert in_window <= capacity + rate * window + 1
+
+
+def test_limiter_async_callers_share_the_quota():
+    rate, capacity, callers = 40, 2, 12
+    limiter = RateLimiter(rate=rate, capacity=capacity)
+
+    async def main():
+        started_at = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async(QUOTE_TR_ID) for _ in range(callers)))
+        return time.monotonic() - started_at
+
+    elapsed = asyncio.run(main())
+    assert elapsed >= (callers - capacity) / rate * 0.9
+
+
+@pytest.mark.skipif(KIS_ORDER_RATE_LIMIT <= 0, reason="KIS_ORDER_RATE_LIMIT=0이면 주문 tr_id 한도를 쓰지 않음")
+def test_shared_limiter_has_default_order_limits():
+    limiter = get_rate_limiter("real", f"test-{uuid.uuid4().hex}")
+    burst = int(KIS_ORDER_RATE_BURST)
+    for _ in range(burst):
+        assert limiter.try_acquire(ORDER_TR_IDS["real"][0])
+    # 주문 버킷은 비었지만 조회는 모드 전체 한도 안에서 계속 가능
+    assert not limiter.try_acquire(ORDER_TR_IDS["real"][0])
+    assert limiter.try_acquire(QUOTE_TR_ID)
@@ -0,0 +1,93 @@
+"""재시도 정책(RetryPolicy) 테스트"""
+import pytest
+
+from src.api.kis_api import KisAPIError
+from src.api.retry import (
+    MSG_RATE_LIMITED,
+    MSG_TOKEN_EXPIRED,
+    MSG_TOKEN_INVALID,
+    REJECTED,
+    RENEW_TOKEN,
+    TRANSIENT,
+    RetryPolicy,
+)
+from src.api.stub_server import KisStubServer, PATH_ORDER, PATH_PRICE
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02)
+
+
+@pytest.mark.parametrize(
+    "status_code, result, expected",
+    [
+        (500, {"rt_cd": "1", "msg_cd": MSG_RATE_LIMITED}, REJECTED),
+        (500, {"rt_cd": "1", "msg_cd": MSG_TOKEN_EXPIRED}, RENEW_TOKEN),
+        (200, {"rt_cd": "1", "msg_cd": MSG_TOKEN_INVALID}, RENEW_TOKEN),
+        (503, {}, TRANSIENT),
+        (502, {"rt_cd": "1", "msg_cd": "EGW99999"}, TRANSIENT),
+        (200, {"rt_cd": "0", "msg_cd": "MCA00000"}, None),
+        (200, {"rt_cd": "1", "msg_cd": "APBK0952"}, None),  # 업무 오류 (주문가능금액 초과)
+        (400, {"rt_cd": "1", "msg_cd": "OPSQ0002"}, None),
+    ],
+)
+def test_classify_response(status_code, result, expected):
+    assert RetryPolicy().classify_response(status_code, result) == expected
+
+
+def test_transport_error_before_connect_is_rejected():
+    policy = RetryPolicy()
+    assert policy.classify_transport_error(connected=False) == REJECTED
+    assert policy.classify_transport_error(connected=True) == TRANSIENT
+
+
+def test_transient_errors_retry_only_idempotent_methods():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.can_retry(TRANSIENT, "GET", 1)
+    assert not policy.can_retry(TRANSIENT, "POST", 1)
+    # 서버가 처리하지 않고 거절한 요청은 주문이라도 다시 보냄
+    assert policy.can_retry(REJECTED, "POST", 1)
+    assert policy.can_retry(RENEW_TOKEN, "POST", 1)
+    assert not policy.can_retry(None, "GET", 1)
+
+
+def test_attempts_are_bounded():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.can_retry(REJECTED, "GET", 2)
+    assert not policy.can_retry(REJECTED, "GET", 3)
+
+
+def test_delay_is_capped_exponential_backoff_with_jitter():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.5, jitter=0.5)
+    for attempt, full in [(1, 0.1), (2, 0.2), (3, 0.4), (4, 0.5), (10, 0.5)]:
+        for _ in range(20):
+            assert full * 0.5 <= policy.delay(attempt) <= full
+    assert RetryPolicy(base_delay=0.1, jitter=0).delay(2) == pytest.approx(0.2)
+
+
+def test_rate_limited_requests_are_retried_until_attempts_run_out(make_api):
+    with KisStubServer(rate_limit_error_rate=1.0) as server:
+        api = make_api(server, retry_policy=FAST_RETRY)
+        with pytest.raises(KisAPIError) as excinfo:
+            api.get_stock_price("005930", use_cache=False)
+        assert excinfo.value.msg_cd == MSG_RATE_LIMITED
+        assert server.stats[PATH_PRICE] == FAST_RETRY.max_attempts
+
+
+def test_expired_token_is_renewed_and_order_is_retried(stub, make_api):
+    api = make_api(stub, retry_policy=FAST_RETRY)
+    issued = stub.stats["tokens_issued"]
+    stub.expire_tokens()
+
+    # 토큰 만료는 서버가 처리하지 않은 요청이므로 주문(POST)도 새 토큰으로 다시 보냄
+    result = api.place_order("005930", 1, "01")
+    assert result["rt_cd"] == "0"
+    assert stub.stats["tokens_issued"] == issued + 1
+    assert stub.stats[PATH_ORDER] == 2
+    assert len(stub.orders) == 1
+
+
+def test_business_errors_are_not_retried(seed_file, make_api):
+    with KisStubServer(seed_path=seed_file({"balance": {"cash": 0}})) as server:
+        api = make_api(server, retry_policy=FAST_RETRY)
+        with pytest.raises(KisAPIError):
+            api.place_order("005930", 1, "01")
+        assert server.stats[PATH_ORDER] == 1
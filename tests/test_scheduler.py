@@ -0,0 +1,122 @@
+"""우선순위 요청 스케줄러(RequestScheduler) 테스트"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.api.metrics import ApiMetrics
+from src.api.rate_limiter import RateLimiter
+from src.api.scheduler import (
+    PRIORITY_HISTORY,
+    PRIORITY_ORDER,
+    PRIORITY_QUOTE,
+    RequestScheduler,
+)
+
+RATE = 20  # 초당 호출 수 (대기열 10건을 비우는 데 0.5초)
+ORDER_TR_ID = "TTTC0012U"  # 현금 매수
+QUOTE_TR_ID = "FHKST01010100"  # 현재가 조회
+HISTORY_TR_ID = "FHKST03010100"  # 일별 시세 조회
+
+
+def _wait_for_depth(scheduler: RequestScheduler, name: str, depth: int) -> None:
+    for _ in range(200):
+        if scheduler.depths()[name] == depth:
+            return
+        time.sleep(0.005)
+    raise AssertionError(f"{name} 대기열이 {depth}건이 되지 않았습니다: {scheduler.depths()}")
+
+
+def _start(scheduler: RequestScheduler, tr_ids, dispatched):
+    def worker(tr_id):
+        scheduler.acquire(tr_id)
+        dispatched.append(tr_id)
+
+    threads = [threading.Thread(target=worker, args=(tr_id,)) for tr_id in tr_ids]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_order_preempts_queued_history_requests():
+    metrics = ApiMetrics()
+    scheduler = RequestScheduler(RateLimiter(RATE, 1), metrics=metrics)
+    scheduler.rate_limiter.try_acquire()  # 버킷을 비워 이후 요청이 대기열에 쌓이도록 함
+    dispatched = []
+    threads = _start(scheduler, [HISTORY_TR_ID] * 10, dispatched)
+    _wait_for_depth(scheduler, "history", 10)
+
+    started_at = time.monotonic()
+    scheduler.acquire(ORDER_TR_ID)
+    # 앞선 과거 시세 조회 10건(0.5초)을 기다리지 않고 다음 호출 권한을 받음
+    assert time.monotonic() - started_at < 0.2
+    assert len(dispatched) <= 2
+
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(dispatched) == 10
+    assert scheduler.depths() == {"order": 0, "account": 0, "quote": 0, "history": 0}
+    assert metrics.to_dict()["queues"]["history"]["max_depth"] == 10
+
+
+def test_weights_share_calls_between_priorities():
+    scheduler = RequestScheduler(RateLimiter(RATE, 1), weights={PRIORITY_HISTORY: 2}, metrics=ApiMetrics())
+    scheduler.rate_limiter.pause(0.2)  # 모든 요청이 대기열에 들어간 뒤 보내기 시작
+    dispatched = []
+    threads = _start(scheduler, [QUOTE_TR_ID] * 6, dispatched)
+    _wait_for_depth(scheduler, "quote", 6)
+    threads += _start(scheduler, [HISTORY_TR_ID] * 6, dispatched)
+    _wait_for_depth(scheduler, "history", 6)
+
+    for thread in threads:
+        thread.join(timeout=5)
+    # 먼저 들어온 현재가 조회가 독차지하지 않고, 둘 다 대기 중이면 2:1로 나눔
+    assert dispatched[:6].count(HISTORY_TR_ID) == 4
+    assert sorted(dispatched) == sorted([QUOTE_TR_ID] * 6 + [HISTORY_TR_ID] * 6)
+
+
+def test_empty_queue_skips_the_line():
+    scheduler = RequestScheduler(RateLimiter(RATE, 5), metrics=ApiMetrics())
+    assert scheduler.acquire(HISTORY_TR_ID) == 0.0
+    assert scheduler.classify(ORDER_TR_ID) == PRIORITY_ORDER
+    assert scheduler.classify("UNKNOWN") == PRIORITY_QUOTE
+
+
+def test_timeout_leaves_queue_empty():
+    scheduler = RequestScheduler(RateLimiter(1, 1), metrics=ApiMetrics())
+    scheduler.acquire(HISTORY_TR_ID)
+    started_at = time.monotonic()
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(HISTORY_TR_ID, timeout=0.1)
+    assert time.monotonic() - started_at < 0.2
+    assert sum(scheduler.depths().values()) == 0
+    # 포기한 요청이 대기열을 막지 않음
+    assert scheduler.acquire(QUOTE_TR_ID, timeout=2) < 2
+
+
+@pytest.mark.parametrize("weights", [{PRIORITY_ORDER: 1}, {99: 1}, {PRIORITY_QUOTE: 0}])
+def test_rejects_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        RequestScheduler(RateLimiter(RATE, 1), weights=weights, metrics=ApiMetrics())
+
+
+def test_async_order_preempts_queued_history_requests():
+    scheduler = RequestScheduler(RateLimiter(RATE, 1), metrics=ApiMetrics())
+    scheduler.rate_limiter.try_acquire()
+
+    async def run():
+        history = [asyncio.ensure_future(scheduler.acquire_async(HISTORY_TR_ID)) for _ in range(10)]
+        while scheduler.depths()["history"] < 10:
+            await asyncio.sleep(0.005)
+        started_at = time.monotonic()
+        await scheduler.acquire_async(ORDER_TR_ID)
+        order_wait = time.monotonic() - started_at
+        done = sum(task.done() for task in history)
+        await asyncio.gather(*history)
+        return order_wait, done
+
+    order_wait, done_before_order = asyncio.run(run())
+    assert order_wait < 0.2
+    assert done_before_order <= 2
+    assert sum(scheduler.depths().values()) == 0
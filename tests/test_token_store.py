@@ -0,0 +1,103 @@
+"""토큰 저장소(TokenStore) 테스트"""
+import json
+import os
+import stat
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api import token_store as token_store_module
+from src.api.token_store import TokenStore, token_key
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "token.json")
+
+
+def _later(hours: int = 1) -> datetime:
+    return datetime.now() + timedelta(hours=hours)
+
+
+def test_save_and_load_keep_other_keys(path):
+    store = TokenStore(path)
+    store.save("real:a", "token-a", _later())
+    store.save("paper:b", "token-b", _later())
+    assert store.load("real:a")[0] == "token-a"
+    assert store.load("paper:b")[0] == "token-b"
+    assert store.load("real:missing") is None
+
+
+def test_expired_and_legacy_tokens_are_ignored(path):
+    store = TokenStore(path)
+    store.save("real:a", "old", datetime.now() - timedelta(seconds=1))
+    assert store.load("real:a") is None
+
+    # 예전 형식(토큰 하나만 저장)은 어느 모드의 토큰인지 알 수 없으므로 무시
+    with open(path, "w") as f:
+        json.dump({"access_token": "legacy", "expired_at": _later().isoformat()}, f)
+    assert store.load("real:a") is None
+
+
+def test_file_is_private_and_no_temp_files_remain(path, tmp_path):
+    TokenStore(path).save("real:a", "token", _later())
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_failed_write_keeps_previous_file(path, tmp_path, monkeypatch):
+    store = TokenStore(path)
+    store.save("real:a", "token-a", _later())
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(token_store_module.json, "dump", broken_dump)
+    with pytest.raises(OSError):
+        store.save("real:b", "token-b", _later())
+    monkeypatch.undo()
+
+    # 원자적 교체 전에 실패했으므로 기존 파일은 그대로이고 임시 파일도 남지 않음
+    assert store.load("real:a")[0] == "token-a"
+    assert store.load("real:b") is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_concurrent_get_or_issue_issues_once(path):
+    issued = []
+
+    def issue():
+        time.sleep(0.05)  # 발급 중에 다른 호출자가 잠금을 기다리도록
+        issued.append(1)
+        return f"token-{len(issued)}", _later()
+
+    tokens = []
+
+    def worker():
+        # 인스턴스마다 잠금 파일을 따로 열어 다른 프로세스처럼 동작
+        tokens.append(TokenStore(path).get_or_issue("real:a", issue)[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert issued == [1]
+    assert tokens == ["token-1"] * 6
+
+
+def test_stale_token_is_not_reused(path):
+    store = TokenStore(path)
+    store.save("real:a", "stale", _later())
+    token = store.get_or_issue("real:a", lambda: ("fresh", _later()), stale_token="stale")
+    assert token[0] == "fresh"
+    assert store.load("real:a")[0] == "fresh"
+
+
+def test_token_key_separates_modes_and_servers():
+    assert token_key("real", "key") != token_key("paper", "key")
+    assert token_key("real", "key") != token_key("real", "key", "http://127.0.0.1:18080")
+    assert "key" not in token_key("real", "key")